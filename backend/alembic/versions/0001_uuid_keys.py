@@ -0,0 +1,96 @@
+"""Store primary and foreign keys as native uuid on PostgreSQL
+
+Tables created before the models switched to UUIDString hold their ids in
+varchar(36) columns. PostgreSQL compares those against uuid parameters with
+``character varying = uuid`` errors, so the id and foreign-key columns are
+converted in place. The foreign keys are dropped first and recreated after,
+since both ends of a key must change type together. SQLite keeps dashed
+String(36) ids, so nothing changes there.
+
+Revision ID: 0001_uuid_keys
+Revises:
+Create Date: 2026-10-16 17:02:14.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0001_uuid_keys"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Id and foreign-key columns per table
+KEY_COLUMNS = {
+    "users": ("id",),
+    "sessions": ("id", "user_id"),
+    "company_configs": ("id", "user_id"),
+    "conversations": ("id", "user_id", "company_id"),
+    "chat_messages": ("id", "conversation_id"),
+    "processed_documents": ("id", "conversation_id", "user_id", "company_id"),
+}
+
+
+def _convert_keys(to_uuid: bool) -> None:
+    """Convert the key columns to uuid (or back to varchar(36))."""
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    inspector = sa.inspect(bind)
+    tables = [t for t in KEY_COLUMNS if t in set(inspector.get_table_names())]
+
+    pending = []
+    for table in tables:
+        types = {c["name"]: c["type"] for c in inspector.get_columns(table)}
+        for column in KEY_COLUMNS[table]:
+            if column in types and isinstance(types[column], sa.Uuid) != to_uuid:
+                pending.append((table, column))
+    if not pending:
+        return
+
+    foreign_keys = [
+        (table, fk)
+        for table in tables
+        for fk in inspector.get_foreign_keys(table)
+        if fk["referred_table"] in KEY_COLUMNS
+    ]
+    for table, fk in foreign_keys:
+        op.drop_constraint(fk["name"], table, type_="foreignkey")
+
+    for table, column in pending:
+        if to_uuid:
+            op.alter_column(
+                table, column,
+                type_=postgresql.UUID(as_uuid=False),
+                postgresql_using=f"{column}::uuid",
+            )
+        else:
+            op.alter_column(
+                table, column,
+                type_=sa.String(36),
+                postgresql_using=f"{column}::text",
+            )
+
+    for table, fk in foreign_keys:
+        op.create_foreign_key(
+            fk["name"],
+            table,
+            fk["referred_table"],
+            fk["constrained_columns"],
+            fk["referred_columns"],
+            **fk.get("options", {}),
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _convert_keys(to_uuid=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _convert_keys(to_uuid=False)
@@ -0,0 +1,90 @@
+"""Store conversation JSON columns as JSONB with a server-side default
+
+The JSON columns become JSONB on PostgreSQL. The two extra_data columns
+get a '{}' server default on every dialect, because the models no longer
+fill them in from Python. SQLite has no ALTER COLUMN ... SET DEFAULT, so
+Alembic's batch mode rebuilds those tables.
+
+Revision ID: 0002_jsonb_columns
+Revises: 0001_uuid_keys
+Create Date: 2026-10-16 17:04:27.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_jsonb_columns"
+down_revision: Union[str, Sequence[str], None] = "0001_uuid_keys"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_COLUMNS = {
+    "conversations": ("extra_data",),
+    "chat_messages": ("tool_calls", "extra_data"),
+    "processed_documents": ("extracted_data",),
+}
+# Columns defaulting to an empty object
+DEFAULTED_COLUMNS = {
+    "conversations": "extra_data",
+    "chat_messages": "extra_data",
+}
+
+
+def _columns(inspector: sa.Inspector, table: str) -> dict:
+    return {c["name"]: c for c in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+    is_postgresql = bind.dialect.name == "postgresql"
+
+    for table, names in JSON_COLUMNS.items():
+        if table not in tables:
+            continue
+        columns = _columns(inspector, table)
+        with op.batch_alter_table(table) as batch:
+            for name in names:
+                column = columns.get(name)
+                if column is None:
+                    continue
+                if is_postgresql and not isinstance(column["type"], postgresql.JSONB):
+                    batch.alter_column(
+                        name,
+                        type_=postgresql.JSONB(),
+                        postgresql_using=f"{name}::jsonb",
+                    )
+                if DEFAULTED_COLUMNS.get(table) == name and column["default"] is None:
+                    batch.alter_column(
+                        name,
+                        existing_type=column["type"],
+                        server_default=sa.text("'{}'"),
+                    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    tables = set(inspector.get_table_names())
+    is_postgresql = bind.dialect.name == "postgresql"
+
+    for table, names in JSON_COLUMNS.items():
+        if table not in tables:
+            continue
+        with op.batch_alter_table(table) as batch:
+            for name in names:
+                if DEFAULTED_COLUMNS.get(table) == name:
+                    batch.alter_column(name, existing_type=sa.JSON(), server_default=None)
+                if is_postgresql:
+                    batch.alter_column(
+                        name,
+                        type_=sa.JSON(),
+                        postgresql_using=f"{name}::json",
+                    )
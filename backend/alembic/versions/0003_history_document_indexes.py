@@ -0,0 +1,58 @@
+"""Add composite indexes for chat history and document lookups
+
+The composite indexes lead with the columns the single-column indexes
+covered, so those are dropped.
+
+Revision ID: 0003_history_document_indexes
+Revises: 0002_jsonb_columns
+Create Date: 2026-10-16 17:03:40.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_history_document_indexes"
+down_revision: Union[str, Sequence[str], None] = "0002_jsonb_columns"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns)
+COMPOSITE_INDEXES = (
+    ("ix_chat_messages_conv_created", "chat_messages", ["conversation_id", "created_at"]),
+    ("ix_processed_documents_user_created", "processed_documents", ["user_id", "created_at"]),
+    ("ix_processed_documents_conv_status", "processed_documents", ["conversation_id", "status"]),
+)
+REPLACED_INDEXES = (
+    ("ix_chat_messages_conversation_id", "chat_messages", ["conversation_id"]),
+    ("ix_processed_documents_conversation_id", "processed_documents", ["conversation_id"]),
+    ("ix_processed_documents_user_id", "processed_documents", ["user_id"]),
+)
+
+
+def _existing_tables() -> set:
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tables = _existing_tables()
+    for name, table, columns in COMPOSITE_INDEXES:
+        if table in tables:
+            op.create_index(name, table, columns, if_not_exists=True)
+    for name, table, _ in REPLACED_INDEXES:
+        if table in tables:
+            op.drop_index(name, table_name=table, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    tables = _existing_tables()
+    for name, table, columns in REPLACED_INDEXES:
+        if table in tables:
+            op.create_index(name, table, columns, if_not_exists=True)
+    for name, table, _ in COMPOSITE_INDEXES:
+        if table in tables:
+            op.drop_index(name, table_name=table, if_exists=True)
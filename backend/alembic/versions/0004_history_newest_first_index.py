@@ -0,0 +1,56 @@
+"""Order the chat history index newest first with id as tie-breaker
+
+Rebuilds ix_chat_messages_conv_created as (conversation_id, created_at
+DESC, id DESC), the order the latest-messages subquery reads.
+
+Revision ID: 0004_history_newest_first_index
+Revises: 0003_history_document_indexes
+Create Date: 2026-10-16 17:22:22.000000
+
+"""
+from typing import List, Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0004_history_newest_first_index"
+down_revision: Union[str, Sequence[str], None] = "0003_history_document_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = "ix_chat_messages_conv_created"
+TABLE = "chat_messages"
+
+
+def _index_columns() -> Optional[List[str]]:
+    """Columns of the current history index, or None if the table is missing."""
+    inspector = sa.inspect(op.get_bind())
+    if TABLE not in inspector.get_table_names():
+        return None
+    for index in inspector.get_indexes(TABLE):
+        if index["name"] == INDEX:
+            return list(index["column_names"])
+    return []
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    columns = _index_columns()
+    if columns is None or "id" in columns:
+        return
+    op.drop_index(INDEX, table_name=TABLE, if_exists=True)
+    op.create_index(
+        INDEX,
+        TABLE,
+        ["conversation_id", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    columns = _index_columns()
+    if columns is None or "id" not in columns:
+        return
+    op.drop_index(INDEX, table_name=TABLE)
+    op.create_index(INDEX, TABLE, ["conversation_id", "created_at"])
@@ -0,0 +1,41 @@
+"""Add a partial index for processed-document submission lookups
+
+Revision ID: 0005_processed_documents_partial_index
+Revises: 0004_history_newest_first_index
+Create Date: 2026-10-16 17:24:28.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_processed_documents_partial_index"
+down_revision: Union[str, Sequence[str], None] = "0004_history_newest_first_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = "ix_processed_documents_processed"
+TABLE = "processed_documents"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if TABLE not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_index(
+        INDEX,
+        TABLE,
+        ["user_id", "id"],
+        if_not_exists=True,
+        postgresql_where=sa.text("status = 'processed'"),
+        sqlite_where=sa.text("status = 'processed'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if TABLE not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.drop_index(INDEX, table_name=TABLE, if_exists=True)
@@ -0,0 +1,41 @@
+"""Add processed_documents.content_hash for re-upload reuse
+
+Revision ID: 0006_processed_documents_content_hash
+Revises: 0005_processed_documents_partial_index
+Create Date: 2026-10-16 17:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_processed_documents_content_hash"
+down_revision: Union[str, Sequence[str], None] = "0005_processed_documents_partial_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = "processed_documents"
+INDEX = "ix_processed_documents_user_hash"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if TABLE not in inspector.get_table_names():
+        return
+    if "content_hash" not in {c["name"] for c in inspector.get_columns(TABLE)}:
+        op.add_column(TABLE, sa.Column("content_hash", sa.String(64), nullable=True))
+    op.create_index(INDEX, TABLE, ["user_id", "content_hash"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    if TABLE not in inspector.get_table_names():
+        return
+    op.drop_index(INDEX, table_name=TABLE, if_exists=True)
+    if "content_hash" in {c["name"] for c in inspector.get_columns(TABLE)}:
+        with op.batch_alter_table(TABLE) as batch:
+            batch.drop_column("content_hash")
@@ -11,6 +11,7 @@ from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.endpoints.auth import CurrentUser
+from app.core.config import Settings, get_settings
 from app.core.database import get_db
 from app.services.company import CompanyConfigService
 from app.services.langgraph_agent import AgentEvent, BookkeeperAgent, ProcessedDocument, DocumentType
@@ -135,51 +136,54 @@ async def send_message(
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"Company not found: {e}")
     
-    # Get reference data for matching
+    # One client serves both the reference lookups and any submission, so
+    # the submission reuses the warm connection instead of opening another
+    manager_client = None
+    accounts_data = []
+    suppliers_data = []
     try:
         api_key = company_service.decrypt_api_key(company)
-        async with ManagerIOClient(base_url=company.base_url, api_key=api_key) as client:
-            accounts = await client.get_chart_of_accounts()
-            suppliers = await client.get_suppliers()
-            
-            accounts_data = [{"key": a.key, "name": a.name, "code": a.code} for a in accounts]
-            suppliers_data = [{"key": s.key, "name": s.name} for s in suppliers]
-    except Exception as e:
-        # Continue without reference data
-        accounts_data = []
-        suppliers_data = []
-    
-    # Create agent with Manager.io client for submissions
-    ocr_service = OCRService()
-    manager_client = None
-    if request.confirm_submission:
-        try:
-            api_key = company_service.decrypt_api_key(company)
-            manager_client = ManagerIOClient(base_url=company.base_url, api_key=api_key)
-        except Exception:
-            pass
-    
-    agent = BookkeeperAgent(
-        ocr_service=ocr_service,
-        manager_client=manager_client,
-    )
-    
-    # Process message
-    response_message, events, processed_docs = await agent.process_message(
-        user_id=current_user.id,
-        company_id=request.company_id,
-        company_name=company.name,
-        message=request.message,
-        conversation_id=request.conversation_id,
-        accounts=accounts_data,
-        suppliers=suppliers_data,
-        confirm_submission=request.confirm_submission,
-        history=request.history,
-    )
+        manager_client = ManagerIOClient(base_url=company.base_url, api_key=api_key)
+    except Exception:
+        pass
     
-    # Clean up
-    if manager_client:
-        await manager_client.close()
+    try:
+        # Get reference data for matching
+        if manager_client:
+            try:
+                accounts = await manager_client.get_chart_of_accounts()
+                suppliers = await manager_client.get_suppliers()
+                
+                accounts_data = [{"key": a.key, "name": a.name, "code": a.code} for a in accounts]
+                suppliers_data = [{"key": s.key, "name": s.name} for s in suppliers]
+            except Exception as e:
+                # Continue without reference data
+                accounts_data = []
+                suppliers_data = []
+        
+        # Create agent with Manager.io client for submissions
+        ocr_service = OCRService()
+        agent = BookkeeperAgent(
+            ocr_service=ocr_service,
+            manager_client=manager_client if request.confirm_submission else None,
+        )
+        
+        # Process message
+        response_message, events, processed_docs = await agent.process_message(
+            user_id=current_user.id,
+            company_id=request.company_id,
+            company_name=company.name,
+            message=request.message,
+            conversation_id=request.conversation_id,
+            accounts=accounts_data,
+            suppliers=suppliers_data,
+            confirm_submission=request.confirm_submission,
+            history=request.history,
+        )
+    finally:
+        # Clean up
+        if manager_client:
+            await manager_client.close()
     
     # Convert to response format
     documents = [
@@ -594,11 +598,11 @@ async def submit_documents(
 async def generate_title(
     request: GenerateTitleRequest,
     current_user: CurrentUser,
+    settings: Annotated[Settings, Depends(get_settings)],
 ) -> GenerateTitleResponse:
     """Generate a chat title from conversation messages using LLM."""
     from langchain_openai import ChatOpenAI
     from langchain_core.messages import SystemMessage, HumanMessage
-    from app.core.config import settings
     
     # Build conversation summary for title generation
     conversation_text = ""
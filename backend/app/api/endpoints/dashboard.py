@@ -14,7 +14,7 @@ Implements Requirements 7.1-7.9:
 
 import logging
 from datetime import date, datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set
 from collections import defaultdict
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -25,7 +25,13 @@ from app.api.endpoints.auth import CurrentUser
 from app.core.database import get_db
 from app.services.company import CompanyConfigService, CompanyNotFoundError
 from app.services.encryption import EncryptionService
-from app.services.manager_io import ManagerIOClient, ManagerIOError
+from app.services.manager_io import (
+    ManagerIOClient,
+    ManagerIOError,
+    ReportRow,
+    canon_report_groups,
+    canon_report_row,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -480,7 +486,7 @@ async def get_cash_balance(
                         receipt.get("Account") or receipt.get("bank_account") or ""
                     )
                     if account_key in bank_account_keys:
-                        amount = float(receipt.get("Amount") or receipt.get("amount") or 0)
+                        amount = float(receipt.get("Amount") or 0)
                         account_balances[account_key] += amount
                 
                 for payment in payments:
@@ -489,7 +495,7 @@ async def get_cash_balance(
                         payment.get("Account") or payment.get("bank_account") or ""
                     )
                     if account_key in bank_account_keys:
-                        amount = float(payment.get("Amount") or payment.get("amount") or 0)
+                        amount = float(payment.get("Amount") or 0)
                         account_balances[account_key] -= amount
                 
                 for transfer in transfers:
@@ -501,7 +507,7 @@ async def get_cash_balance(
                         transfer.get("DebitAccount") or transfer.get("ToAccount") or
                         transfer.get("ReceivedIn") or ""
                     )
-                    amount = float(transfer.get("Amount") or transfer.get("amount") or 0)
+                    amount = float(transfer.get("Amount") or 0)
                     
                     if from_account in bank_account_keys:
                         account_balances[from_account] -= amount
@@ -1020,28 +1026,25 @@ async def get_expense_breakdown(
             )
             logger.info(f"P&L for expense breakdown: {type(pnl)}")
             
-            if isinstance(pnl, dict):
-                # Look for expense groups
-                for group in pnl.get("Groups", pnl.get("groups", [])):
-                    group_name = group.get("Name") or group.get("name") or ""
+            # Look for expense groups
+            for group in canon_report_groups(pnl):
+                group_name = group.name.lower()
+                
+                # Only process expense groups
+                if "expense" in group_name or "cost" in group_name:
+                    # Get individual accounts in this group
+                    for account in group.accounts:
+                        acc_amount = abs(account.amount)
+                        if acc_amount > 0:
+                            by_account[account.name or "Other"] += acc_amount
+                            total += acc_amount
                     
-                    # Only process expense groups
-                    if "expense" in group_name.lower() or "cost" in group_name.lower():
-                        # Get individual accounts in this group
-                        for account in group.get("Accounts", group.get("accounts", [])):
-                            acc_name = account.get("Name") or account.get("name") or "Other"
-                            acc_amount = abs(float(account.get("Amount") or account.get("amount") or 
-                                                   account.get("Balance") or account.get("balance") or 0))
-                            if acc_amount > 0:
-                                by_account[acc_name] += acc_amount
-                                total += acc_amount
-                        
-                        # If no individual accounts, use group total
-                        if not group.get("Accounts") and not group.get("accounts"):
-                            group_total = abs(float(group.get("Total") or group.get("total") or 0))
-                            if group_total > 0:
-                                by_account[group_name] += group_total
-                                total += group_total
+                    # If no individual accounts, use group total
+                    if not group.accounts:
+                        group_total = abs(group.total)
+                        if group_total > 0:
+                            by_account[group.name] += group_total
+                            total += group_total
             
             logger.info(f"Expense breakdown from P&L: {len(by_account)} categories, total: {total}")
             
@@ -1056,16 +1059,26 @@ async def get_expense_breakdown(
             accounts = await client.get_chart_of_accounts()
             account_names = {acc.key: acc.name for acc in accounts}
             
-            # Fetch payments
-            payments = await client.fetch_all_paginated("/payments")
+            # Fetch payments, asking Manager.io to filter and order by date so
+            # pagination can stop once it passes the start of the range
+            date_params = {"orderBy": "Date", "desc": "true"}
+            if start_date:
+                date_params["fromDate"] = start_date.isoformat()
+            if end_date:
+                date_params["toDate"] = end_date.isoformat()
+            payments = await client.fetch_all_paginated(
+                "/payments",
+                params=date_params,
+                stop_before_date=start_date.isoformat() if start_date else None,
+            )
             
-            # Apply date range filtering
+            # Apply date range filtering (the server may ignore the params)
             payments = filter_by_date_range(payments, start_date, end_date)
             
             # Group by account
             for payment in payments:
                 account_key = payment.get("Account", "")
-                amount = float(payment.get("Amount") or payment.get("amount") or 0)
+                amount = float(payment.get("Amount") or 0)
                 
                 account_name = account_names.get(account_key, "Other")
                 by_account[account_name] += amount
@@ -1177,6 +1190,34 @@ async def get_recent_transactions(
         )
 
 
+def _build_account_balance_row(
+    row: ReportRow,
+    account_info: Dict[str, Dict[str, Any]],
+    bank_account_keys: Set[str],
+) -> Dict[str, Any]:
+    """Build an account balance response row from a trial balance row.
+    
+    Args:
+        row: Canonical trial balance row
+        account_info: Chart of accounts name/code lookup by account key
+        bank_account_keys: Keys of accounts that are bank/cash accounts
+        
+    Returns:
+        Row with key, name, code, debit, credit, balance and group
+    """
+    info = account_info.get(row.key, {})
+    return {
+        "key": row.key,
+        "name": row.name or info.get("name") or "Unknown",
+        "code": row.code or info.get("code"),
+        "debit": round(row.debit, 2),
+        "credit": round(row.credit, 2),
+        "balance": round(row.balance, 2),
+        "is_bank_account": row.key in bank_account_keys,
+        "group": row.group,
+    }
+
+
 @router.get(
     "/account-balances",
     summary="Get all account balances",
@@ -1199,10 +1240,6 @@ async def get_account_balances(
         
         effective_date = as_of_date or date.today()
         
-        # Get trial balance
-        trial_balance = await client.get_trial_balance(effective_date.isoformat())
-        logger.info(f"Trial balance response: {type(trial_balance)}")
-        
         # Get chart of accounts for additional info
         accounts = await client.get_chart_of_accounts()
         account_info = {acc.key: {"name": acc.name, "code": acc.code} for acc in accounts}
@@ -1215,73 +1252,60 @@ async def get_account_balances(
             if key:
                 bank_account_keys.add(key)
         
-        # Parse trial balance
+        # Stream the grouped trial balance so rows are aggregated while the
+        # report downloads instead of after the whole body is in memory
         balances_by_account = []
+        total_debit = 0.0
+        total_credit = 0.0
+        cash_total = 0.0
+        trial_balance = None
         
-        # Handle different response formats
-        tb_items = []
-        if isinstance(trial_balance, list):
-            tb_items = trial_balance
-        elif isinstance(trial_balance, dict):
-            # Try different structures
-            tb_items = trial_balance.get("items", trial_balance.get("data", []))
-            
-            # Check for grouped structure
-            if not tb_items and "Groups" in trial_balance:
-                for group in trial_balance.get("Groups", []):
-                    group_name = group.get("Name") or group.get("name") or ""
-                    for acc in group.get("Accounts", group.get("accounts", [])):
-                        acc["_group"] = group_name
-                        tb_items.append(acc)
-            
-            # Check for Accounts at top level
-            if not tb_items and "Accounts" in trial_balance:
-                tb_items = trial_balance.get("Accounts", [])
+        def add_row(tb_row: ReportRow) -> None:
+            nonlocal total_debit, total_credit, cash_total
+            row = _build_account_balance_row(tb_row, account_info, bank_account_keys)
+            balances_by_account.append(row)
+            total_debit += row["debit"]
+            total_credit += row["credit"]
+            if row["is_bank_account"]:
+                cash_total += row["balance"]
         
-        for item in tb_items:
-            account_key = (
-                item.get("Key") or item.get("key") or 
-                item.get("Account") or item.get("account") or
-                item.get("AccountKey") or item.get("account_key") or ""
-            )
-            
-            # Get balance
-            balance = 0.0
-            debit = float(item.get("Debit") or item.get("debit") or 0)
-            credit = float(item.get("Credit") or item.get("credit") or 0)
-            
-            if "Balance" in item or "balance" in item:
-                balance = float(item.get("Balance") or item.get("balance") or 0)
-            else:
-                balance = debit - credit
+        try:
+            async for group in client.stream_trial_balance(effective_date.isoformat()):
+                for tb_row in group.accounts:
+                    add_row(tb_row)
+        except ManagerIOError as e:
+            logger.warning(f"Streaming trial balance failed, using dict API: {e}")
+            balances_by_account.clear()
+            total_debit = total_credit = cash_total = 0.0
+        
+        if not balances_by_account:
+            # Fall back to the dict API for ungrouped or derived responses
+            trial_balance = await client.get_trial_balance(effective_date.isoformat())
+            logger.info(f"Trial balance response: {type(trial_balance)}")
             
-            account_name = (
-                item.get("Name") or item.get("name") or
-                account_info.get(account_key, {}).get("name") or "Unknown"
-            )
-            account_code = (
-                item.get("Code") or item.get("code") or
-                account_info.get(account_key, {}).get("code")
-            )
+            # Handle different response formats
+            tb_rows: List[ReportRow] = []
+            if isinstance(trial_balance, list):
+                tb_rows = [canon_report_row(item) for item in trial_balance]
+            elif isinstance(trial_balance, dict):
+                # Try different structures
+                tb_items = trial_balance.get("items", trial_balance.get("data", []))
+                tb_rows = [canon_report_row(item) for item in tb_items]
+                
+                # Check for grouped structure
+                if not tb_rows:
+                    for group in canon_report_groups(trial_balance):
+                        tb_rows.extend(group.accounts)
+                
+                # Check for Accounts at top level
+                if not tb_rows and "Accounts" in trial_balance:
+                    tb_rows = [canon_report_row(item) for item in trial_balance["Accounts"]]
             
-            balances_by_account.append({
-                "key": account_key,
-                "name": account_name,
-                "code": account_code,
-                "debit": round(debit, 2),
-                "credit": round(credit, 2),
-                "balance": round(balance, 2),
-                "is_bank_account": account_key in bank_account_keys,
-                "group": item.get("_group"),
-            })
+            for tb_row in tb_rows:
+                add_row(tb_row)
         
         await client.close()
         
-        # Calculate totals
-        total_debit = sum(a["debit"] for a in balances_by_account)
-        total_credit = sum(a["credit"] for a in balances_by_account)
-        cash_total = sum(a["balance"] for a in balances_by_account if a["is_bank_account"])
-        
         return {
             "as_of_date": effective_date.isoformat(),
             "accounts": balances_by_account,
@@ -1289,7 +1313,7 @@ async def get_account_balances(
             "total_debit": round(total_debit, 2),
             "total_credit": round(total_credit, 2),
             "cash_total": round(cash_total, 2),
-            "raw_trial_balance": trial_balance,  # Include raw data for debugging
+            "raw_trial_balance": trial_balance,  # Dict API fallback only, for debugging
         }
         
     except ManagerIOError as e:
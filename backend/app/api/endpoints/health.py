@@ -8,6 +8,7 @@ Validates: Requirements 12.1, 12.2, 12.3
 
 import logging
 from datetime import datetime
+from time import perf_counter
 from typing import Dict, Optional
 
 from fastapi import APIRouter, Depends
@@ -43,9 +44,9 @@ async def check_database(db: AsyncSession) -> ServiceStatus:
     """Check database connectivity."""
     try:
         from sqlalchemy import text
-        start = datetime.now()
+        start = perf_counter()
         await db.execute(text("SELECT 1"))
-        latency = (datetime.now() - start).total_seconds() * 1000
+        latency = (perf_counter() - start) * 1000.0
         return ServiceStatus(available=True, latency_ms=latency)
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
@@ -56,9 +57,9 @@ async def check_lmstudio() -> ServiceStatus:
     """Check LMStudio connectivity."""
     try:
         ocr_service = OCRService()
-        start = datetime.now()
+        start = perf_counter()
         available = await ocr_service.health_check()
-        latency = (datetime.now() - start).total_seconds() * 1000
+        latency = (perf_counter() - start) * 1000.0
         await ocr_service.close()
         
         if available:
@@ -80,9 +81,9 @@ async def check_ollama() -> ServiceStatus:
     """Check Ollama connectivity."""
     try:
         llm_service = LLMService()
-        start = datetime.now()
+        start = perf_counter()
         health = await llm_service.health_check()
-        latency = (datetime.now() - start).total_seconds() * 1000
+        latency = (perf_counter() - start) * 1000.0
         await llm_service.close()
         
         if health.get("ollama", False):
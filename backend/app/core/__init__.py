@@ -1,10 +1,11 @@
 """Core application modules."""
 
-from app.core.config import settings
+from app.core.config import get_settings, settings
 from app.core.database import Base, get_db, get_db_context, init_db
 from app.core.logging import get_logger, setup_logging
 
 __all__ = [
+    "get_settings",
     "settings",
     "Base",
     "get_db",
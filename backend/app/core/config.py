@@ -1,6 +1,7 @@
 """Application configuration using Pydantic Settings."""
 
 import os
+from functools import cached_property, lru_cache
 from typing import List
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -20,6 +21,9 @@ class Settings(BaseSettings):
     debug: bool = False
     secret_key: str = "change-me-in-production"
 
+    # Server
+    thread_pool_tokens: int = 200  # AnyIO worker threads for sync dependencies
+
     # Database
     database_url: str = "sqlite+aiosqlite:///./automanager.db"
 
@@ -46,6 +50,27 @@ class Settings(BaseSettings):
     # For testing, set ENCRYPTION_KEY environment variable
     encryption_key: str = ""
 
+    @cached_property
+    def database_url_masked(self) -> str:
+        """Database URL with any credentials stripped, safe for logging."""
+        return self.database_url.rsplit("@", 1)[-1]
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get the cached application settings.
+
+    Use as a FastAPI dependency (``Depends(get_settings)``) so the
+    environment and ``.env`` file are parsed once per process, and tests can
+    swap settings via ``app.dependency_overrides``.
+
+    Returns:
+        Shared Settings instance
+    """
+    return Settings()
+
 
 # Create settings instance
-settings = Settings()
+settings = get_settings()
+
+__all__ = ["Settings", "get_settings", "settings"]
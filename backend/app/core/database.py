@@ -2,7 +2,10 @@
 
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any
 
+import orjson
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
@@ -20,10 +23,16 @@ class Base(DeclarativeBase):
     pass
 
 
+def _json_serializer(value: Any) -> str:
+    """Serialize JSON/JSONB column values with orjson."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 def create_engine() -> AsyncEngine:
     """Create async database engine based on configuration.
     
-    Supports SQLite for development and PostgreSQL for production.
+    Supports SQLite for development and PostgreSQL for production. JSON
+    columns are encoded and decoded with orjson.
     """
     database_url = settings.database_url
     
@@ -34,6 +43,8 @@ def create_engine() -> AsyncEngine:
             database_url,
             echo=settings.debug,
             connect_args={"check_same_thread": False},
+            json_serializer=_json_serializer,
+            json_deserializer=orjson.loads,
         )
     else:
         # PostgreSQL configuration
@@ -43,22 +54,33 @@ def create_engine() -> AsyncEngine:
             pool_size=5,
             max_overflow=10,
             pool_pre_ping=True,
+            json_serializer=_json_serializer,
+            json_deserializer=orjson.loads,
         )
     
     return engine
 
 
-# Create the async engine
-engine = create_engine()
+@lru_cache(maxsize=1)
+def get_engine() -> AsyncEngine:
+    """Get the process-wide async engine, creating it on first use.
+    
+    Cached so repeated calls share a single connection pool. Call
+    ``get_engine.cache_clear()`` after disposing to rebuild it (e.g. in tests).
+    """
+    return create_engine()
+
 
-# Create async session factory
-async_session_factory = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
+@lru_cache(maxsize=1)
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Get the async session factory bound to the shared engine."""
+    return async_sessionmaker(
+        get_engine(),
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -69,7 +91,7 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         async def get_items(db: AsyncSession = Depends(get_db)):
             ...
     """
-    async with async_session_factory() as session:
+    async with get_session_factory()() as session:
         try:
             yield session
             await session.commit()
@@ -88,7 +110,7 @@ async def get_db_context() -> AsyncGenerator[AsyncSession, None]:
         async with get_db_context() as db:
             result = await db.execute(query)
     """
-    async with async_session_factory() as session:
+    async with get_session_factory()() as session:
         try:
             yield session
             await session.commit()
@@ -104,7 +126,7 @@ async def init_db() -> None:
     
     Should be called on application startup.
     """
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
 
@@ -113,4 +135,5 @@ async def close_db() -> None:
     
     Should be called on application shutdown.
     """
-    await engine.dispose()
+    if get_engine.cache_info().currsize:
+        await get_engine().dispose()
@@ -6,15 +6,22 @@ for users to resolve issues.
 Validates: Requirements 12.1, 12.2, 12.3
 """
 
-from enum import Enum
-from typing import Any, Dict, Optional
+import sys
+from enum import StrEnum
+from functools import cached_property, lru_cache
+from typing import Any, Dict, List, Optional, Tuple, cast
 
+import orjson
 from fastapi import HTTPException, status
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
 
-class ErrorCode(str, Enum):
-    """Standardized error codes for the application."""
+class ErrorCode(StrEnum):
+    """Standardized error codes for the application.
+    
+    Members also act as integers via ``__index__`` (their definition order),
+    so the per-code lookup tables below are plain tuple/list indexing.
+    """
     
     # Authentication errors
     AUTH_INVALID_CREDENTIALS = "AUTH_INVALID_CREDENTIALS"
@@ -61,6 +68,17 @@ class ErrorCode(str, Enum):
     INTERNAL_ERROR = "INTERNAL_ERROR"
     NOT_FOUND = "NOT_FOUND"
     RATE_LIMITED = "RATE_LIMITED"
+    
+    # Definition order, assigned once the members exist
+    _ordinal: int
+    
+    def __index__(self) -> int:
+        return self._ordinal
+
+
+for _ordinal, _code in enumerate(ErrorCode):
+    _code._ordinal = _ordinal
+del _ordinal, _code
 
 
 class ErrorResponse(BaseModel):
@@ -74,7 +92,17 @@ class ErrorResponse(BaseModel):
         retry_after: Seconds to wait before retrying (for rate limits)
         suggested_action: Actionable suggestion for the user
         is_retryable: Whether the operation can be retried
+    
+    ``error``, ``error_code`` and the default ``suggested_action`` are interned
+    strings shared across all responses for the same code.
     """
+    model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
+        validate_assignment=False,
+        arbitrary_types_allowed=False,
+    )
+    
     error: str
     error_code: str
     message: str
@@ -141,6 +169,119 @@ RETRYABLE_ERRORS = {
 }
 
 
+# Intern code values and action strings so every payload shares one copy and
+# equality checks downstream (logs, metrics labels) are identity-fast
+for _code in ErrorCode:
+    _code._value_ = sys.intern(_code.value)
+del _code
+SUGGESTED_ACTIONS = {code: sys.intern(action) for code, action in SUGGESTED_ACTIONS.items()}
+
+# HTTP status per error code where it differs from 400 Bad Request
+_ERROR_STATUS = {
+    ErrorCode.AUTH_INVALID_CREDENTIALS: status.HTTP_401_UNAUTHORIZED,
+    ErrorCode.AUTH_TOKEN_EXPIRED: status.HTTP_401_UNAUTHORIZED,
+    ErrorCode.AUTH_TOKEN_INVALID: status.HTTP_401_UNAUTHORIZED,
+    ErrorCode.AUTH_UNAUTHORIZED: status.HTTP_401_UNAUTHORIZED,
+    ErrorCode.COMPANY_NOT_FOUND: status.HTTP_404_NOT_FOUND,
+    ErrorCode.COMPANY_CONNECTION_FAILED: status.HTTP_503_SERVICE_UNAVAILABLE,
+    ErrorCode.MANAGER_IO_CONNECTION_ERROR: status.HTTP_503_SERVICE_UNAVAILABLE,
+    ErrorCode.MANAGER_IO_NOT_FOUND: status.HTTP_404_NOT_FOUND,
+    ErrorCode.MANAGER_IO_VALIDATION_ERROR: status.HTTP_422_UNPROCESSABLE_ENTITY,
+    ErrorCode.MANAGER_IO_RATE_LIMITED: status.HTTP_429_TOO_MANY_REQUESTS,
+    ErrorCode.MANAGER_IO_SERVER_ERROR: status.HTTP_503_SERVICE_UNAVAILABLE,
+    ErrorCode.OCR_CONNECTION_ERROR: status.HTTP_503_SERVICE_UNAVAILABLE,
+    ErrorCode.OCR_MODEL_NOT_FOUND: status.HTTP_503_SERVICE_UNAVAILABLE,
+    ErrorCode.OCR_TIMEOUT: status.HTTP_503_SERVICE_UNAVAILABLE,
+    ErrorCode.LLM_CONNECTION_ERROR: status.HTTP_503_SERVICE_UNAVAILABLE,
+    ErrorCode.LLM_MODEL_NOT_FOUND: status.HTTP_503_SERVICE_UNAVAILABLE,
+    ErrorCode.LLM_PROVIDER_ERROR: status.HTTP_503_SERVICE_UNAVAILABLE,
+    ErrorCode.LLM_TIMEOUT: status.HTTP_503_SERVICE_UNAVAILABLE,
+    ErrorCode.VALIDATION_ERROR: status.HTTP_422_UNPROCESSABLE_ENTITY,
+    ErrorCode.MISSING_REQUIRED_FIELD: status.HTTP_422_UNPROCESSABLE_ENTITY,
+    ErrorCode.NETWORK_ERROR: status.HTTP_503_SERVICE_UNAVAILABLE,
+    ErrorCode.TIMEOUT: status.HTTP_503_SERVICE_UNAVAILABLE,
+    ErrorCode.CONNECTION_REFUSED: status.HTTP_503_SERVICE_UNAVAILABLE,
+    ErrorCode.INTERNAL_ERROR: status.HTTP_500_INTERNAL_SERVER_ERROR,
+    ErrorCode.NOT_FOUND: status.HTTP_404_NOT_FOUND,
+    ErrorCode.RATE_LIMITED: status.HTTP_429_TOO_MANY_REQUESTS,
+}
+
+# Code-indexed lookup tables (ErrorCode supports __index__): a slot per code
+# for suggested actions and HTTP status, and a bitset for retryability,
+# instead of hashing into the dicts/set above
+_ACTIONS: Tuple[Optional[str], ...] = tuple(SUGGESTED_ACTIONS.get(code) for code in ErrorCode)
+_STATUS_BY_CODE: List[int] = [
+    _ERROR_STATUS.get(code, status.HTTP_400_BAD_REQUEST) for code in ErrorCode
+]
+_RETRYABLE_BITS: int = sum(1 << code.__index__() for code in RETRYABLE_ERRORS)
+
+
+def get_suggested_action(error_code: ErrorCode) -> Optional[str]:
+    """Get the suggested user action for an error code."""
+    return _ACTIONS[error_code]
+
+
+def get_status_code(error_code: ErrorCode) -> int:
+    """Get the default HTTP status code for an error code."""
+    return _STATUS_BY_CODE[error_code]
+
+
+def is_retryable(error_code: ErrorCode) -> bool:
+    """Check whether an operation failing with this error code can be retried."""
+    return bool((_RETRYABLE_BITS >> error_code.__index__()) & 1)
+
+
+# Prebuilt response payloads per error code; create_error_response copies
+# one and patches only the caller-supplied fields
+_ERROR_TEMPLATES: Dict[ErrorCode, Dict[str, Any]] = {
+    code: {
+        "error": code.value,
+        "error_code": code.value,
+        "message": get_suggested_action(code) or "An error occurred",
+        "details": None,
+        "retry_after": None,
+        "suggested_action": get_suggested_action(code),
+        "is_retryable": is_retryable(code),
+    }
+    for code in ErrorCode
+}
+
+
+# Compiled serializer for ErrorResponse (pydantic-core, no dict round trip)
+_ERROR_ADAPTER: TypeAdapter[ErrorResponse] = TypeAdapter(ErrorResponse)
+
+# Serialized default payloads, written as-is when an error has no overrides
+_ERROR_BYTES: Dict[ErrorCode, bytes] = {
+    code: _ERROR_ADAPTER.dump_json(ErrorResponse.model_construct(**template))
+    for code, template in _ERROR_TEMPLATES.items()
+}
+
+
+def _build_error_detail(
+    error_code: ErrorCode,
+    message: Optional[str] = None,
+    details: Optional[Dict[str, Any]] = None,
+    retry_after: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Copy the template for an error code and patch in caller overrides."""
+    data = _ERROR_TEMPLATES[error_code].copy()
+    if message:
+        data["message"] = message
+    if details is not None:
+        data["details"] = details
+    if retry_after is not None:
+        data["retry_after"] = retry_after
+    return data
+
+
+@lru_cache(maxsize=256)
+def _build_detail_bytes(error_code: ErrorCode, retry_after: Optional[int]) -> bytes:
+    """Serialized payload for a canned error, memoized per (code, retry_after)."""
+    if retry_after is None:
+        return _ERROR_BYTES[error_code]
+    return orjson.dumps(_build_error_detail(error_code, retry_after=retry_after))
+
+
 def create_error_response(
     error_code: ErrorCode,
     message: Optional[str] = None,
@@ -149,6 +290,9 @@ def create_error_response(
 ) -> ErrorResponse:
     """Create a standardized error response.
     
+    Built from the prebuilt template for the error code with
+    ``model_construct``, so no validation runs on the error path.
+    
     Args:
         error_code: The error code
         message: Optional custom message (uses default if not provided)
@@ -158,17 +302,8 @@ def create_error_response(
     Returns:
         ErrorResponse with suggested action
     """
-    suggested_action = SUGGESTED_ACTIONS.get(error_code)
-    is_retryable = error_code in RETRYABLE_ERRORS
-    
-    return ErrorResponse(
-        error=error_code.value,
-        error_code=error_code.value,
-        message=message or suggested_action or "An error occurred",
-        details=details,
-        retry_after=retry_after,
-        suggested_action=suggested_action,
-        is_retryable=is_retryable,
+    return ErrorResponse.model_construct(
+        **_build_error_detail(error_code, message, details, retry_after)
     )
 
 
@@ -176,29 +311,44 @@ class AppException(HTTPException):
     """Application exception with standardized error response.
     
     Use this exception to raise errors with consistent formatting
-    and suggested actions.
+    and suggested actions. The HTTP ``detail`` is the plain payload dict;
+    ``error_response`` builds the model lazily. When ``status_code`` is not
+    given it defaults to the status registered for the error code.
     """
     
     def __init__(
         self,
         error_code: ErrorCode,
-        status_code: int = status.HTTP_400_BAD_REQUEST,
+        status_code: Optional[int] = None,
         message: Optional[str] = None,
         details: Optional[Dict[str, Any]] = None,
         retry_after: Optional[int] = None,
     ):
         self.error_code = error_code
-        self.error_response = create_error_response(
-            error_code=error_code,
-            message=message,
-            details=details,
-            retry_after=retry_after,
+        # Shared response body when only the code/retry delay are set
+        self._body_bytes: Optional[bytes] = (
+            _build_detail_bytes(error_code, retry_after)
+            if not message and details is None
+            else None
         )
         
         super().__init__(
-            status_code=status_code,
-            detail=self.error_response.model_dump(),
+            status_code=_STATUS_BY_CODE[error_code] if status_code is None else status_code,
+            detail=_build_error_detail(error_code, message, details, retry_after),
         )
+    
+    @cached_property
+    def error_response(self) -> ErrorResponse:
+        """Error response model, materialized only when accessed."""
+        # detail is the payload dict built in __init__ (HTTPException types it as str)
+        return ErrorResponse.model_construct(**cast(Dict[str, Any], self.detail))
+    
+    @property
+    def body_bytes(self) -> bytes:
+        """JSON-encoded response body for this error."""
+        if self._body_bytes is None:
+            self._body_bytes = orjson.dumps(self.detail)
+        return self._body_bytes
 
 
 # Convenience exception classes
@@ -7,47 +7,47 @@ from typing import Any
 from app.core.config import settings
 
 
+_LOG_CONFIGURED = False
+
+# Resolved loggers by module name; logging keeps every logger alive anyway
+_LOGGER_CACHE: dict[str, logging.Logger] = {}
+
+
 def setup_logging() -> None:
     """Configure application logging.
     
     Sets up structured logging with appropriate levels based on debug mode.
+    Only the first call configures handlers; later calls are no-ops.
     """
+    global _LOG_CONFIGURED
+    if _LOG_CONFIGURED:
+        return
+    
     # Determine log level based on debug setting
     log_level = logging.DEBUG if settings.debug else logging.INFO
     
-    # Create formatter
-    formatter = logging.Formatter(
-        fmt="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    # Replace any existing root handlers with a single console handler
+    logging.basicConfig(
+        level=log_level,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
+        stream=sys.stdout,
+        force=True,
     )
     
-    # Configure root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(log_level)
-    
-    # Remove existing handlers to avoid duplicates
-    for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
-    
-    # Add console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(log_level)
-    console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
-    
     # Configure specific loggers
     # Reduce noise from third-party libraries
-    logging.getLogger("uvicorn").setLevel(logging.INFO)
-    logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
-    logging.getLogger("sqlalchemy.engine").setLevel(
-        logging.INFO if settings.debug else logging.WARNING
-    )
-    logging.getLogger("httpx").setLevel(logging.WARNING)
-    logging.getLogger("httpcore").setLevel(logging.WARNING)
+    for name, level in (
+        ("uvicorn", logging.INFO),
+        ("uvicorn.access", logging.WARNING),
+        ("sqlalchemy.engine", logging.INFO if settings.debug else logging.WARNING),
+        ("httpx", logging.WARNING),
+        ("httpcore", logging.WARNING),
+        ("app", log_level),
+    ):
+        logging.getLogger(name).setLevel(level)
     
-    # Application logger
-    app_logger = logging.getLogger("app")
-    app_logger.setLevel(log_level)
+    _LOG_CONFIGURED = True
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -63,18 +63,36 @@ def get_logger(name: str) -> logging.Logger:
         logger = get_logger(__name__)
         logger.info("Processing document")
     """
-    return logging.getLogger(f"app.{name}")
+    logger = _LOGGER_CACHE.get(name)
+    if logger is None:
+        logger = _LOGGER_CACHE[name] = logging.getLogger(f"app.{name}")
+    return logger
 
 
 class LoggerAdapter(logging.LoggerAdapter):
     """Logger adapter that adds context to log messages.
     
+    The context suffix is built once when ``extra`` is assigned; reassign
+    ``extra`` (rather than mutating it in place) to change the context.
+    
     Usage:
         logger = LoggerAdapter(get_logger(__name__), {"user_id": "123"})
         logger.info("User action")  # Logs: "User action - user_id=123"
     """
     
+    @property
+    def extra(self) -> Any:
+        """Context values appended to every message."""
+        return self._extra
+    
+    @extra.setter
+    def extra(self, value: Any) -> None:
+        self._extra = value
+        self._extras_suffix = (
+            " - ".join(f"{k}={v}" for k, v in value.items()) if value else ""
+        )
+    
     def process(self, msg: str, kwargs: Any) -> tuple[str, Any]:
         """Process the log message to include extra context."""
-        extra = " - ".join(f"{k}={v}" for k, v in self.extra.items())
-        return f"{msg} - {extra}" if extra else msg, kwargs
+        suffix = self._extras_suffix
+        return f"{msg} - {suffix}" if suffix else msg, kwargs
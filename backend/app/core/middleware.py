@@ -0,0 +1,74 @@
+"""Lightweight ASGI middleware."""
+
+from typing import Any, Optional
+
+from starlette.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class PreflightCacheMiddleware:
+    """Answer CORS preflight requests from allowlisted origins directly.
+
+    Takes the same options as ``CORSMiddleware`` and is mounted outside it.
+    The response headers are taken once from an equivalent
+    ``CORSMiddleware`` instance. A preflight whose origin is in the explicit
+    allowlist and whose method is allowed then gets a prebuilt 200 response
+    without going through the rest of the stack. Anything else (other
+    origins, disallowed methods, private network requests) is passed
+    through, so ``CORSMiddleware`` still handles every rejection.
+    """
+
+    def __init__(self, app: ASGIApp, /, **cors_options: Any) -> None:
+        self.app = app
+        policy = CORSMiddleware(app, **cors_options)
+        self._allowed_origins = frozenset(
+            origin.encode("latin-1")
+            for origin in cors_options.get("allow_origins", ())
+            if origin != "*"
+        )
+        self._allowed_methods = frozenset(
+            method.encode("latin-1") for method in policy.allow_methods
+        )
+        self._mirror_headers = policy.allow_all_headers
+        self._static_headers = tuple(
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in policy.preflight_headers.items()
+        ) + (
+            (b"content-type", b"text/plain; charset=utf-8"),
+            (b"content-length", b"2"),
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        origin: Optional[bytes] = None
+        requested_method: Optional[bytes] = None
+        requested_headers: Optional[bytes] = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                requested_method = value
+            elif name == b"access-control-request-headers":
+                requested_headers = value
+            elif name == b"access-control-request-private-network":
+                # Rare; let CORSMiddleware decide
+                await self.app(scope, receive, send)
+                return
+
+        if (
+            origin not in self._allowed_origins
+            or requested_method not in self._allowed_methods
+            or (requested_headers is not None and not self._mirror_headers)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = [(b"access-control-allow-origin", origin), *self._static_headers]
+        if requested_headers is not None:
+            headers.append((b"access-control-allow-headers", requested_headers))
+
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b"OK"})
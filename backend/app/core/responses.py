@@ -0,0 +1,23 @@
+"""Fast JSON response classes."""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Used as the application's ``default_response_class``. Values orjson
+    cannot serialize natively fall back to ``str()``.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=str,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
@@ -1,15 +1,19 @@
 """FastAPI application entry point."""
 
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, Dict
 
-from fastapi import FastAPI
+import anyio.to_thread
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.router import api_router
 from app.core.config import settings
 from app.core.database import close_db, init_db
+from app.core.errors import AppException
 from app.core.logging import get_logger, setup_logging
+from app.core.middleware import PreflightCacheMiddleware
+from app.core.responses import ORJSONResponse
 
 # Set up logging
 setup_logging()
@@ -21,8 +25,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan manager for startup and shutdown events."""
     # Startup
     logger.info("Starting Manager.io Bookkeeper API")
-    logger.info(f"Debug mode: {settings.debug}")
-    logger.info(f"Database URL: {settings.database_url.split('@')[-1] if '@' in settings.database_url else settings.database_url}")
+    logger.info("Debug mode: %s", settings.debug)
+    logger.info("Database URL: %s", settings.database_url_masked)
+    
+    # Raise the default 40-token thread pool so sync dependencies don't serialize
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.thread_pool_tokens
     
     # Initialize database
     await init_db()
@@ -44,36 +51,56 @@ app = FastAPI(
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
-app.add_middleware(
-    CORSMiddleware,
+_cors_options: Dict[str, Any] = dict(
     allow_origins=settings.cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CORSMiddleware, **_cors_options)
+# Answer preflights from known origins before they reach CORSMiddleware
+app.add_middleware(PreflightCacheMiddleware, **_cors_options)
 
 # Include API router
 app.include_router(api_router)
 
 
+@app.exception_handler(AppException)
+async def app_exception_handler(request: Request, exc: AppException) -> Response:
+    """Write the standardized error payload without re-encoding it."""
+    headers = exc.headers
+    # AppException always carries a dict payload; HTTPException types it as str
+    detail = exc.detail
+    retry_after = detail.get("retry_after") if isinstance(detail, dict) else None
+    if retry_after is not None:
+        headers = {**(headers or {}), "Retry-After": str(retry_after)}
+    return Response(
+        content=exc.body_bytes,
+        status_code=exc.status_code,
+        headers=headers,
+        media_type="application/json",
+    )
+
+
 @app.get("/api/health")
-async def health_check():
+async def health_check() -> ORJSONResponse:
     """Health check endpoint."""
-    return {
+    return ORJSONResponse({
         "status": "healthy",
         "version": "0.1.0",
         "debug": settings.debug,
-    }
+    })
 
 
 @app.get("/")
-async def root():
+async def root() -> ORJSONResponse:
     """Root endpoint."""
-    return {
+    return ORJSONResponse({
         "message": "Manager.io Bookkeeper API",
         "docs": "/api/docs",
         "api": "/api/v1",
-    }
+    })
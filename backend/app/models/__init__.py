@@ -4,6 +4,8 @@ All models should be imported here to ensure they are registered
 with SQLAlchemy's metadata before database initialization.
 """
 
+from sqlalchemy.orm import configure_mappers
+
 from app.models.base import BaseModel, TimestampMixin, UUIDPrimaryKeyMixin
 from app.models.user import Session, User
 from app.models.company import CompanyConfig
@@ -20,3 +22,6 @@ __all__ = [
     "ChatMessage",
     "ProcessedDocument",
 ]
+
+# Resolve relationship targets now rather than on the first query
+configure_mappers()
@@ -1,18 +1,62 @@
 """Base model classes and mixins for SQLAlchemy models."""
 
+import os
+import threading
+import time
 from datetime import datetime
-from typing import Any
-from uuid import uuid4
+from operator import attrgetter
+from typing import Any, Callable, ClassVar, Optional
+from uuid import UUID
 
-from sqlalchemy import DateTime, String, func
+from sqlalchemy import DateTime, String, Uuid, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
 
+# Id column type: a native uuid on PostgreSQL, and on SQLite the dashed
+# 36-character strings existing databases already hold, so old rows still
+# match by id and join on their foreign keys.
+UUIDString = Uuid(as_uuid=False).with_variant(String(36), "sqlite")
+
+
+# Last (milliseconds, counter) handed out by generate_uuid
+_UUID_COUNTER_BITS = 74  # rand_a (12) + rand_b (62)
+_uuid_state = (0, 0)
+_uuid_lock = threading.Lock()
+
 
 def generate_uuid() -> str:
-    """Generate a UUID string for primary keys."""
-    return str(uuid4())
+    """Generate a time-ordered UUIDv7 string for primary keys.
+    
+    The leading 48 bits are the Unix time in milliseconds, so new rows land
+    at the end of the primary-key index instead of at random positions.
+    Within one millisecond the 74 bits after the version act as a counter
+    (RFC 9562 section 6.2, method 2): a new millisecond starts it at a random
+    value and each further id adds one, so ids from this process are strictly
+    increasing and can order rows that share a timestamp.
+    """
+    global _uuid_state
+    now_ms = time.time_ns() // 1_000_000
+    with _uuid_lock:
+        last_ms, last_counter = _uuid_state
+        if now_ms > last_ms:
+            ms = now_ms
+            # Top bit clear leaves room to count up within the millisecond
+            counter = int.from_bytes(os.urandom(10), "big") >> (80 - _UUID_COUNTER_BITS + 1)
+        else:
+            # Same millisecond, or the clock stepped back
+            ms, counter = last_ms, last_counter + 1
+            if counter >> _UUID_COUNTER_BITS:
+                ms, counter = ms + 1, 0
+        _uuid_state = (ms, counter)
+    value = (
+        ms << 80
+        | 0x7 << 76  # version 7
+        | (counter >> 62) << 64  # rand_a
+        | 0x2 << 62  # RFC 4122 variant
+        | counter & ((1 << 62) - 1)  # rand_b
+    )
+    return str(UUID(int=value))
 
 
 class TimestampMixin:
@@ -31,10 +75,14 @@ class TimestampMixin:
 
 
 class UUIDPrimaryKeyMixin:
-    """Mixin that adds a UUID primary key column."""
+    """Mixin that adds a UUID primary key column.
+    
+    Stored as a native ``uuid`` on PostgreSQL and as a dashed String(36) on
+    SQLite; values are exposed to Python as strings.
+    """
     
     id: Mapped[str] = mapped_column(
-        String(36),
+        UUIDString,
         primary_key=True,
         default=generate_uuid,
     )
@@ -54,6 +102,32 @@ class BaseModel(Base, UUIDPrimaryKeyMixin, TimestampMixin):
     """
     
     __abstract__ = True
+    # Fetch server-generated values (created_at, updated_at, JSON defaults)
+    # with INSERT/UPDATE ... RETURNING during flush, so no refresh is needed
+    __mapper_args__ = {"eager_defaults": True}
+    
+    # Identifying fields shown by __repr__ and a getter for their values,
+    # set per subclass by __init_subclass__
+    _repr_fields: ClassVar[tuple[str, ...]] = ()
+    _repr_getter: ClassVar[Optional[Callable[[Any], Any]]] = None
+    
+    @classmethod
+    def _column_getter(cls) -> tuple[tuple[str, ...], Callable[[Any], tuple[Any, ...]]]:
+        """Get the column names and a getter returning their values as a tuple.
+        
+        Built once per concrete model class and cached on the class.
+        """
+        cached = cls.__dict__.get("_cached_column_getter")
+        if cached is None:
+            names = tuple(column.name for column in cls.__table__.columns)
+            if len(names) == 1:
+                name = names[0]
+                getter = lambda obj: (getattr(obj, name),)  # noqa: E731
+            else:
+                getter = attrgetter(*names)
+            cached = (names, getter)
+            cls._cached_column_getter = cached
+        return cached
     
     def to_dict(self) -> dict[str, Any]:
         """Convert model instance to dictionary.
@@ -61,17 +135,27 @@ class BaseModel(Base, UUIDPrimaryKeyMixin, TimestampMixin):
         Returns:
             Dictionary representation of the model.
         """
-        return {
-            column.name: getattr(self, column.name)
-            for column in self.__table__.columns
-        }
+        names, getter = type(self)._column_getter()
+        return dict(zip(names, getter(self)))
+    
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Precompute the identifying fields shown by ``__repr__``."""
+        super().__init_subclass__(**kwargs)
+        cls._repr_fields = tuple(
+            name for name in ("id", "name", "email") if hasattr(cls, name)
+        )
+        cls._repr_getter = attrgetter(*cls._repr_fields) if cls._repr_fields else None
     
     def __repr__(self) -> str:
         """Return string representation of the model."""
         class_name = self.__class__.__name__
-        attrs = ", ".join(
-            f"{k}={v!r}"
-            for k, v in self.to_dict().items()
-            if k in ("id", "name", "email")  # Only show key identifying fields
-        )
+        fields = self._repr_fields
+        getter = type(self)._repr_getter
+        if getter is None:
+            return f"<{class_name}()>"
+        values = getter(self)
+        if len(fields) == 1:
+            values = (values,)
+        # Only show key identifying fields
+        attrs = ", ".join(f"{k}={v!r}" for k, v in zip(fields, values))
         return f"<{class_name}({attrs})>"
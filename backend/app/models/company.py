@@ -5,7 +5,7 @@ from typing import TYPE_CHECKING, List
 from sqlalchemy import ForeignKey, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import BaseModel
+from app.models.base import BaseModel, UUIDString
 
 if TYPE_CHECKING:
     from app.models.user import User
@@ -30,7 +30,7 @@ class CompanyConfig(BaseModel):
     __tablename__ = "company_configs"
     
     user_id: Mapped[str] = mapped_column(
-        String(36),
+        UUIDString,
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
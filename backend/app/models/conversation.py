@@ -1,12 +1,15 @@
 """Conversation and message models for chat history persistence."""
 
-from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import Column, DateTime, ForeignKey, String, Text, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import ForeignKey, Index, String, Text, JSON, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import BaseModel
+from app.models.base import BaseModel, UUIDString
+
+# Binary JSON on PostgreSQL (stored parsed), plain JSON elsewhere (SQLite)
+_JSONB = JSON().with_variant(JSONB(), "postgresql")
 
 
 class Conversation(BaseModel):
@@ -21,13 +24,31 @@ class Conversation(BaseModel):
     
     __tablename__ = "conversations"
     
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
-    company_id = Column(String(36), ForeignKey("company_configs.id"), nullable=True, index=True)
-    title = Column(String(255), nullable=True)
-    extra_data = Column(JSON, nullable=True, default=dict)
+    user_id: Mapped[str] = mapped_column(
+        UUIDString,
+        ForeignKey("users.id"),
+        nullable=False,
+        index=True,
+    )
+    company_id: Mapped[Optional[str]] = mapped_column(
+        UUIDString,
+        ForeignKey("company_configs.id"),
+        nullable=True,
+        index=True,
+    )
+    title: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    extra_data: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        _JSONB,
+        nullable=True,
+        server_default=text("'{}'"),
+    )
     
     # Relationships
-    messages = relationship("ChatMessage", back_populates="conversation", cascade="all, delete-orphan")
+    messages: Mapped[List["ChatMessage"]] = relationship(
+        "ChatMessage",
+        back_populates="conversation",
+        cascade="all, delete-orphan",
+    )
 
 
 class ChatMessage(BaseModel):
@@ -44,15 +65,40 @@ class ChatMessage(BaseModel):
     
     __tablename__ = "chat_messages"
     
-    conversation_id = Column(String(36), ForeignKey("conversations.id"), nullable=False, index=True)
-    role = Column(String(20), nullable=False)  # user, assistant, system, tool
-    content = Column(Text, nullable=True)
-    tool_calls = Column(JSON, nullable=True)  # For assistant messages with tool calls
-    tool_call_id = Column(String(100), nullable=True)  # For tool response messages
-    extra_data = Column(JSON, nullable=True, default=dict)
+    conversation_id: Mapped[str] = mapped_column(
+        UUIDString,
+        ForeignKey("conversations.id"),
+        nullable=False,
+    )
+    role: Mapped[str] = mapped_column(String(20), nullable=False)  # user, assistant, system, tool
+    content: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # For assistant messages with tool calls
+    tool_calls: Mapped[Optional[List[Dict[str, Any]]]] = mapped_column(_JSONB, nullable=True)
+    # For tool response messages
+    tool_call_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    extra_data: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        _JSONB,
+        nullable=True,
+        server_default=text("'{}'"),
+    )
     
     # Relationships
-    conversation = relationship("Conversation", back_populates="messages")
+    conversation: Mapped["Conversation"] = relationship(
+        "Conversation",
+        back_populates="messages",
+    )
+
+
+# Newest-first key order matches the history query (latest N messages of a
+# conversation). Rows flushed in one transaction share created_at; their ids
+# are assigned in creation order by save_message and increase monotonically,
+# so id breaks the tie.
+Index(
+    "ix_chat_messages_conv_created",
+    ChatMessage.conversation_id,
+    ChatMessage.created_at.desc(),
+    ChatMessage.id.desc(),
+)
 
 
 class ProcessedDocument(BaseModel):
@@ -69,17 +115,50 @@ class ProcessedDocument(BaseModel):
         status: Processing status (pending, processed, submitted, error)
         submission_key: Manager.io entry key if submitted
         error_message: Error message if processing failed
+        content_hash: BLAKE2b digest of the uploaded file, used to reuse
+            results when the same file is uploaded again
     """
     
     __tablename__ = "processed_documents"
+    __table_args__ = (
+        Index("ix_processed_documents_user_created", "user_id", "created_at"),
+        Index("ix_processed_documents_conv_status", "conversation_id", "status"),
+        Index("ix_processed_documents_user_hash", "user_id", "content_hash"),
+        # Covers submit_documents lookups, which only ever want processed rows
+        Index(
+            "ix_processed_documents_processed",
+            "user_id",
+            "id",
+            postgresql_where=text("status = 'processed'"),
+            sqlite_where=text("status = 'processed'"),
+        ),
+    )
     
-    conversation_id = Column(String(36), ForeignKey("conversations.id"), nullable=True, index=True)
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
-    company_id = Column(String(36), ForeignKey("company_configs.id"), nullable=True, index=True)
-    filename = Column(String(255), nullable=True)
-    document_type = Column(String(50), nullable=True)  # receipt, invoice, expense_claim, etc.
-    extracted_text = Column(Text, nullable=True)
-    extracted_data = Column(JSON, nullable=True)  # Structured data from agent
-    status = Column(String(20), nullable=False, default="pending")  # pending, processed, submitted, error
-    submission_key = Column(String(100), nullable=True)  # Manager.io entry key
-    error_message = Column(Text, nullable=True)
+    conversation_id: Mapped[Optional[str]] = mapped_column(
+        UUIDString,
+        ForeignKey("conversations.id"),
+        nullable=True,
+    )
+    user_id: Mapped[str] = mapped_column(
+        UUIDString,
+        ForeignKey("users.id"),
+        nullable=False,
+    )
+    company_id: Mapped[Optional[str]] = mapped_column(
+        UUIDString,
+        ForeignKey("company_configs.id"),
+        nullable=True,
+        index=True,
+    )
+    filename: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    # receipt, invoice, expense_claim, etc.
+    document_type: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    extracted_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Structured data from agent
+    extracted_data: Mapped[Optional[Dict[str, Any]]] = mapped_column(_JSONB, nullable=True)
+    # pending, processed, submitted, error
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")
+    # Manager.io entry key
+    submission_key: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    error_message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
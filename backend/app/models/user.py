@@ -6,7 +6,7 @@ from typing import TYPE_CHECKING, List
 from sqlalchemy import DateTime, ForeignKey, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.models.base import BaseModel
+from app.models.base import BaseModel, UUIDString
 
 if TYPE_CHECKING:
     from app.models.company import CompanyConfig
@@ -71,7 +71,7 @@ class Session(BaseModel):
     __tablename__ = "sessions"
     
     user_id: Mapped[str] = mapped_column(
-        String(36),
+        UUIDString,
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
         index=True,
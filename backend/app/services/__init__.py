@@ -1,55 +1,126 @@
-"""Business logic services package."""
+"""Business logic services package.
 
-from app.services.agent_tools import (
-    AccountBalance,
-    AccountBalances,
-    DATA_FETCHING_TOOLS,
-    DOCUMENT_PROCESSING_TOOLS,
-    ExtractedData,
-    MatchedAccount,
-    MatchedSupplier,
-    ToolContext,
-    Transaction,
-    categorize_expense,
-    extract_document_data,
-    get_account_balances,
-    get_chart_of_accounts,
-    get_customers,
-    get_data_fetching_tools,
-    get_document_processing_tools,
-    get_recent_transactions,
-    get_suppliers,
-    get_tool_context,
-    identify_supplier,
-    set_tool_context,
-)
-from app.services.auth import AuthenticationError, AuthService, TokenPair
-from app.services.llm import (
-    LLMConfig,
-    LLMConnectionError,
-    LLMError,
-    LLMModelNotFoundError,
-    LLMProvider,
-    LLMProviderError,
-    LLMService,
-    LLMTimeoutError,
-    Message,
-    ModelInfo,
-)
-from app.services.ocr import (
-    OCRConnectionError,
-    OCRError,
-    OCRModelNotFoundError,
-    OCRProcessingError,
-    OCRResult,
-    OCRService,
-)
+Names are re-exported lazily (PEP 562), so importing one service module
+doesn't also import the others; the LLM and OCR stacks are slow to load.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from app.services.agent_tools import (
+        DATA_FETCHING_TOOLS,
+        DOCUMENT_PROCESSING_TOOLS,
+        AccountBalance,
+        AccountBalances,
+        ExtractedData,
+        MatchedAccount,
+        MatchedSupplier,
+        ToolContext,
+        Transaction,
+        categorize_expense,
+        extract_document_data,
+        get_account_balances,
+        get_chart_of_accounts,
+        get_customers,
+        get_data_fetching_tools,
+        get_document_processing_tools,
+        get_recent_transactions,
+        get_suppliers,
+        get_tool_client,
+        get_tool_context,
+        identify_supplier,
+        identify_suppliers_batch,
+        set_tool_context,
+    )
+    from app.services.auth import AuthenticationError, AuthService, TokenPair
+    from app.services.llm import (
+        LLMConfig,
+        LLMConnectionError,
+        LLMError,
+        LLMModelNotFoundError,
+        LLMProvider,
+        LLMProviderError,
+        LLMService,
+        LLMTimeoutError,
+        Message,
+        ModelInfo,
+    )
+    from app.services.ocr import (
+        OCRConnectionError,
+        OCRError,
+        OCRModelNotFoundError,
+        OCRProcessingError,
+        OCRResult,
+        OCRService,
+    )
+
+# Re-exported names, by the module defining them
+_EXPORTS = {
+    "app.services.agent_tools": (
+        # Agent Tools
+        "ToolContext",
+        "set_tool_context",
+        "get_tool_context",
+        "get_tool_client",
+        "get_chart_of_accounts",
+        "get_suppliers",
+        "get_customers",
+        "get_recent_transactions",
+        "get_account_balances",
+        "get_data_fetching_tools",
+        "DATA_FETCHING_TOOLS",
+        "Transaction",
+        "AccountBalance",
+        "AccountBalances",
+        # Document Processing Tools
+        "extract_document_data",
+        "categorize_expense",
+        "identify_supplier",
+        "identify_suppliers_batch",
+        "get_document_processing_tools",
+        "DOCUMENT_PROCESSING_TOOLS",
+        "ExtractedData",
+        "MatchedAccount",
+        "MatchedSupplier",
+    ),
+    "app.services.auth": (
+        "AuthService",
+        "AuthenticationError",
+        "TokenPair",
+    ),
+    "app.services.llm": (
+        "LLMService",
+        "LLMConfig",
+        "LLMProvider",
+        "LLMError",
+        "LLMConnectionError",
+        "LLMModelNotFoundError",
+        "LLMProviderError",
+        "LLMTimeoutError",
+        "Message",
+        "ModelInfo",
+    ),
+    "app.services.ocr": (
+        "OCRService",
+        "OCRResult",
+        "OCRError",
+        "OCRConnectionError",
+        "OCRProcessingError",
+        "OCRModelNotFoundError",
+    ),
+}
+
+_EXPORT_MODULES = {
+    name: module for module, names in _EXPORTS.items() for name in names
+}
 
 __all__ = [
     # Agent Tools
     "ToolContext",
     "set_tool_context",
     "get_tool_context",
+    "get_tool_client",
     "get_chart_of_accounts",
     "get_suppliers",
     "get_customers",
@@ -64,6 +135,7 @@ __all__ = [
     "extract_document_data",
     "categorize_expense",
     "identify_supplier",
+    "identify_suppliers_batch",
     "get_document_processing_tools",
     "DOCUMENT_PROCESSING_TOOLS",
     "ExtractedData",
@@ -92,3 +164,13 @@ __all__ = [
     "OCRProcessingError",
     "OCRModelNotFoundError",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import a re-exported name from its module on first access."""
+    module = _EXPORT_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
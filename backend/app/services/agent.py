@@ -10,26 +10,36 @@ The agent uses LangChain for tool binding and orchestration, with
 LiteLLM for flexible model routing to local or cloud LLM providers.
 """
 
+import asyncio
+import copy
+import hashlib
 import logging
 import re
+import threading
+from contextlib import aclosing
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Literal, Optional, Tuple
+from typing import Any, Dict, List, Literal, Optional, Set, Tuple, Type
 
+import ijson
+import orjson
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables import RunnableConfig
 from pydantic import BaseModel, Field
 from redis.asyncio import Redis
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, Uuid, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
+from app.models.base import generate_uuid
 from app.models.conversation import ChatMessage, Conversation, ProcessedDocument
 from app.services.agent_tools import (
     ToolContext,
     get_all_tools,
     set_tool_context,
 )
-from app.services.llm import LLMService
+from app.services.llm import LLMService, Message
 from app.services.manager_io import (
     ExpenseClaimData,
     ExpenseClaimLine,
@@ -38,6 +48,11 @@ from app.services.manager_io import (
 )
 from app.services.ocr import OCRService
 
+try:
+    import hyperscan
+except ImportError:  # Optional accelerator; classification falls back to re
+    hyperscan = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
 
@@ -77,6 +92,244 @@ DOCUMENT_TYPE_PATTERNS = {
 }
 
 
+# Classification and extraction results cached by OCR text digest
+DOCUMENT_CACHE_TTL = 86400  # 24 hours
+
+# Attachments analyzed (OCR + LLM extraction) at once per service instance
+DOCUMENT_CONCURRENCY = 4
+
+# Documents submitted to Manager.io at once in individual mode
+SUBMIT_CONCURRENCY = 8
+
+# Texts at least this long are classified in a worker thread so the pattern
+# scan doesn't hold up the event loop; shorter ones aren't worth the hop
+CLASSIFY_THREAD_MIN_CHARS = 4096
+
+# Leading bytes of the attachment formats we recognise
+_FILE_SIGNATURES: Dict[bytes, str] = {
+    b"%PDF": "pdf",
+    b"\xff\xd8\xff": "jpeg",
+    b"\x89PNG": "png",
+}
+
+# History sent to the LLM: above the token budget, everything between the
+# first HISTORY_KEEP_FIRST and last HISTORY_KEEP_LAST messages is summarized
+HISTORY_TOKEN_BUDGET = 8000
+HISTORY_KEEP_FIRST = 1  # System prompt
+HISTORY_KEEP_LAST = 6
+
+HISTORY_SUMMARY_PROMPT = """Summarize the following bookkeeping conversation between a user and an assistant.
+Keep every fact needed to continue it: documents discussed, vendors, amounts, dates, accounts, decisions and anything still pending.
+Be concise and write plain sentences."""
+
+
+# Compiled once per document type: a single case-insensitive alternation used
+# to skip types with no match in one scan, plus each pattern compiled on its
+# own to find exactly which ones match (alternation alone would miss
+# overlapping patterns such as "invoice" and "invoice number")
+_COMPILED_PATTERNS: Dict[
+    str, Tuple[re.Pattern[str], Tuple[Tuple[str, re.Pattern[str]], ...]]
+] = {
+    doc_type: (
+        re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE),
+        tuple((p, re.compile(p, re.IGNORECASE)) for p in patterns),
+    )
+    for doc_type, patterns in DOCUMENT_TYPE_PATTERNS.items()
+}
+
+# (doc_type, pattern) for each Hyperscan expression id, in declaration order
+_PATTERN_IDS: Tuple[Tuple[str, str], ...] = tuple(
+    (doc_type, pattern)
+    for doc_type, patterns in DOCUMENT_TYPE_PATTERNS.items()
+    for pattern in patterns
+)
+
+
+def _compile_hyperscan_database() -> Optional["hyperscan.Database"]:
+    """Compile every classification pattern into one Hyperscan database.
+    
+    Patterns are compiled caseless and Unicode-aware so ``\\s`` and case
+    folding behave like the ``re`` fallback.
+    
+    Returns:
+        Block-mode database, or None if hyperscan is unavailable
+    """
+    if hyperscan is None:
+        return None
+    
+    flags = (
+        hyperscan.HS_FLAG_CASELESS
+        | hyperscan.HS_FLAG_UTF8
+        | hyperscan.HS_FLAG_UCP
+        | hyperscan.HS_FLAG_SINGLEMATCH
+    )
+    database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    try:
+        database.compile(
+            expressions=[pattern.encode() for _, pattern in _PATTERN_IDS],
+            ids=list(range(len(_PATTERN_IDS))),
+            elements=len(_PATTERN_IDS),
+            flags=[flags] * len(_PATTERN_IDS),
+        )
+    except hyperscan.error as e:
+        logger.warning(f"Hyperscan compile failed, using re for classification: {e}")
+        return None
+    return database
+
+
+_HS_DATABASE = _compile_hyperscan_database()
+# Hyperscan scratch space is not thread-safe; keep one per thread
+_hs_local = threading.local()
+
+
+def _on_pattern_match(pattern_id: int, start: int, end: int, flags: int, hits: Any) -> None:
+    """Hyperscan match callback recording which expression matched in ``hits``."""
+    hits.add(pattern_id)
+
+
+def _match_document_patterns(text: str) -> Dict[str, List[str]]:
+    """Find which classification patterns occur in the text.
+    
+    Uses a single Hyperscan pass over all document types when available,
+    otherwise the precompiled ``re`` patterns.
+    
+    Args:
+        text: Extracted text from the document
+        
+    Returns:
+        Matched patterns per document type, in DOCUMENT_TYPE_PATTERNS order;
+        types without matches are omitted
+    """
+    matches: Dict[str, List[str]] = {}
+    
+    if _HS_DATABASE is not None:
+        scratch = getattr(_hs_local, "scratch", None)
+        if scratch is None:
+            scratch = _hs_local.scratch = hyperscan.Scratch(_HS_DATABASE)
+        hits: Set[int] = set()
+        _HS_DATABASE.scan(
+            text.encode("utf-8", "replace"),
+            match_event_handler=_on_pattern_match,
+            context=hits,
+            scratch=scratch,
+        )
+        for pattern_id in sorted(hits):
+            doc_type, pattern = _PATTERN_IDS[pattern_id]
+            matches.setdefault(doc_type, []).append(pattern)
+        return matches
+    
+    for doc_type, (combined, patterns) in _COMPILED_PATTERNS.items():
+        if combined.search(text) is None:
+            continue
+        matches[doc_type] = [pattern for pattern, regex in patterns if regex.search(text)]
+    return matches
+
+
+# Document context messages: full extracted data for the latest ones, a
+# one-line summary per document for older ones
+DOC_CONTEXT_HEADER = "I've processed the following documents:"
+DOC_CONTEXT_KEEP_LAST = 2
+_DOC_BLOCK_RE = re.compile(
+    r"^(?P<type>\w+): (?P<filename>.*) \(id (?P<id>[^)]*)\)\nExtracted data: (?P<data>.*)$",
+    re.MULTILINE,
+)
+_VENDOR_RE = re.compile(r"""['"]vendor_name['"]:\s*['"]([^'"]*)['"]""")
+_TOTAL_RE = re.compile(r"""['"]total_amount['"]:\s*([-\d.]+)""")
+
+# Phrases in a reply that mean the user should confirm a submission
+_CONFIRMATION_RE = re.compile(
+    r"submit|create entry|post to manager|confirm", re.IGNORECASE
+)
+
+
+def _expense_claim_line(doc: ProcessedDocument) -> ExpenseClaimLine:
+    """Build the expense claim line for a processed document."""
+    data = doc.extracted_data or {}
+    return ExpenseClaimLine(
+        account=data.get("account_key", ""),
+        line_description=data.get("description", doc.filename or "Expense"),
+        qty=1,
+        purchase_unit_price=float(data.get("total_amount", 0)),
+    )
+
+
+def _format_document_context(documents: List[Dict[str, Any]]) -> str:
+    """Build the system message describing newly processed documents."""
+    parts = [DOC_CONTEXT_HEADER, ""]
+    for doc in documents:
+        parts.append(f"{doc['type'].upper()}: {doc['filename']} (id {doc['id']})")
+        parts.append(f"Extracted data: {doc['data']}")
+        parts.append("")
+    return "\n".join(parts)
+
+
+def _compress_old_doc_messages(
+    messages: List[Message],
+    keep_last: int = DOC_CONTEXT_KEEP_LAST,
+) -> List[Message]:
+    """Shorten document context messages other than the most recent ones.
+    
+    Older document messages are rewritten to one line per document, e.g.
+    ``[doc <id>] receipt vendor=ACME total=12.5``. Only the returned copy is
+    changed; stored history is untouched.
+    
+    Args:
+        messages: LLM messages in conversation order
+        keep_last: Number of most recent document messages kept verbatim
+        
+    Returns:
+        New message list
+    """
+    doc_indexes = [
+        i for i, m in enumerate(messages)
+        if m.role == "system" and m.content.startswith(DOC_CONTEXT_HEADER)
+    ]
+    if len(doc_indexes) <= keep_last:
+        return messages
+    
+    compressed = list(messages)
+    for i in doc_indexes[:len(doc_indexes) - keep_last]:
+        lines = [DOC_CONTEXT_HEADER]
+        for block in _DOC_BLOCK_RE.finditer(messages[i].content):
+            data = block["data"]
+            vendor = _VENDOR_RE.search(data)
+            total = _TOTAL_RE.search(data)
+            lines.append(
+                f"[doc {block['id']}] {block['type'].lower()}"
+                f" vendor={vendor[1] if vendor else '?'}"
+                f" total={total[1] if total else '?'}"
+            )
+        compressed[i] = Message(role="system", content="\n".join(lines))
+    return compressed
+
+
+def _detect_file_kind(data: bytes) -> str:
+    """Identify an attachment by its magic bytes ("pdf", "jpeg", ... or "unknown")."""
+    return next(
+        (kind for magic, kind in _FILE_SIGNATURES.items() if data.startswith(magic)),
+        "unknown",
+    )
+
+
+def _content_hash(data: bytes) -> str:
+    """Digest identifying an uploaded file's bytes."""
+    return hashlib.blake2b(data, digest_size=32).hexdigest()
+
+
+def _copy_analysis(source: ProcessedDocument, doc: ProcessedDocument) -> None:
+    """Give ``doc`` the OCR/extraction results of an identical upload."""
+    doc.document_type = source.document_type
+    doc.extracted_text = source.extracted_text
+    doc.extracted_data = copy.deepcopy(source.extracted_data)
+    doc.error_message = source.error_message
+    doc.status = "error" if source.status == "error" else "processed"
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
 SYSTEM_PROMPT = """You are an AI bookkeeping assistant for Manager.io accounting software.
 
 Your role is to help users:
@@ -192,6 +445,9 @@ class AgentService:
         # Get all tools for agent binding
         self._tools = get_all_tools()
         
+        # Bounds concurrent OCR/LLM work across attachments
+        self._attach_sem = asyncio.Semaphore(DOCUMENT_CONCURRENCY)
+        
         # Build tool name to function mapping for execution
         self._tool_map = {tool.name: tool for tool in self._tools}
     
@@ -212,37 +468,180 @@ class AgentService:
         Returns:
             DocumentClassification with type and confidence
         """
-        text_lower = text.lower()
-        scores: Dict[str, Tuple[float, List[str]]] = {}
-        
-        for doc_type, patterns in DOCUMENT_TYPE_PATTERNS.items():
-            matched = []
-            for pattern in patterns:
-                if re.search(pattern, text_lower):
-                    matched.append(pattern)
-            
-            if matched:
-                # Score based on number of matched patterns
-                score = len(matched) / len(patterns)
-                scores[doc_type] = (score, matched)
-        
-        if not scores:
-            return DocumentClassification(
-                document_type="unknown",
-                confidence=0.0,
-                matched_patterns=[],
-            )
+        best_type = "unknown"
+        best_score = 0.0
+        best_matched: List[str] = []
         
-        # Get highest scoring type
-        best_type = max(scores.keys(), key=lambda k: scores[k][0])
-        best_score, matched_patterns = scores[best_type]
+        for doc_type, matched in _match_document_patterns(text).items():
+            # Score based on number of matched patterns; the first type
+            # reaching the highest score wins
+            score = len(matched) / len(DOCUMENT_TYPE_PATTERNS[doc_type])
+            if score > best_score:
+                best_type, best_score, best_matched = doc_type, score, matched
         
         return DocumentClassification(
             document_type=best_type,
             confidence=min(best_score, 1.0),
-            matched_patterns=matched_patterns,
+            matched_patterns=best_matched,
         )
     
+    async def _cache_get(self, cache_key: str) -> Optional[Any]:
+        """Get a JSON value from Redis, treating any failure as a miss."""
+        if self.redis is None:
+            return None
+        
+        try:
+            cached = await self.redis.get(cache_key)
+            if cached:
+                return orjson.loads(cached)
+        except Exception as e:
+            logger.warning(f"Cache get failed for {cache_key}: {e}")
+        
+        return None
+    
+    async def _cache_set(self, cache_key: str, data: Any) -> None:
+        """Store a JSON value in Redis for DOCUMENT_CACHE_TTL seconds."""
+        if self.redis is None:
+            return
+        
+        try:
+            await self.redis.setex(cache_key, DOCUMENT_CACHE_TTL, orjson.dumps(data))
+        except Exception as e:
+            logger.warning(f"Cache set failed for {cache_key}: {e}")
+    
+    async def _classify_cached(self, text: str, text_hash: str) -> DocumentClassification:
+        """Classify document text, reusing a cached result for identical text.
+        
+        Args:
+            text: Extracted text from the document
+            text_hash: Digest of the text (see process_document)
+            
+        Returns:
+            DocumentClassification with type and confidence
+        """
+        cache_key = f"agent:cls:{text_hash}"
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            return DocumentClassification.model_validate(cached)
+        
+        if len(text) >= CLASSIFY_THREAD_MIN_CHARS:
+            classification = await asyncio.to_thread(self.classify_document, text)
+        else:
+            classification = self.classify_document(text)
+        await self._cache_set(cache_key, classification.model_dump())
+        return classification
+    
+    async def _extract_cached(
+        self,
+        text: str,
+        text_hash: str,
+        document_type: str,
+        company_id: str,
+        user_id: str,
+    ) -> Dict[str, Any]:
+        """Extract structured data, skipping the LLM call for identical text.
+        
+        Results are keyed by document type, the configured model and the text
+        digest. Failed extractions are not cached.
+        
+        Args:
+            text: OCR extracted text
+            text_hash: Digest of the text
+            document_type: Classified document type
+            company_id: Company ID for context
+            user_id: User ID
+            
+        Returns:
+            Dictionary of extracted structured data
+        """
+        model = self.llm_service.config.default_model
+        cache_key = f"agent:ext:{document_type}:{model}:{text_hash}"
+        cached: Optional[Dict[str, Any]] = await self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        extracted = await self._extract_structured_data(
+            text,
+            document_type,
+            company_id,
+            user_id,
+        )
+        if "error" not in extracted and "raw_response" not in extracted:
+            await self._cache_set(cache_key, extracted)
+        return extracted
+    
+    async def _maybe_compress_history(
+        self,
+        messages: List[Message],
+        budget: int = HISTORY_TOKEN_BUDGET,
+    ) -> List[Message]:
+        """Fit the LLM message list into a token budget.
+        
+        When the estimated size exceeds ``budget``, the messages between the
+        first HISTORY_KEEP_FIRST and the last HISTORY_KEEP_LAST are replaced
+        with a single summary message. If no summary can be produced, that
+        span is dropped instead.
+        
+        Args:
+            messages: System prompt followed by conversation history
+            budget: Token budget for the whole list
+            
+        Returns:
+            The original list, or a compressed copy
+        """
+        if len(messages) <= HISTORY_KEEP_FIRST + HISTORY_KEEP_LAST:
+            return messages
+        # Stop counting as soon as the budget is exceeded
+        total = 0
+        for m in messages:
+            total += _estimate_tokens(m.content)
+            if total > budget:
+                break
+        else:
+            return messages
+        
+        head = messages[:HISTORY_KEEP_FIRST]
+        span = messages[HISTORY_KEEP_FIRST:-HISTORY_KEEP_LAST]
+        tail = messages[-HISTORY_KEEP_LAST:]
+        
+        summary = await self._summarize_messages(span)
+        if summary is None:
+            return head + tail
+        return head + [
+            Message(role="system", content=f"Summary of the earlier conversation:\n{summary}")
+        ] + tail
+    
+    async def _summarize_messages(self, messages: List[Message]) -> Optional[str]:
+        """Summarize a span of conversation, reusing a cached summary.
+        
+        Args:
+            messages: Messages to summarize
+            
+        Returns:
+            Summary text, or None if the LLM call failed
+        """
+        transcript = "\n".join(f"{m.role}: {m.content}" for m in messages)
+        span_hash = hashlib.blake2b(
+            transcript.encode("utf-8", "surrogatepass"),
+            digest_size=16,
+        ).hexdigest()
+        cache_key = f"agent:sum:{span_hash}"
+        cached: Optional[str] = await self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            summary = await self.llm_service.chat([
+                Message(role="system", content=HISTORY_SUMMARY_PROMPT),
+                Message(role="user", content=transcript),
+            ])
+        except Exception as e:
+            logger.warning(f"History summarization failed, dropping older messages: {e}")
+            return None
+        
+        await self._cache_set(cache_key, summary)
+        return summary
+    
     async def get_or_create_conversation(
         self,
         user_id: str,
@@ -278,7 +677,6 @@ class AgentService:
         )
         self.db.add(conversation)
         await self.db.flush()
-        await self.db.refresh(conversation)
         
         return conversation
     
@@ -296,14 +694,58 @@ class AgentService:
         Returns:
             List of ChatMessage instances
         """
+        message = self._latest_messages(conversation_id, limit)
+        result = await self.db.execute(
+            select(message).order_by(message.created_at, message.id)
+        )
+        return list(result.scalars().all())
+    
+    async def get_conversation_with_history(
+        self,
+        user_id: str,
+        conversation_id: str,
+        limit: int = 50,
+    ) -> Tuple[Optional[Conversation], List[ChatMessage]]:
+        """Load a user's conversation and its recent history in one query.
+        
+        Args:
+            user_id: User ID the conversation must belong to
+            conversation_id: Conversation ID
+            limit: Maximum messages to return
+            
+        Returns:
+            Tuple of (conversation, messages oldest first); (None, []) if the
+            conversation doesn't exist or belongs to another user
+        """
+        message = self._latest_messages(conversation_id, limit)
         result = await self.db.execute(
+            select(Conversation, message)
+            .outerjoin(message, message.conversation_id == Conversation.id)
+            .where(
+                Conversation.id == conversation_id,
+                Conversation.user_id == user_id,
+            )
+            .order_by(message.created_at, message.id)
+        )
+        rows = result.all()
+        if not rows:
+            return None, []
+        return rows[0][0], [row[1] for row in rows if row[1] is not None]
+    
+    def _latest_messages(self, conversation_id: str, limit: int) -> Type[ChatMessage]:
+        """Entity over a conversation's newest ``limit`` messages.
+        
+        The subquery walks the (conversation_id, created_at DESC, id DESC)
+        index; callers order the outer query chronologically.
+        """
+        latest = (
             select(ChatMessage)
             .where(ChatMessage.conversation_id == conversation_id)
-            .order_by(ChatMessage.created_at.desc())
+            .order_by(ChatMessage.created_at.desc(), ChatMessage.id.desc())
             .limit(limit)
+            .subquery()
         )
-        messages = result.scalars().all()
-        return list(reversed(messages))
+        return aliased(ChatMessage, latest)
     
     async def save_message(
         self,
@@ -313,9 +755,13 @@ class AgentService:
         tool_calls: Optional[List[Dict]] = None,
         tool_call_id: Optional[str] = None,
         metadata: Optional[Dict] = None,
+        flush: bool = False,
     ) -> ChatMessage:
         """Save a message to conversation history.
         
+        The message is only added to the session unless ``flush`` is set;
+        callers batching several writes flush once at the end.
+        
         Args:
             conversation_id: Conversation ID
             role: Message role (user, assistant, system, tool)
@@ -323,11 +769,15 @@ class AgentService:
             tool_calls: Tool calls for assistant messages
             tool_call_id: Tool call ID for tool response messages
             metadata: Additional metadata
+            flush: Flush now so server defaults (created_at) are loaded
             
         Returns:
             Created ChatMessage instance
         """
+        # Assigned now rather than at flush: ids increase in call order, so
+        # they keep the order of messages flushed with the same created_at
         message = ChatMessage(
+            id=generate_uuid(),
             conversation_id=conversation_id,
             role=role,
             content=content,
@@ -336,8 +786,8 @@ class AgentService:
             metadata=metadata or {},
         )
         self.db.add(message)
-        await self.db.flush()
-        await self.db.refresh(message)
+        if flush:
+            await self.db.flush()
         return message
     
     async def process_document(
@@ -363,59 +813,184 @@ class AgentService:
         logger.info(f"Processing document for user {user_id}, company {company_id}")
         
         # Create document record
+        content_hash = _content_hash(image_data)
         doc = ProcessedDocument(
             user_id=user_id,
             company_id=company_id,
             conversation_id=conversation_id,
             filename=filename,
             status="pending",
+            content_hash=content_hash,
         )
+        
+        # The same file uploaded before reuses its results
+        known = await self._find_analyzed_documents(user_id, [content_hash])
         self.db.add(doc)
+        if content_hash in known:
+            _copy_analysis(known[content_hash], doc)
+        else:
+            await self._analyze_document(doc, image_data, company_id, user_id)
+        
+        # Insert the record with its results in one round trip
         await self.db.flush()
+        if doc.status == "processed":
+            logger.info(f"Document processed successfully: {doc.id}, type: {doc.document_type}")
+        return doc
+    
+    async def _process_documents(
+        self,
+        user_id: str,
+        company_id: str,
+        attachments: List[bytes],
+        conversation_id: Optional[str] = None,
+    ) -> List[ProcessedDocument]:
+        """Process several attachments concurrently.
         
-        try:
-            # Extract text via OCR
-            is_pdf = image_data[:4] == b'%PDF'
-            if is_pdf:
-                ocr_result = await self.ocr_service.extract_from_pdf(image_data)
-            else:
-                ocr_result = await self.ocr_service.extract_text(image_data)
+        Records get client-side ids and are added to the session, then OCR
+        and extraction run for all attachments at once (bounded by
+        DOCUMENT_CONCURRENCY). Nothing is flushed here; the records are
+        written with the caller's next flush. The session itself is never
+        used concurrently.
+        
+        Args:
+            user_id: User ID
+            company_id: Company ID for context
+            attachments: Raw image/PDF bytes per attachment
+            conversation_id: Optional conversation to associate with
             
-            if not ocr_result.success:
-                doc.status = "error"
-                doc.error_message = ocr_result.error
-                await self.db.flush()
-                return doc
-            
-            doc.extracted_text = ocr_result.text
-            
-            # Classify document type
-            classification = self.classify_document(ocr_result.text)
-            doc.document_type = classification.document_type
-            
-            # Use LLM to extract structured data
-            extracted_data = await self._extract_structured_data(
-                ocr_result.text,
-                classification.document_type,
-                company_id,
-                user_id,
+        Returns:
+            ProcessedDocument per attachment, in input order
+        """
+        logger.info(
+            f"Processing {len(attachments)} documents for user {user_id}, company {company_id}"
+        )
+        
+        hashes = [_content_hash(image_data) for image_data in attachments]
+        docs = [
+            ProcessedDocument(
+                id=generate_uuid(),
+                user_id=user_id,
+                company_id=company_id,
+                conversation_id=conversation_id,
+                filename=f"attachment_{i+1}",
+                status="pending",
+                content_hash=content_hash,
             )
+            for i, content_hash in enumerate(hashes)
+        ]
+        known = await self._find_analyzed_documents(user_id, hashes)
+        self.db.add_all(docs)
+        
+        # Each distinct file not seen before is analyzed once; repeats
+        # (earlier uploads or within this batch) copy its results
+        first_by_hash: Dict[str, ProcessedDocument] = {}
+        to_analyze = []
+        for doc, content_hash, image_data in zip(docs, hashes, attachments):
+            if content_hash in known:
+                _copy_analysis(known[content_hash], doc)
+            elif content_hash not in first_by_hash:
+                first_by_hash[content_hash] = doc
+                to_analyze.append((doc, image_data))
+        
+        await asyncio.gather(*(
+            self._analyze_document(doc, image_data, company_id, user_id)
+            for doc, image_data in to_analyze
+        ))
+        for doc, content_hash in zip(docs, hashes):
+            first = first_by_hash.get(content_hash)
+            if first is not None and first is not doc:
+                _copy_analysis(first, doc)
+        return docs
+    
+    async def _find_analyzed_documents(
+        self,
+        user_id: str,
+        content_hashes: List[str],
+    ) -> Dict[str, ProcessedDocument]:
+        """Find the user's earlier successfully analyzed uploads by file hash.
+        
+        Args:
+            user_id: User ID
+            content_hashes: Digests of the new uploads
             
-            doc.extracted_data = extracted_data
-            doc.status = "processed"
-            
-            await self.db.flush()
-            await self.db.refresh(doc)
-            
-            logger.info(f"Document processed successfully: {doc.id}, type: {doc.document_type}")
-            return doc
-            
-        except Exception as e:
-            logger.error(f"Error processing document: {e}")
-            doc.status = "error"
-            doc.error_message = str(e)
-            await self.db.flush()
-            return doc
+        Returns:
+            Most recent processed or submitted document per matching hash
+        """
+        result = await self.db.execute(
+            select(ProcessedDocument)
+            .where(
+                ProcessedDocument.user_id == user_id,
+                ProcessedDocument.content_hash.in_(set(content_hashes)),
+                ProcessedDocument.status.in_(("processed", "submitted")),
+            )
+            .order_by(ProcessedDocument.created_at)
+        )
+        # Later rows overwrite earlier ones, leaving the newest per hash
+        return {
+            doc.content_hash: doc
+            for doc in result.scalars()
+            if doc.content_hash is not None
+        }
+    
+    async def _analyze_document(
+        self,
+        doc: ProcessedDocument,
+        image_data: bytes,
+        company_id: str,
+        user_id: str,
+    ) -> None:
+        """Run OCR, classification and extraction, storing results on ``doc``.
+        
+        Does no database I/O, so several documents can be analyzed at once.
+        Failures are recorded on the document rather than raised.
+        
+        Args:
+            doc: Pending document record to fill in
+            image_data: Raw image/PDF bytes
+            company_id: Company ID for context
+            user_id: User ID
+        """
+        async with self._attach_sem:
+            try:
+                # Extract text via OCR
+                if _detect_file_kind(image_data) == "pdf":
+                    ocr_result = await self.ocr_service.extract_from_pdf(image_data)
+                else:
+                    ocr_result = await self.ocr_service.extract_text(image_data)
+                
+                if not ocr_result.success:
+                    doc.status = "error"
+                    doc.error_message = ocr_result.error
+                    return
+                
+                doc.extracted_text = ocr_result.text
+                
+                # Identical OCR text reuses cached classification/extraction
+                text_hash = hashlib.blake2b(
+                    ocr_result.text.encode("utf-8", "surrogatepass"),
+                    digest_size=16,
+                ).hexdigest()
+                
+                # Classify document type
+                classification = await self._classify_cached(ocr_result.text, text_hash)
+                doc.document_type = classification.document_type
+                
+                # Use LLM to extract structured data
+                extracted_data = await self._extract_cached(
+                    ocr_result.text,
+                    text_hash,
+                    classification.document_type,
+                    company_id,
+                    user_id,
+                )
+                
+                doc.extracted_data = extracted_data
+                doc.status = "processed"
+                
+            except Exception as e:
+                logger.error(f"Error processing document: {e}")
+                doc.status = "error"
+                doc.error_message = str(e)
     
     async def _extract_structured_data(
         self,
@@ -452,22 +1027,38 @@ Extract and return a JSON object with these fields (use null for missing values)
 Return ONLY the JSON object, no other text."""
 
         try:
-            from app.services.llm import Message
-            response = await self.llm_service.chat([
+            stream = self.llm_service.chat_stream([
                 Message(role="system", content="You are a data extraction assistant. Extract structured data from documents and return valid JSON only."),
                 Message(role="user", content=extraction_prompt),
             ])
             
-            # Parse JSON from response
-            import json
-            # Try to extract JSON from the response
-            content = response
-            # Find JSON in response
-            json_match = re.search(r'\{[\s\S]*\}', content)
-            if json_match:
-                return json.loads(json_match.group())
+            # Feed the response into an incremental parser from the first "{"
+            # and stop reading the stream as soon as that object closes.
+            # Text is only kept for the raw_response fallback.
+            chunks: List[str] = []
+            objects = ijson.sendable_list()
+            parser = ijson.items_coro(objects, "", use_float=True)
+            started = False
+            async with aclosing(stream):
+                async for chunk in stream:
+                    chunks.append(chunk)
+                    if not started:
+                        brace = chunk.find("{")
+                        if brace == -1:
+                            continue
+                        chunk = chunk[brace:]
+                        started = True
+                    try:
+                        parser.send(chunk.encode("utf-8"))
+                    except ijson.JSONError:
+                        # Trailing text after the object closed (e.g. ```)
+                        if not objects:
+                            raise
+                    if objects:
+                        extracted: Dict[str, Any] = objects[0]
+                        return extracted
             
-            return {"raw_response": content}
+            return {"raw_response": "".join(chunks)}
             
         except Exception as e:
             logger.error(f"Error extracting structured data: {e}")
@@ -495,15 +1086,23 @@ Return ONLY the JSON object, no other text."""
         """
         logger.info(f"Processing message for user {user_id}, company {company_id}")
         
-        # Get or create conversation
-        conversation = await self.get_or_create_conversation(
-            user_id=user_id,
-            company_id=company_id,
-            conversation_id=conversation_id,
-        )
+        # Existing conversation and its earlier history in one round trip,
+        # read before this turn's rows are added so the whole turn is
+        # written with a single flush at the end
+        conversation: Optional[Conversation] = None
+        history: List[ChatMessage] = []
+        if conversation_id:
+            conversation, history = await self.get_conversation_with_history(
+                user_id, conversation_id
+            )
+        if conversation is None:
+            conversation = await self.get_or_create_conversation(
+                user_id=user_id,
+                company_id=company_id,
+            )
         
         # Save user message
-        await self.save_message(
+        user_message = await self.save_message(
             conversation_id=conversation.id,
             role="user",
             content=message,
@@ -512,41 +1111,38 @@ Return ONLY the JSON object, no other text."""
         # Process any attachments
         processed_docs = []
         if attachments:
-            for i, attachment in enumerate(attachments):
-                doc = await self.process_document(
-                    user_id=user_id,
-                    company_id=company_id,
-                    image_data=attachment,
-                    filename=f"attachment_{i+1}",
-                    conversation_id=conversation.id,
-                )
-                if doc.status == "processed":
-                    processed_docs.append({
-                        "id": doc.id,
-                        "type": doc.document_type,
-                        "data": doc.extracted_data,
-                        "filename": doc.filename,
-                    })
-        
-        # Get conversation history
-        history = await self.get_conversation_history(conversation.id)
+            docs = await self._process_documents(
+                user_id=user_id,
+                company_id=company_id,
+                attachments=attachments,
+                conversation_id=conversation.id,
+            )
+            processed_docs = [
+                {
+                    "id": doc.id,
+                    "type": doc.document_type,
+                    "data": doc.extracted_data,
+                    "filename": doc.filename,
+                }
+                for doc in docs
+                if doc.status == "processed"
+            ]
         
         # Build messages for LLM
-        from app.services.llm import Message
         llm_messages = [
             Message(role="system", content=SYSTEM_PROMPT.format(company_name=company_id)),
         ]
         
-        for msg in history[-10:]:  # Last 10 messages for context
+        for msg in [*history, user_message]:
             llm_messages.append(Message(role=msg.role, content=msg.content or ""))
+        llm_messages = _compress_old_doc_messages(llm_messages)
+        llm_messages = await self._maybe_compress_history(llm_messages)
         
-        # Add document context if any
+        # Add document context for this call only; it is not saved
         if processed_docs:
-            doc_context = "I've processed the following documents:\n"
-            for doc in processed_docs:
-                doc_context += f"\n{doc['type'].upper()}: {doc['filename']}\n"
-                doc_context += f"Extracted data: {doc['data']}\n"
-            llm_messages.append(Message(role="system", content=doc_context))
+            llm_messages.append(
+                Message(role="system", content=_format_document_context(processed_docs))
+            )
         
         # Generate response
         try:
@@ -558,12 +1154,10 @@ Return ONLY the JSON object, no other text."""
                 role="assistant",
                 content=response_text,
             )
+            await self.db.flush()
             
             # Check if response requires confirmation for submission
-            requires_confirmation = any(
-                phrase in response_text.lower()
-                for phrase in ["submit", "create entry", "post to manager", "confirm"]
-            )
+            requires_confirmation = _CONFIRMATION_RE.search(response_text) is not None
             
             return AgentResponse(
                 message=response_text,
@@ -580,6 +1174,7 @@ Return ONLY the JSON object, no other text."""
                 role="assistant",
                 content=error_message,
             )
+            await self.db.flush()
             
             return AgentResponse(
                 message=error_message,
@@ -641,7 +1236,7 @@ Return ONLY the JSON object, no other text."""
         # Fetch documents
         result = await self.db.execute(
             select(ProcessedDocument).where(
-                ProcessedDocument.id.in_(document_ids),
+                self._document_id_filter(document_ids),
                 ProcessedDocument.user_id == user_id,
                 ProcessedDocument.status == "processed",
             )
@@ -667,6 +1262,25 @@ Return ONLY the JSON object, no other text."""
         
         return results
     
+    def _document_id_filter(self, document_ids: List[str]) -> ColumnElement[bool]:
+        """Build the ``ProcessedDocument.id`` filter for a list of IDs.
+        
+        On PostgreSQL the IDs are sent as a single ``uuid[]`` parameter and
+        matched with ``= ANY(:ids)``, so the statement text (and its cached
+        plan) is the same regardless of how many documents are submitted.
+        Other dialects fall back to an expanding ``IN`` list.
+        
+        Args:
+            document_ids: ProcessedDocument IDs to match
+            
+        Returns:
+            SQL boolean expression for the WHERE clause
+        """
+        if self.db.get_bind().dialect.name == "postgresql":
+            ids = bindparam("document_ids", document_ids, type_=ARRAY(Uuid(as_uuid=False)))
+            return ProcessedDocument.id == any_(ids)
+        return ProcessedDocument.id.in_(document_ids)
+    
     async def _submit_combined(
         self,
         documents: List[ProcessedDocument],
@@ -686,16 +1300,7 @@ Return ONLY the JSON object, no other text."""
             List with single submission result
         """
         # Build combined line items
-        lines = []
-        for doc in documents:
-            data = doc.extracted_data or {}
-            line = ExpenseClaimLine(
-                account=data.get("account_key", ""),
-                line_description=data.get("description", doc.filename or "Expense"),
-                qty=1,
-                purchase_unit_price=float(data.get("total_amount", 0)),
-            )
-            lines.append(line)
+        lines = [_expense_claim_line(doc) for doc in documents]
         
         # Get date from first document or use today
         first_data = documents[0].extracted_data or {}
@@ -748,8 +1353,8 @@ Return ONLY the JSON object, no other text."""
     ) -> List[Dict[str, Any]]:
         """Submit each document as a separate entry.
         
-        Handles partial failures - continues processing remaining documents
-        even if some fail.
+        Up to SUBMIT_CONCURRENCY documents are submitted at once. Handles
+        partial failures - a failing document doesn't stop the others.
         
         Args:
             documents: List of ProcessedDocument instances
@@ -757,96 +1362,107 @@ Return ONLY the JSON object, no other text."""
             user_id: User ID for PaidBy field
             
         Returns:
-            List of submission results, one per document
+            List of submission results, one per document, in input order
         """
-        results: List[Dict[str, Any]] = []
+        semaphore = asyncio.Semaphore(SUBMIT_CONCURRENCY)
         
-        for doc in documents:
-            try:
-                data = doc.extracted_data or {}
-                doc_type = doc.document_type or "expense_claim"
+        async def submit(doc: ProcessedDocument) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._submit_one(doc, client, user_id)
+        
+        return list(await asyncio.gather(*(submit(doc) for doc in documents)))
+    
+    async def _submit_one(
+        self,
+        doc: ProcessedDocument,
+        client: Any,
+        user_id: str,
+    ) -> Dict[str, Any]:
+        """Submit a single document and record the outcome on it.
+        
+        Args:
+            doc: ProcessedDocument to submit
+            client: ManagerIOClient instance
+            user_id: User ID for PaidBy field
+            
+        Returns:
+            Submission result for the document
+        """
+        try:
+            data = doc.extracted_data or {}
+            doc_type = doc.document_type or "expense_claim"
+            
+            if doc_type in ("receipt", "expense_claim", "expense"):
+                # Create expense claim
+                expense_data = ExpenseClaimData(
+                    date=data.get("date", datetime.now(timezone.utc).strftime("%Y-%m-%d")),
+                    paid_by=user_id,
+                    payee=data.get("vendor_name", "Unknown"),
+                    description=data.get("description", doc.filename or "Expense"),
+                    lines=[_expense_claim_line(doc)],
+                    has_line_description=True,
+                )
                 
-                if doc_type in ("receipt", "expense_claim", "expense"):
-                    # Create expense claim
-                    line = ExpenseClaimLine(
-                        account=data.get("account_key", ""),
-                        line_description=data.get("description", doc.filename or "Expense"),
-                        qty=1,
-                        purchase_unit_price=float(data.get("total_amount", 0)),
-                    )
-                    
-                    expense_data = ExpenseClaimData(
-                        date=data.get("date", datetime.now(timezone.utc).strftime("%Y-%m-%d")),
-                        paid_by=user_id,
-                        payee=data.get("vendor_name", "Unknown"),
-                        description=data.get("description", doc.filename or "Expense"),
-                        lines=[line],
-                        has_line_description=True,
-                    )
-                    
-                    response = await client.create_expense_claim(expense_data)
-                    
-                elif doc_type == "invoice":
-                    # Create purchase invoice
-                    line = PurchaseInvoiceLine(
-                        account=data.get("account_key", ""),
-                        line_description=data.get("description", ""),
-                        purchase_unit_price=float(data.get("total_amount", 0)),
-                    )
-                    
-                    invoice_data = PurchaseInvoiceData(
-                        issue_date=data.get("date", datetime.now(timezone.utc).strftime("%Y-%m-%d")),
-                        reference=data.get("reference", doc.filename or ""),
-                        description=data.get("description", ""),
-                        supplier=data.get("supplier_key", ""),
-                        lines=[line],
-                        has_line_number=True,
-                        has_line_description=True,
-                    )
-                    
-                    response = await client.create_purchase_invoice(invoice_data)
-                    
-                else:
-                    # Unknown document type
-                    results.append({
-                        "success": False,
-                        "message": f"Unknown document type: {doc_type}",
-                        "document_id": doc.id,
-                    })
-                    continue
+                response = await client.create_expense_claim(expense_data)
                 
-                if response.success:
-                    doc.status = "submitted"
-                    doc.submission_key = response.key
-                    
-                    results.append({
-                        "success": True,
-                        "key": response.key,
-                        "message": f"{doc_type.replace('_', ' ').title()} submitted successfully",
-                        "document_id": doc.id,
-                    })
-                else:
-                    doc.status = "error"
-                    doc.error_message = response.message
-                    
-                    results.append({
-                        "success": False,
-                        "message": response.message or f"Failed to submit {doc_type}",
-                        "document_id": doc.id,
-                    })
-                    
-            except Exception as e:
-                logger.error(f"Error submitting document {doc.id}: {e}")
+            elif doc_type == "invoice":
+                # Create purchase invoice
+                line = PurchaseInvoiceLine(
+                    account=data.get("account_key", ""),
+                    line_description=data.get("description", ""),
+                    purchase_unit_price=float(data.get("total_amount", 0)),
+                )
+                
+                invoice_data = PurchaseInvoiceData(
+                    issue_date=data.get("date", datetime.now(timezone.utc).strftime("%Y-%m-%d")),
+                    reference=data.get("reference", doc.filename or ""),
+                    description=data.get("description", ""),
+                    supplier=data.get("supplier_key", ""),
+                    lines=[line],
+                    has_line_number=True,
+                    has_line_description=True,
+                )
+                
+                response = await client.create_purchase_invoice(invoice_data)
+                
+            else:
+                # Unknown document type
+                return {
+                    "success": False,
+                    "message": f"Unknown document type: {doc_type}",
+                    "document_id": doc.id,
+                }
+            
+            if response.success:
+                doc.status = "submitted"
+                doc.submission_key = response.key
+                
+                return {
+                    "success": True,
+                    "key": response.key,
+                    "message": f"{doc_type.replace('_', ' ').title()} submitted successfully",
+                    "document_id": doc.id,
+                }
+            else:
                 doc.status = "error"
-                doc.error_message = str(e)
+                doc.error_message = response.message
                 
-                results.append({
+                return {
                     "success": False,
-                    "message": str(e),
+                    "message": response.message or f"Failed to submit {doc_type}",
                     "document_id": doc.id,
-                })
-        
-        return results
+                }
+                
+        except Exception as e:
+            logger.error(f"Error submitting document {doc.id}: {e}")
+            doc.status = "error"
+            doc.error_message = str(e)
+            
+            return {
+                "success": False,
+                "message": str(e),
+                "document_id": doc.id,
+            }
     
     async def close(self) -> None:
         """Clean up resources."""
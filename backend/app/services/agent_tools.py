@@ -10,15 +10,29 @@ for use by the AI agent. Tools handle:
 Tools require access to company configuration to get API credentials.
 """
 
+import asyncio
+import hashlib
+import heapq
 import logging
 import re
+import sys
+import time
+from bisect import bisect_right
+from collections import OrderedDict, defaultdict, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from decimal import Decimal
-from difflib import SequenceMatcher
-from typing import Any, Dict, List, Optional, Tuple
-
+from decimal import ROUND_HALF_UP, Decimal
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple, TypeVar
+
+import numpy as np
+import orjson
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
+from rapidfuzz import fuzz, process
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -32,47 +46,107 @@ from app.services.manager_io import (
     ManagerIOError,
     Supplier,
 )
-from app.services.ocr import OCRError, OCRResult, OCRService
+
+if TYPE_CHECKING:
+    # Imported lazily at runtime; PIL and pdf2image are only needed by the
+    # document tools
+    from app.services.ocr import OCRResult, OCRService
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Seconds a cached Manager.io client is reused before it is rebuilt from the
+# stored company configuration (picks up rotated API keys)
+CLIENT_CACHE_TTL = 300
+
+# Maximum number of companies with a cached Manager.io client; the least
+# recently used one is retired beyond this
+MAX_CACHED_CLIENTS = 128
+
+# Seconds the tools' serialized reference data (accounts, suppliers,
+# customers) is reused. Kept short because ManagerIOClient already caches the
+# raw responses for its own TTL underneath.
+REFERENCE_DATA_TTL = 60
+
+# Seconds a get_recent_transactions result is reused for the same company
+# and limit
+RECENT_TRANSACTIONS_TTL = 60
+
+# Balance records are folded in a worker thread once this many are pending;
+# typical ledgers stay below it and are folded on the event loop
+BALANCE_THREAD_BATCH = 5000
+
+# Pages of each balance source requested at once once its size is known
+BALANCE_PAGE_CONCURRENCY = 4
+
+# rapidfuzz's cdist only gets its own thread pool (it releases the GIL) for
+# score matrices at least this large; below it thread start-up costs more
+# than the parallel scan saves
+FUZZY_PARALLEL_MIN_PAIRS = 20_000
+
 
 # =============================================================================
 # Data Models for Tool Responses
 # =============================================================================
 
 
-class Transaction(BaseModel):
-    """Represents a transaction from Manager.io."""
+@dataclass(slots=True, frozen=True)
+class Transaction:
+    """Represents a transaction from Manager.io.
     
-    key: str = Field(description="Unique identifier for the transaction")
-    date: str = Field(description="Transaction date in YYYY-MM-DD format")
-    description: str = Field(description="Transaction description")
-    amount: float = Field(description="Transaction amount")
-    account: Optional[str] = Field(default=None, description="Account name or key")
-    transaction_type: str = Field(description="Type of transaction (payment, receipt, transfer, journal)")
-    reference: Optional[str] = Field(default=None, description="Reference number if available")
+    Attributes:
+        key: Unique identifier for the transaction
+        date: Transaction date in YYYY-MM-DD format
+        description: Transaction description
+        amount: Transaction amount
+        transaction_type: Type of transaction (payment, receipt, transfer, journal)
+        account: Account name or key
+        reference: Reference number if available
+    """
+    key: str
+    date: str
+    description: str
+    amount: float
+    transaction_type: str
+    account: Optional[str] = None
+    reference: Optional[str] = None
 
 
-class AccountBalance(BaseModel):
-    """Represents an account balance."""
+@dataclass(slots=True, frozen=True)
+class AccountBalance:
+    """Represents an account balance.
     
-    account_key: str = Field(description="Account key/UUID")
-    account_name: str = Field(description="Account name")
-    balance: float = Field(description="Current balance")
-    currency: str = Field(default="USD", description="Currency code")
+    Attributes:
+        account_key: Account key/UUID
+        account_name: Account name
+        balance: Current balance
+        currency: Currency code
+    """
+    account_key: str
+    account_name: str
+    balance: float
+    currency: str = "USD"
 
 
-class AccountBalances(BaseModel):
-    """Collection of account balances."""
+@dataclass(slots=True, frozen=True)
+class AccountBalances:
+    """Collection of account balances.
     
-    balances: List[AccountBalance] = Field(description="List of account balances")
-    as_of_date: str = Field(description="Date the balances were calculated")
-    total_assets: float = Field(default=0.0, description="Total assets")
-    total_liabilities: float = Field(default=0.0, description="Total liabilities")
+    Attributes:
+        balances: List of account balances
+        as_of_date: Date the balances were calculated
+        total_assets: Total assets
+        total_liabilities: Total liabilities
+    """
+    balances: List[AccountBalance]
+    as_of_date: str
+    total_assets: float = 0.0
+    total_liabilities: float = 0.0
 
 
-class ExtractedData(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ExtractedData:
     """Data extracted from a document via OCR.
     
     Attributes:
@@ -82,31 +156,33 @@ class ExtractedData(BaseModel):
         success: Whether extraction was successful
         error: Error message if extraction failed
     """
-    text: str = Field(description="Raw extracted text from the document")
-    normalized_text: str = Field(description="Normalized text (full-width to half-width)")
-    pages: int = Field(default=1, description="Number of pages processed")
-    success: bool = Field(default=True, description="Whether extraction was successful")
-    error: Optional[str] = Field(default=None, description="Error message if extraction failed")
+    text: str
+    normalized_text: str
+    pages: int = 1
+    success: bool = True
+    error: Optional[str] = None
 
 
-class MatchedAccount(BaseModel):
+@dataclass(slots=True, frozen=True)
+class MatchedAccount:
     """Result of expense categorization matching.
     
     Attributes:
         key: Account key/UUID
         name: Account name
-        code: Account code (optional)
         score: Match confidence score (0.0 to 1.0)
+        code: Account code (optional)
         matched_keywords: Keywords that contributed to the match
     """
-    key: str = Field(description="Account key/UUID")
-    name: str = Field(description="Account name")
-    code: Optional[str] = Field(default=None, description="Account code")
-    score: float = Field(description="Match confidence score (0.0 to 1.0)")
-    matched_keywords: List[str] = Field(default_factory=list, description="Keywords that contributed to the match")
+    key: str
+    name: str
+    score: float
+    code: Optional[str] = None
+    matched_keywords: List[str] = field(default_factory=list)
 
 
-class MatchedSupplier(BaseModel):
+@dataclass(slots=True, frozen=True)
+class MatchedSupplier:
     """Result of supplier identification matching.
     
     Attributes:
@@ -115,10 +191,10 @@ class MatchedSupplier(BaseModel):
         score: Match confidence score (0.0 to 1.0)
         matched: Whether a match was found above threshold
     """
-    key: str = Field(description="Supplier key/UUID")
-    name: str = Field(description="Supplier name")
-    score: float = Field(description="Match confidence score (0.0 to 1.0)")
-    matched: bool = Field(default=True, description="Whether a match was found above threshold")
+    key: str
+    name: str
+    score: float
+    matched: bool = True
 
 
 # =============================================================================
@@ -148,7 +224,7 @@ class ToolContext:
         db: AsyncSession,
         redis: Optional[Redis] = None,
         encryption_service: Optional[EncryptionService] = None,
-        ocr_service: Optional[OCRService] = None,
+        ocr_service: Optional["OCRService"] = None,
     ):
         """Initialize ToolContext.
         
@@ -163,7 +239,10 @@ class ToolContext:
         self._encryption = encryption_service or EncryptionService()
         self._ocr_service = ocr_service
         self._company_service = CompanyConfigService(db, self._encryption)
-        self._clients: Dict[str, ManagerIOClient] = {}
+        # company_id -> (expiry, client, user IDs that passed the access check)
+        self._clients: OrderedDict[str, Tuple[float, ManagerIOClient, Set[str]]] = OrderedDict()
+        self._client_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._retired_clients: List[ManagerIOClient] = []
     
     async def get_company_config(
         self,
@@ -191,7 +270,12 @@ class ToolContext:
     ) -> ManagerIOClient:
         """Get or create a ManagerIOClient for a company.
         
-        Clients are cached by company_id to reuse connections.
+        API credentials belong to the company, so one client is cached per
+        company_id for CLIENT_CACHE_TTL seconds and shared by its users. Each
+        user still passes the company access check before getting the client.
+        At most MAX_CACHED_CLIENTS companies are kept, least recently used
+        first out. A per-company lock makes concurrent callers share one
+        client instead of each building their own.
         
         Args:
             company_id: Company configuration ID
@@ -203,30 +287,90 @@ class ToolContext:
         Raises:
             CompanyNotFoundError: If company not found or access denied
         """
-        # Check cache first
-        cache_key = f"{company_id}:{user_id}"
-        if cache_key in self._clients:
-            return self._clients[cache_key]
-        
-        # Get company config
-        company = await self.get_company_config(company_id, user_id)
-        
-        # Decrypt API key
-        api_key = self._company_service.decrypt_api_key(company)
-        
-        # Create client
-        client = ManagerIOClient(
-            base_url=company.base_url,
-            api_key=api_key,
-            cache=self.redis,
-        )
+        cached = self._clients.get(company_id)
+        if cached is not None and cached[0] > time.monotonic() and user_id in cached[2]:
+            self._clients.move_to_end(company_id)
+            return cached[1]
+        
+        async with self._client_locks[company_id]:
+            # Another caller may have built it while we waited
+            cached = self._clients.get(company_id)
+            if cached is not None:
+                if cached[0] > time.monotonic():
+                    if user_id not in cached[2]:
+                        await self.get_company_config(company_id, user_id)
+                        cached[2].add(user_id)
+                    self._clients.move_to_end(company_id)
+                    return cached[1]
+                # Expired; in-flight calls may still be using it, so it is
+                # closed with the context rather than now
+                del self._clients[company_id]
+                self._retired_clients.append(cached[1])
+            
+            # Get company config
+            company = await self.get_company_config(company_id, user_id)
+            
+            # Decrypt API key
+            api_key = self._company_service.decrypt_api_key(company)
+            
+            # Create client
+            client = ManagerIOClient(
+                base_url=company.base_url,
+                api_key=api_key,
+                cache=self.redis,
+            )
+            
+            # Cache client, retiring the least recently used beyond the cap
+            self._clients[company_id] = (
+                time.monotonic() + CLIENT_CACHE_TTL, client, {user_id},
+            )
+            while len(self._clients) > MAX_CACHED_CLIENTS:
+                evicted_id, (_, evicted, _) = self._clients.popitem(last=False)
+                lock = self._client_locks.get(evicted_id)
+                if lock is not None and not lock.locked():
+                    del self._client_locks[evicted_id]
+                self._retired_clients.append(evicted)
+            
+            return client
+    
+    async def _cached_json(
+        self,
+        key: str,
+        ttl: int,
+        loader: Callable[[], Awaitable[T]],
+    ) -> T:
+        """Return a JSON-serializable value from Redis, loading it on a miss.
         
-        # Cache client
-        self._clients[cache_key] = client
+        Redis errors are logged and treated as misses; without Redis the
+        loader is simply called.
+        
+        Args:
+            key: Redis key
+            ttl: Seconds to keep a loaded value
+            loader: Coroutine function producing the value
+            
+        Returns:
+            The cached or freshly loaded value
+        """
+        if self.redis is None:
+            return await loader()
         
-        return client
+        try:
+            raw = await self.redis.get(key)
+            if raw:
+                cached: T = orjson.loads(raw)
+                return cached
+        except Exception as e:
+            logger.warning(f"Cache get failed for {key}: {e}")
+        
+        value = await loader()
+        try:
+            await self.redis.set(key, orjson.dumps(value), ex=ttl)
+        except Exception as e:
+            logger.warning(f"Cache set failed for {key}: {e}")
+        return value
     
-    def get_ocr_service(self) -> OCRService:
+    def get_ocr_service(self) -> "OCRService":
         """Get the OCR service.
         
         Returns:
@@ -237,46 +381,77 @@ class ToolContext:
         """
         if self._ocr_service is None:
             # Create a default OCR service if not provided
+            from app.services.ocr import OCRService
+            
             self._ocr_service = OCRService()
         return self._ocr_service
     
     async def close(self) -> None:
         """Close all cached clients."""
-        for client in self._clients.values():
+        for _, client, _ in self._clients.values():
+            await client.close()
+        for client in self._retired_clients:
             await client.close()
         self._clients.clear()
+        self._retired_clients.clear()
 
 
-# Global tool context - must be set before using tools
-_tool_context: Optional[ToolContext] = None
+# Tool context - must be set before using tools. Each request's task sees
+# the context it set, so concurrent agents don't swap sessions; there is no
+# process-wide fallback, so a task that never set one can't pick up another
+# request's session.
+_current_tool_context: ContextVar[Optional[ToolContext]] = ContextVar(
+    "tool_context", default=None,
+)
 
 
 def set_tool_context(context: ToolContext) -> None:
-    """Set the global tool context.
+    """Set the tool context for the current task.
     
-    Must be called before using any agent tools.
+    Must be called before using any agent tools, from the task that runs
+    them (tasks it starts afterwards inherit the context).
     
     Args:
         context: ToolContext instance with database and cache access
     """
-    global _tool_context
-    _tool_context = context
+    _current_tool_context.set(context)
 
 
 def get_tool_context() -> ToolContext:
-    """Get the global tool context.
+    """Get the tool context for the current task.
     
     Returns:
         Current ToolContext instance
         
     Raises:
-        RuntimeError: If tool context has not been set
+        RuntimeError: If tool context has not been set in this task
     """
-    if _tool_context is None:
+    context = _current_tool_context.get()
+    if context is None:
         raise RuntimeError(
             "Tool context not set. Call set_tool_context() before using agent tools."
         )
-    return _tool_context
+    return context
+
+
+async def get_tool_client(company_id: str, user_id: str) -> ManagerIOClient:
+    """Get the Manager.io client for a tool call from the current tool context.
+    
+    Shorthand for ``get_tool_context().get_manager_io_client(...)``; the
+    client is shared per company and each user's access is checked once.
+    
+    Args:
+        company_id: Company configuration ID
+        user_id: User ID for access control
+        
+    Returns:
+        Configured ManagerIOClient instance
+        
+    Raises:
+        RuntimeError: If tool context has not been set
+        CompanyNotFoundError: If company not found or access denied
+    """
+    return await get_tool_context().get_manager_io_client(company_id, user_id)
 
 
 # =============================================================================
@@ -284,6 +459,49 @@ def get_tool_context() -> ToolContext:
 # =============================================================================
 
 
+async def _load_chart_of_accounts(
+    context: ToolContext,
+    client: ManagerIOClient,
+    company_id: str,
+) -> List[Dict[str, Any]]:
+    """Chart of accounts as serializable dicts, cached per company.
+    
+    Callers must have obtained ``client`` through
+    ``context.get_manager_io_client`` so access has already been checked.
+    """
+    async def load() -> List[Dict[str, Any]]:
+        return [
+            {"key": acc.key, "name": acc.name, "code": acc.code}
+            for acc in await client.get_chart_of_accounts()
+        ]
+    
+    return await context._cached_json(
+        f"agent_tools:coa:{company_id}", REFERENCE_DATA_TTL, load
+    )
+
+
+async def _load_account_names(
+    context: ToolContext,
+    client: ManagerIOClient,
+    company_id: str,
+) -> Dict[str, str]:
+    """Account key to name map, cached per company beside the chart.
+    
+    Derived from ``_load_chart_of_accounts`` on a miss, so callers that only
+    need names read one small cached value and skip rebuilding the map.
+    Access must already have been checked as for ``_load_chart_of_accounts``.
+    """
+    async def load() -> Dict[str, str]:
+        return {
+            acc["key"]: acc["name"]
+            for acc in await _load_chart_of_accounts(context, client, company_id)
+        }
+    
+    return await context._cached_json(
+        f"agent_tools:coa_map:{company_id}", REFERENCE_DATA_TTL, load
+    )
+
+
 @tool
 async def get_chart_of_accounts(
     company_id: str,
@@ -311,13 +529,7 @@ async def get_chart_of_accounts(
     try:
         context = get_tool_context()
         client = await context.get_manager_io_client(company_id, user_id)
-        accounts = await client.get_chart_of_accounts()
-        
-        # Convert to dictionaries for serialization
-        result = [
-            {"key": acc.key, "name": acc.name, "code": acc.code}
-            for acc in accounts
-        ]
+        result = await _load_chart_of_accounts(context, client, company_id)
         
         logger.info(f"Retrieved {len(result)} accounts for company {company_id}")
         return result
@@ -359,13 +571,17 @@ async def get_suppliers(
     try:
         context = get_tool_context()
         client = await context.get_manager_io_client(company_id, user_id)
-        suppliers = await client.get_suppliers()
         
-        # Convert to dictionaries for serialization
-        result = [
-            {"key": sup.key, "name": sup.name}
-            for sup in suppliers
-        ]
+        async def load() -> List[Dict[str, Any]]:
+            # Convert to dictionaries for serialization
+            return [
+                {"key": sup.key, "name": sup.name}
+                for sup in await client.get_suppliers()
+            ]
+        
+        result = await context._cached_json(
+            f"agent_tools:suppliers:{company_id}", REFERENCE_DATA_TTL, load
+        )
         
         logger.info(f"Retrieved {len(result)} suppliers for company {company_id}")
         return result
@@ -407,13 +623,17 @@ async def get_customers(
     try:
         context = get_tool_context()
         client = await context.get_manager_io_client(company_id, user_id)
-        customers = await client.get_customers()
         
-        # Convert to dictionaries for serialization
-        result = [
-            {"key": cust.key, "name": cust.name}
-            for cust in customers
-        ]
+        async def load() -> List[Dict[str, Any]]:
+            # Convert to dictionaries for serialization
+            return [
+                {"key": cust.key, "name": cust.name}
+                for cust in await client.get_customers()
+            ]
+        
+        result = await context._cached_json(
+            f"agent_tools:customers:{company_id}", REFERENCE_DATA_TTL, load
+        )
         
         logger.info(f"Retrieved {len(result)} customers for company {company_id}")
         return result
@@ -429,6 +649,37 @@ async def get_customers(
         raise ManagerIOError(f"Failed to fetch customers: {e}")
 
 
+# Sentinel for a field that is absent (as opposed to present but None)
+_MISSING = object()
+
+
+def _field(item: Dict[str, Any], name: str, alias: str, default: Any = None) -> Any:
+    """Read ``name`` from a record, falling back to ``alias`` then ``default``.
+    
+    Manager.io records use CapitalCase keys and some older payloads lowercase
+    ones; the alias is only looked up when the primary key is absent.
+    """
+    value = item.get(name, _MISSING)
+    if value is _MISSING:
+        return item.get(alias, default)
+    return value
+
+
+def _transaction_date(transaction: Dict[str, Any]) -> str:
+    """Sort key ordering recent transactions by date."""
+    return transaction.get("date") or ""
+
+
+# Output field, record key, fallback key and default of the leading columns
+# of every recent transaction
+_TRANSACTION_FIELDS = (
+    ("key", "Key", "key", ""),
+    ("date", "Date", "date", ""),
+    ("description", "Description", "description", ""),
+    ("amount", "Amount", "amount", 0),
+)
+
+
 @tool
 async def get_recent_transactions(
     company_id: str,
@@ -460,66 +711,68 @@ async def get_recent_transactions(
         context = get_tool_context()
         client = await context.get_manager_io_client(company_id, user_id)
         
-        transactions: List[Dict[str, Any]] = []
-        
-        # Calculate how many to fetch from each source
-        # We'll fetch from payments, receipts, and transfers
-        per_source_limit = max(limit // 3, 10)
-        
-        # Fetch payments
-        try:
-            payments_response = await client.get_payments(skip=0, take=per_source_limit)
-            for item in payments_response.items:
-                transactions.append({
-                    "key": item.get("Key", item.get("key", "")),
-                    "date": item.get("Date", item.get("date", "")),
-                    "description": item.get("Description", item.get("description", "")),
-                    "amount": float(item.get("Amount", item.get("amount", 0))),
-                    "account": item.get("Account", item.get("account")),
-                    "transaction_type": "payment",
-                    "reference": item.get("Reference", item.get("reference")),
-                })
-        except ManagerIOError as e:
-            logger.warning(f"Failed to fetch payments: {e}")
-        
-        # Fetch receipts
-        try:
-            receipts_response = await client.get_receipts(skip=0, take=per_source_limit)
-            for item in receipts_response.items:
-                transactions.append({
-                    "key": item.get("Key", item.get("key", "")),
-                    "date": item.get("Date", item.get("date", "")),
-                    "description": item.get("Description", item.get("description", "")),
-                    "amount": float(item.get("Amount", item.get("amount", 0))),
-                    "account": item.get("Account", item.get("account")),
-                    "transaction_type": "receipt",
-                    "reference": item.get("Reference", item.get("reference")),
-                })
-        except ManagerIOError as e:
-            logger.warning(f"Failed to fetch receipts: {e}")
-        
-        # Fetch transfers
-        try:
-            transfers_response = await client.get_transfers(skip=0, take=per_source_limit)
-            for item in transfers_response.items:
-                transactions.append({
-                    "key": item.get("Key", item.get("key", "")),
-                    "date": item.get("Date", item.get("date", "")),
-                    "description": item.get("Description", item.get("description", "")),
-                    "amount": float(item.get("Amount", item.get("amount", 0))),
-                    "account": item.get("FromAccount", item.get("from_account")),
-                    "transaction_type": "transfer",
-                    "reference": item.get("Reference", item.get("reference")),
-                })
-        except ManagerIOError as e:
-            logger.warning(f"Failed to fetch transfers: {e}")
-        
-        # Sort by date (most recent first) and limit
-        transactions.sort(
-            key=lambda x: x.get("date", ""),
-            reverse=True,
+        async def load() -> List[Dict[str, Any]]:
+            per_source: List[List[Dict[str, Any]]] = []
+            
+            # Calculate how many to fetch from each source
+            # We'll fetch from payments, receipts, and transfers
+            per_source_limit = max(limit // 3, 10)
+            
+            # Fetch the newest of payments, receipts and transfers
+            # concurrently; a failing source is logged and skipped
+            responses = await asyncio.gather(
+                client.get_payments(
+                    skip=0, take=per_source_limit, order_by="Date", desc=True,
+                ),
+                client.get_receipts(
+                    skip=0, take=per_source_limit, order_by="Date", desc=True,
+                ),
+                client.get_transfers(
+                    skip=0, take=per_source_limit, order_by="Date", desc=True,
+                ),
+                return_exceptions=True,
+            )
+            sources = (
+                ("payment", "payments", "Account", "account"),
+                ("receipt", "receipts", "Account", "account"),
+                ("transfer", "transfers", "FromAccount", "from_account"),
+            )
+            for response, (transaction_type, label, account_field, account_alias) in zip(
+                responses, sources
+            ):
+                if isinstance(response, ManagerIOError):
+                    logger.warning(f"Failed to fetch {label}: {response}")
+                    continue
+                if isinstance(response, BaseException):
+                    raise response
+                transactions: List[Dict[str, Any]] = []
+                for item in response.items:
+                    transaction = {
+                        column: _field(item, name, alias, default)
+                        for column, name, alias, default in _TRANSACTION_FIELDS
+                    }
+                    transaction["amount"] = float(transaction["amount"])
+                    transaction["account"] = _field(item, account_field, account_alias)
+                    transaction["transaction_type"] = transaction_type
+                    transaction["reference"] = _field(item, "Reference", "reference")
+                    transactions.append(transaction)
+                # Already newest first if the server honoured the ordering, in
+                # which case this sort is a linear check
+                transactions.sort(key=_transaction_date, reverse=True)
+                per_source.append(transactions)
+            
+            # Merge the sorted sources, most recent first; ties keep source order
+            return list(islice(
+                heapq.merge(*per_source, key=_transaction_date, reverse=True),
+                limit,
+            ))
+        
+        # Repeat requests within the TTL are served from Redis
+        transactions = await context._cached_json(
+            f"agent_tools:recent_tx:{company_id}:{limit}",
+            RECENT_TRANSACTIONS_TTL,
+            load,
         )
-        transactions = transactions[:limit]
         
         logger.info(f"Retrieved {len(transactions)} recent transactions for company {company_id}")
         return transactions
@@ -532,6 +785,125 @@ async def get_recent_transactions(
         raise ManagerIOError(f"Failed to fetch recent transactions: {e}")
 
 
+_CENT = Decimal("1")
+
+
+def _to_cents(value: Any) -> int:
+    """Convert a money amount (number or numeric string) to integer cents.
+    
+    Goes through ``str`` so float amounts convert at their displayed value,
+    then rounds half-to-even like ``round(x, 2)``. Missing amounts are 0.
+    """
+    if value is None or value == "":
+        return 0
+    return int((Decimal(str(value)) * 100).quantize(_CENT))
+
+
+def _add_payment(balances: Dict[str, int], payment: Dict[str, Any]) -> None:
+    """Apply a payment (outflow) to ``balances``."""
+    account_key = _field(payment, "Account", "account", "")
+    if account_key:
+        balances[account_key] -= _to_cents(_field(payment, "Amount", "amount"))
+
+
+def _add_receipt(balances: Dict[str, int], receipt: Dict[str, Any]) -> None:
+    """Apply a receipt (inflow) to ``balances``."""
+    account_key = _field(receipt, "Account", "account", "")
+    if account_key:
+        balances[account_key] += _to_cents(_field(receipt, "Amount", "amount"))
+
+
+def _add_transfer(balances: Dict[str, int], transfer: Dict[str, Any]) -> None:
+    """Move a transfer's amount between its two accounts in ``balances``."""
+    from_account = _field(transfer, "FromAccount", "from_account", "")
+    to_account = _field(transfer, "ToAccount", "to_account", "")
+    amount = _to_cents(_field(transfer, "Amount", "amount"))
+    if from_account:
+        balances[from_account] -= amount
+    if to_account:
+        balances[to_account] += amount
+
+
+def _add_journal_line(balances: Dict[str, int], entry: Dict[str, Any]) -> None:
+    """Apply a journal line's debit minus credit to ``balances``."""
+    account_key = _field(entry, "Account", "account", "")
+    if account_key:
+        # Debits increase asset accounts, credits decrease them
+        # For liability accounts, it's the opposite
+        balances[account_key] += (
+            _to_cents(_field(entry, "Debit", "debit"))
+            - _to_cents(_field(entry, "Credit", "credit"))
+        )
+
+
+# Paginated endpoint, label and accumulator for each balance source, in the
+# order their totals are combined
+_BALANCE_SOURCES = (
+    ("/payments", "payments", _add_payment),
+    ("/receipts", "receipts", _add_receipt),
+    ("/inter-account-transfers", "transfers", _add_transfer),
+    ("/journal-entry-lines", "journal entries", _add_journal_line),
+)
+
+
+def _fold_records(
+    balances: Dict[str, int],
+    add: Callable[[Dict[str, int], Dict[str, Any]], None],
+    records: List[Dict[str, Any]],
+) -> None:
+    """Apply ``add`` to each record in turn."""
+    for record in records:
+        add(balances, record)
+
+
+async def _stream_balances(
+    client: ManagerIOClient,
+    endpoint: str,
+    add: Callable[[Dict[str, int], Dict[str, Any]], None],
+) -> Dict[str, int]:
+    """Fold one paginated source into per-account cent totals as it streams.
+    
+    Records are folded in batches of BALANCE_THREAD_BATCH in a worker thread,
+    so a large crawl (or a cached one, which is replayed without ever
+    suspending) doesn't hold up the event loop; a smaller remainder is folded
+    inline.
+    """
+    balances: Dict[str, int] = defaultdict(int)
+    batch: List[Dict[str, Any]] = []
+    async for record in client.iter_paginated(
+        endpoint, concurrency=BALANCE_PAGE_CONCURRENCY
+    ):
+        batch.append(record)
+        if len(batch) >= BALANCE_THREAD_BATCH:
+            await asyncio.to_thread(_fold_records, balances, add, batch)
+            batch = []
+    _fold_records(balances, add, batch)
+    return balances
+
+
+async def _load_source_balances(
+    context: ToolContext,
+    client: ManagerIOClient,
+    company_id: str,
+    endpoint: str,
+    add: Callable[[Dict[str, int], Dict[str, Any]], None],
+) -> Dict[str, int]:
+    """One source's per-account cent totals, cached per company and endpoint.
+    
+    Streamed crawls aren't cached by the client, so the folded totals are
+    kept for the client's cache TTL instead, as the full record lists were
+    when balances were built from ``fetch_all_paginated``. Failed crawls are
+    not cached. Access must already have been checked as for
+    ``_load_chart_of_accounts``.
+    """
+    async def load() -> Dict[str, int]:
+        return dict(await _stream_balances(client, endpoint, add))
+    
+    return await context._cached_json(
+        f"agent_tools:balances:{company_id}:{endpoint}", client.cache_ttl, load
+    )
+
+
 @tool
 async def get_account_balances(
     company_id: str,
@@ -564,97 +936,68 @@ async def get_account_balances(
         context = get_tool_context()
         client = await context.get_manager_io_client(company_id, user_id)
         
-        # Get chart of accounts for account names
-        accounts = await client.get_chart_of_accounts()
-        account_map = {acc.key: acc.name for acc in accounts}
-        
-        # Initialize balance tracking
-        balances: Dict[str, float] = {}
-        
-        # Fetch all payments (outflows)
-        try:
-            payments = await client.fetch_all_paginated("/payments")
-            for payment in payments:
-                account_key = payment.get("Account", payment.get("account", ""))
-                amount = float(payment.get("Amount", payment.get("amount", 0)))
-                if account_key:
-                    balances[account_key] = balances.get(account_key, 0) - amount
-        except ManagerIOError as e:
-            logger.warning(f"Failed to fetch payments for balance calculation: {e}")
-        
-        # Fetch all receipts (inflows)
-        try:
-            receipts = await client.fetch_all_paginated("/receipts")
-            for receipt in receipts:
-                account_key = receipt.get("Account", receipt.get("account", ""))
-                amount = float(receipt.get("Amount", receipt.get("amount", 0)))
-                if account_key:
-                    balances[account_key] = balances.get(account_key, 0) + amount
-        except ManagerIOError as e:
-            logger.warning(f"Failed to fetch receipts for balance calculation: {e}")
-        
-        # Fetch all transfers
-        try:
-            transfers = await client.fetch_all_paginated("/inter-account-transfers")
-            for transfer in transfers:
-                from_account = transfer.get("FromAccount", transfer.get("from_account", ""))
-                to_account = transfer.get("ToAccount", transfer.get("to_account", ""))
-                amount = float(transfer.get("Amount", transfer.get("amount", 0)))
-                if from_account:
-                    balances[from_account] = balances.get(from_account, 0) - amount
-                if to_account:
-                    balances[to_account] = balances.get(to_account, 0) + amount
-        except ManagerIOError as e:
-            logger.warning(f"Failed to fetch transfers for balance calculation: {e}")
-        
-        # Fetch journal entries for more detailed balance tracking
-        try:
-            journal_entries = await client.fetch_all_paginated("/journal-entry-lines")
-            for entry in journal_entries:
-                account_key = entry.get("Account", entry.get("account", ""))
-                debit = float(entry.get("Debit", entry.get("debit", 0)) or 0)
-                credit = float(entry.get("Credit", entry.get("credit", 0)) or 0)
-                if account_key:
-                    # Debits increase asset accounts, credits decrease them
-                    # For liability accounts, it's the opposite
-                    balances[account_key] = balances.get(account_key, 0) + debit - credit
-        except ManagerIOError as e:
-            logger.warning(f"Failed to fetch journal entries for balance calculation: {e}")
-        
-        # Build result
-        balance_list = []
-        total_assets = 0.0
-        total_liabilities = 0.0
-        
-        for account_key, balance in balances.items():
-            account_name = account_map.get(account_key, account_key)
-            balance_list.append({
-                "account_key": account_key,
-                "account_name": account_name,
-                "balance": round(balance, 2),
-                "currency": "USD",  # Default currency
-            })
-            
-            # Simple heuristic: positive balances are assets, negative are liabilities
-            # In a real implementation, this would use account type from chart of accounts
-            if balance > 0:
-                total_assets += balance
-            else:
-                total_liabilities += abs(balance)
+        # Load the account names and stream all four transaction sources
+        # concurrently, each into its own totals; these are then combined in
+        # a fixed order so no source's records are held in memory at once
+        account_map, partials = await asyncio.gather(
+            _load_account_names(context, client, company_id),
+            asyncio.gather(
+                *(
+                    _load_source_balances(context, client, company_id, endpoint, add)
+                    for endpoint, _, add in _BALANCE_SOURCES
+                ),
+                return_exceptions=True,
+            ),
+            return_exceptions=True,
+        )
+        if isinstance(account_map, BaseException):
+            raise account_map
+        if isinstance(partials, BaseException):
+            raise partials
+        
+        balances: Dict[str, int] = defaultdict(int)
+        for partial, (_, label, _) in zip(partials, _BALANCE_SOURCES):
+            if isinstance(partial, ManagerIOError):
+                logger.warning(f"Failed to fetch {label} for balance calculation: {partial}")
+                continue
+            if isinstance(partial, BaseException):
+                raise partial
+            for account_key, amount in partial.items():
+                balances[account_key] += amount
+        
+        # Build result, sorted by account name; balances are exact integer
+        # cents until here
+        balance_list = sorted(
+            (
+                {
+                    "account_key": account_key,
+                    "account_name": account_map.get(account_key, account_key),
+                    "balance": balance / 100,
+                    "currency": "USD",  # Default currency
+                }
+                for account_key, balance in balances.items()
+            ),
+            key=itemgetter("account_name"),
+        )
         
-        # Sort by account name
-        balance_list.sort(key=lambda x: x["account_name"])
+        # Simple heuristic: positive balances are assets, negative are liabilities
+        # In a real implementation, this would use account type from chart of accounts.
+        # Plain sums over the exact integer cents: there is one value per
+        # account (hundreds at most), too few for a NumPy array to pay off
+        total_assets = sum(balance for balance in balances.values() if balance > 0)
+        total_liabilities = -sum(balance for balance in balances.values() if balance < 0)
         
         result = {
             "balances": balance_list,
             "as_of_date": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
-            "total_assets": round(total_assets, 2),
-            "total_liabilities": round(total_liabilities, 2),
+            "total_assets": total_assets / 100,
+            "total_liabilities": total_liabilities / 100,
         }
         
         logger.info(
             f"Calculated balances for {len(balance_list)} accounts, "
-            f"total_assets={total_assets:.2f}, total_liabilities={total_liabilities:.2f}"
+            f"total_assets={result['total_assets']:.2f}, "
+            f"total_liabilities={result['total_liabilities']:.2f}"
         )
         return result
         
@@ -673,7 +1016,7 @@ async def get_account_balances(
 
 # Expense category keywords for semantic matching
 # Maps common expense keywords to account name patterns
-EXPENSE_KEYWORDS: Dict[str, List[str]] = {
+_RAW_EXPENSE_KEYWORDS: Dict[str, List[str]] = {
     # Office and supplies
     "office": ["office", "supplies", "stationery", "paper", "printer", "ink", "toner"],
     "supplies": ["supplies", "office", "stationery", "consumables"],
@@ -721,11 +1064,30 @@ EXPENSE_KEYWORDS: Dict[str, List[str]] = {
     "shipping": ["shipping", "postage", "courier", "delivery", "freight", "mail"],
 }
 
+# Frozen once at import time so scoring never rebuilds category sets. Strings
+# are interned so keywords extracted from text (also interned) compare by
+# identity in set lookups.
+EXPENSE_KEYWORDS: Dict[str, FrozenSet[str]] = {
+    sys.intern(category): frozenset(sys.intern(keyword) for keyword in keywords)
+    for category, keywords in _RAW_EXPENSE_KEYWORDS.items()
+}
+
+
+# Anything that is not a lowercase letter, digit or whitespace
+_NORMALIZE_RE = re.compile(r'[^a-z0-9\s]')
+
+# Runs of at least 3 lowercase letters/digits: the keywords of a text
+_KEYWORD_RE = re.compile(r'[a-z0-9]{3,}')
+
 
+# Inputs are short descriptions and account names (well under 1KB), so a
+# few thousand cached entries stay small while covering a chart of accounts.
+@lru_cache(maxsize=4096)
 def _normalize_for_matching(text: str) -> str:
     """Normalize text for matching purposes.
     
     Converts to lowercase, removes special characters, and normalizes whitespace.
+    Memoized: the same description is normalized once per candidate account.
     
     Args:
         text: Input text to normalize
@@ -733,81 +1095,146 @@ def _normalize_for_matching(text: str) -> str:
     Returns:
         Normalized text
     """
-    # Convert to lowercase
-    text = text.lower()
-    # Remove special characters except spaces
-    text = re.sub(r'[^a-z0-9\s]', ' ', text)
-    # Normalize whitespace
-    text = ' '.join(text.split())
-    return text
+    return ' '.join(_NORMALIZE_RE.sub(' ', text.lower()).split())
 
 
-def _extract_keywords(text: str) -> List[str]:
+@lru_cache(maxsize=4096)
+def _token_set(normalized: str) -> FrozenSet[str]:
+    """Distinct whitespace tokens of an already normalized string."""
+    return frozenset(normalized.split())
+
+
+@lru_cache(maxsize=4096)
+def _extract_keywords(text: str) -> FrozenSet[str]:
     """Extract keywords from text.
     
     Args:
         text: Input text
         
     Returns:
-        List of keywords
+        Set of distinct keywords (frozen so the memoized result cannot be
+        mutated and callers can intersect it directly)
     """
-    normalized = _normalize_for_matching(text)
-    # Split into words and filter short words
-    words = [w for w in normalized.split() if len(w) >= 3]
-    return words
+    # Same words as splitting _normalize_for_matching(text) and dropping
+    # those under 3 characters, in one regex pass
+    return frozenset(map(sys.intern, _KEYWORD_RE.findall(text.lower())))
 
 
-def _calculate_keyword_score(
-    description: str,
-    account_name: str,
-) -> Tuple[float, List[str]]:
-    """Calculate keyword match score between description and account name.
+def _invert_expense_keywords() -> Dict[str, Tuple[str, ...]]:
+    """Map each expense keyword to the categories listing it, in category order."""
+    inverted: Dict[str, List[str]] = defaultdict(list)
+    for category, keywords in EXPENSE_KEYWORDS.items():
+        for keyword in keywords:
+            inverted[keyword].append(category)
+    return {keyword: tuple(categories) for keyword, categories in inverted.items()}
+
+
+# Inverted index so a token finds its categories without scanning them all
+_KEYWORD_TO_CATEGORIES = _invert_expense_keywords()
+
+_CATEGORY_ORDER: Dict[str, int] = {
+    category: index for index, category in enumerate(EXPENSE_KEYWORDS)
+}
+
+
+def _keyword_categories(keywords: FrozenSet[str]) -> FrozenSet[str]:
+    """Categories that list at least one of the given keywords."""
+    return frozenset(
+        category
+        for keyword in keywords
+        for category in _KEYWORD_TO_CATEGORIES.get(keyword, ())
+    )
+
+
+def _cdist_workers(rows: int, columns: int) -> int:
+    """Worker count for a rows x columns cdist: all cores only for large matrices."""
+    return -1 if rows * columns >= FUZZY_PARALLEL_MIN_PAIRS else 1
+
+
+@dataclass(slots=True, frozen=True)
+class _AccountProfile:
+    """Match features of an account name, computed once per categorization."""
     
-    Args:
-        description: Expense description
-        account_name: Account name to match against
-        
-    Returns:
-        Tuple of (score, matched_keywords)
-    """
-    desc_keywords = set(_extract_keywords(description))
-    account_keywords = set(_extract_keywords(account_name))
+    keywords: FrozenSet[str]
+    normalized: str
+    # Categories sharing a keyword with the account name
+    keyword_categories: FrozenSet[str]
+    # Categories whose name appears in the lowercased account name
+    named_categories: FrozenSet[str]
+
+
+def _profile_account(account_name: str) -> _AccountProfile:
+    """Precompute the account-side features used by keyword scoring."""
+    keywords = _extract_keywords(account_name)
+    account_lower = account_name.lower()
+    return _AccountProfile(
+        keywords=keywords,
+        normalized=_normalize_for_matching(account_name),
+        keyword_categories=_keyword_categories(keywords),
+        named_categories=frozenset(
+            category for category in EXPENSE_KEYWORDS if category in account_lower
+        ),
+    )
+
+
+def _description_categories(desc_keywords: FrozenSet[str]) -> List[Tuple[str, FrozenSet[str]]]:
+    """Categories the description hits, with the matching keywords, in category order."""
+    categories = sorted(_keyword_categories(desc_keywords), key=_CATEGORY_ORDER.__getitem__)
+    return [
+        (category, desc_keywords & EXPENSE_KEYWORDS[category])
+        for category in categories
+    ]
+
+
+@dataclass(slots=True, frozen=True)
+class _DescriptionProfile:
+    """Match features of an expense description, shared by every account."""
     
+    keywords: FrozenSet[str]
+    normalized: str
+    # (category, matching description keywords), in EXPENSE_KEYWORDS order
+    categories: Tuple[Tuple[str, FrozenSet[str]], ...]
+
+
+@lru_cache(maxsize=1024)
+def _profile_description(description: str) -> _DescriptionProfile:
+    """Normalize and tokenize a description once, before scoring any account."""
+    keywords = _extract_keywords(description)
+    return _DescriptionProfile(
+        keywords=keywords,
+        normalized=_normalize_for_matching(description),
+        categories=tuple(_description_categories(keywords)),
+    )
+
+
+def _score_account(
+    desc: _DescriptionProfile,
+    profile: _AccountProfile,
+) -> Tuple[float, List[str]]:
+    """Score one precomputed account profile against a precomputed description."""
     matched_keywords: List[str] = []
     score = 0.0
     
     # Direct keyword matches
-    direct_matches = desc_keywords & account_keywords
+    direct_matches = desc.keywords & profile.keywords
     if direct_matches:
         matched_keywords.extend(direct_matches)
         score += len(direct_matches) * 0.3
     
-    # Check against expense keyword categories
-    for category, keywords in EXPENSE_KEYWORDS.items():
-        category_keywords = set(keywords)
-        
-        # Check if description matches this category
-        desc_category_matches = desc_keywords & category_keywords
-        
-        # Check if account name matches this category
-        account_category_matches = account_keywords & category_keywords
-        
+    # Only categories the description matches can contribute
+    for category, desc_category_matches in desc.categories:
         # If both match the same category, boost score
-        if desc_category_matches and account_category_matches:
+        if category in profile.keyword_categories:
             matched_keywords.extend(desc_category_matches)
             score += 0.2
         
         # If account name contains the category name and description matches keywords
-        if category in account_name.lower() and desc_category_matches:
+        if category in profile.named_categories:
             matched_keywords.append(category)
             score += 0.15
     
     # Fuzzy string similarity as fallback
-    similarity = SequenceMatcher(
-        None,
-        _normalize_for_matching(description),
-        _normalize_for_matching(account_name),
-    ).ratio()
+    similarity = fuzz.ratio(desc.normalized, profile.normalized) / 100.0
     score += similarity * 0.2
     
     # Normalize score to 0-1 range
@@ -816,6 +1243,118 @@ def _calculate_keyword_score(
     return score, list(set(matched_keywords))
 
 
+def _calculate_keyword_score(
+    description: str,
+    account_name: str,
+) -> Tuple[float, List[str]]:
+    """Calculate keyword match score between description and account name.
+    
+    Args:
+        description: Expense description
+        account_name: Account name to match against
+        
+    Returns:
+        Tuple of (score, matched_keywords)
+    """
+    return _score_account(_profile_description(description), _profile_account(account_name))
+
+
+def _named_records(
+    records: List[Dict[str, Any]],
+) -> Tuple[Tuple[Dict[str, Any], ...], Tuple[str, ...]]:
+    """Split records with a non-empty name into parallel records/names tuples.
+    
+    Each record's name is read once here; the matchers then work on the
+    names tuple (which also keys their cached indexes) and index back into
+    the records by position.
+    """
+    named = [(record, name) for record in records if (name := record.get("name", ""))]
+    if not named:
+        return (), ()
+    records_column, names_column = zip(*named)
+    return records_column, names_column
+
+
+class _AccountIndex:
+    """Column-wise match features for a list of account names.
+    
+    Holds what _score_account reads from each _AccountProfile as arrays over
+    all accounts, so one description is scored against every account with a
+    handful of numpy operations instead of a Python call per account.
+    """
+    
+    __slots__ = ("profiles", "_names", "_postings", "_keyword_masks", "_named_masks")
+    
+    def __init__(self, names: Tuple[str, ...]) -> None:
+        self.profiles = [_profile_account(name) for name in names]
+        self._names = [profile.normalized for profile in self.profiles]
+        
+        postings: Dict[str, List[int]] = defaultdict(list)
+        keyword_columns: Dict[str, List[int]] = defaultdict(list)
+        named_columns: Dict[str, List[int]] = defaultdict(list)
+        for column, profile in enumerate(self.profiles):
+            for keyword in profile.keywords:
+                postings[keyword].append(column)
+            for category in profile.keyword_categories:
+                keyword_columns[category].append(column)
+            for category in profile.named_categories:
+                named_columns[category].append(column)
+        
+        self._postings = {
+            keyword: np.array(columns, dtype=np.intp)
+            for keyword, columns in postings.items()
+        }
+        self._keyword_masks = {
+            category: self._mask(columns) for category, columns in keyword_columns.items()
+        }
+        self._named_masks = {
+            category: self._mask(columns) for category, columns in named_columns.items()
+        }
+    
+    def _mask(self, columns: List[int]) -> np.ndarray:
+        mask = np.zeros(len(self.profiles), dtype=bool)
+        mask[columns] = True
+        return mask
+    
+    def scores(self, desc: _DescriptionProfile) -> np.ndarray:
+        """Scores for every account, equal to _score_account for each profile."""
+        # Direct keyword matches
+        direct = np.zeros(len(self.profiles))
+        for keyword in desc.keywords:
+            columns = self._postings.get(keyword)
+            if columns is not None:
+                direct[columns] += 1.0
+        score = direct * 0.3
+        
+        # Category boosts, added in the same order as the per-account scorer
+        for category, _ in desc.categories:
+            mask = self._keyword_masks.get(category)
+            if mask is not None:
+                score = score + np.where(mask, 0.2, 0.0)
+            mask = self._named_masks.get(category)
+            if mask is not None:
+                score = score + np.where(mask, 0.15, 0.0)
+        
+        # Fuzzy string similarity as fallback
+        similarity: np.ndarray = process.cdist(
+            [desc.normalized],
+            self._names,
+            scorer=fuzz.ratio,
+            dtype=np.float64,
+            workers=_cdist_workers(1, len(self._names)),
+        )[0] / 100.0
+        score = score + similarity * 0.2
+        
+        # Normalize score to 0-1 range
+        return np.minimum(score, 1.0)
+
+
+@lru_cache(maxsize=32)
+def _account_index(names: Tuple[str, ...]) -> _AccountIndex:
+    """Account match features, reused while the chart of accounts is unchanged."""
+    return _AccountIndex(names)
+
+
 def _fuzzy_match_score(str1: str, str2: str) -> float:
     """Calculate fuzzy match score between two strings.
     
@@ -844,11 +1383,11 @@ def _fuzzy_match_score(str1: str, str2: str) -> float:
         return 0.9
     
     # Sequence matching
-    seq_ratio = SequenceMatcher(None, norm1, norm2).ratio()
+    seq_ratio = fuzz.ratio(norm1, norm2) / 100.0
     
     # Token-based matching
-    tokens1 = set(norm1.split())
-    tokens2 = set(norm2.split())
+    tokens1 = _token_set(norm1)
+    tokens2 = _token_set(norm2)
     
     if tokens1 and tokens2:
         common_tokens = tokens1 & tokens2
@@ -862,6 +1401,46 @@ def _fuzzy_match_score(str1: str, str2: str) -> float:
     return combined_score
 
 
+# A PDF header preceded only by an optional UTF-8 BOM and whitespace
+_PDF_HEADER_RE = re.compile(rb'(?:\xef\xbb\xbf)?\s*%PDF-')
+
+
+def _is_pdf(data: bytes) -> bool:
+    """Whether ``data`` starts like a PDF, without copying any of it.
+    
+    ``startswith`` covers the usual case; the anchored regex accepts files
+    saved with a BOM or leading blank lines, which PDF readers tolerate.
+    """
+    return data.startswith(b'%PDF') or _PDF_HEADER_RE.match(data) is not None
+
+
+# OCR requests currently running, by (service, content digest, is_pdf)
+_OCR_IN_FLIGHT: Dict[Tuple[int, bytes, bool], "asyncio.Future[OCRResult]"] = {}
+
+
+async def _extract_once(
+    ocr_service: "OCRService",
+    image_data: bytes,
+    is_pdf: bool,
+) -> "OCRResult":
+    """Run OCR on a document, sharing the request with identical concurrent calls.
+    
+    The same attachment often arrives several times at once (an email
+    forwarded with duplicates, a retried upload). The vision model takes
+    seconds per page, so those callers await one request instead of each
+    sending their own. Results are not kept once the request finishes.
+    """
+    key = (id(ocr_service), hashlib.blake2b(image_data, digest_size=16).digest(), is_pdf)
+    pending = _OCR_IN_FLIGHT.get(key)
+    if pending is None:
+        extract = ocr_service.extract_from_pdf if is_pdf else ocr_service.extract_text
+        pending = asyncio.ensure_future(extract(image_data))
+        _OCR_IN_FLIGHT[key] = pending
+        pending.add_done_callback(lambda _: _OCR_IN_FLIGHT.pop(key, None))
+    # A cancelled caller must not cancel the request for the others
+    return await asyncio.shield(pending)
+
+
 @tool
 async def extract_document_data(
     image_data: bytes,
@@ -888,6 +1467,8 @@ async def extract_document_data(
     Raises:
         OCRError: If OCR processing fails
     """
+    from app.services.ocr import OCRError
+    
     logger.info(f"Extracting document data, hint={document_hint}")
     
     try:
@@ -895,12 +1476,9 @@ async def extract_document_data(
         ocr_service = context.get_ocr_service()
         
         # Determine if this is a PDF based on magic bytes
-        is_pdf = image_data[:4] == b'%PDF'
+        is_pdf = _is_pdf(image_data)
         
-        if is_pdf:
-            result = await ocr_service.extract_from_pdf(image_data)
-        else:
-            result = await ocr_service.extract_text(image_data)
+        result = await _extract_once(ocr_service, image_data, is_pdf)
         
         response = {
             "text": result.text,
@@ -997,17 +1575,19 @@ def categorize_expense(
     best_score = 0.0
     best_keywords: List[str] = []
     
-    for account in accounts:
-        account_name = account.get("name", "")
-        if not account_name:
-            continue
-        
-        score, keywords = _calculate_keyword_score(description, account_name)
+    # Description-side features are shared by every account
+    desc = _profile_description(description)
+    
+    candidates, account_names = _named_records(accounts)
+    if candidates:
+        index = _account_index(account_names)
+        scores = index.scores(desc)
+        best = int(scores.argmax())
         
-        if score > best_score:
-            best_score = score
-            best_keywords = keywords
-            best_match = account
+        # Like a strict "greater than best so far" scan from zero
+        if scores[best] > best_score:
+            best_score, best_keywords = _score_account(desc, index.profiles[best])
+            best_match = candidates[best]
     
     if best_match is None:
         # Return first account as fallback with zero score
@@ -1063,64 +1643,276 @@ def identify_supplier(
         returns a result with matched=False.
     """
     logger.info(f"Identifying supplier: '{vendor_name}'")
+    return identify_suppliers_batch([vendor_name], suppliers, threshold)[0]
+
+
+class _SupplierIndex:
+    """Containment index over supplier names, stored normalized in ``names``.
     
-    if not suppliers:
-        logger.warning("No suppliers provided for identification")
-        return {
-            "key": "",
-            "name": "",
-            "score": 0.0,
-            "matched": False,
-        }
+    Answers "which suppliers equal, contain, or are contained in this vendor
+    name" without comparing the vendor against every supplier:
     
-    if not vendor_name or not vendor_name.strip():
-        logger.warning("Empty vendor name provided for identification")
-        return {
-            "key": "",
-            "name": "",
-            "score": 0.0,
-            "matched": False,
-        }
+    - names containing the vendor are found with str.find over all names
+      joined by newlines (normalized names never contain one), and
+    - names contained in the vendor are found by an Aho-Corasick automaton
+      over the names, in one pass over the vendor's characters.
     
-    best_match: Optional[Dict[str, Any]] = None
-    best_score = 0.0
+    It also keeps token postings so shared-token counts only touch suppliers
+    that actually share a token with the vendor.
+    """
+    
+    __slots__ = (
+        "names", "_columns", "_empty", "_haystack", "_starts", "_goto", "_fail",
+        "_output", "_postings", "token_counts",
+    )
     
-    for supplier in suppliers:
-        supplier_name = supplier.get("name", "")
-        if not supplier_name:
-            continue
+    def __init__(self, supplier_names: Tuple[str, ...]) -> None:
+        names = tuple(_normalize_for_matching(name) for name in supplier_names)
+        self.names = names
+        token_sets = [_token_set(name) for name in names]
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for column, tokens in enumerate(token_sets):
+            for token in tokens:
+                postings[token].append(column)
+        self._postings = {
+            token: np.array(columns, dtype=np.intp) for token, columns in postings.items()
+        }
+        self.token_counts = np.array([len(tokens) for tokens in token_sets], dtype=np.float64)
+        
+        self._columns: Dict[str, List[int]] = defaultdict(list)
+        for column, name in enumerate(names):
+            self._columns[name].append(column)
+        # Columns whose normalized name is empty are contained in anything
+        self._empty = self._columns.pop("", [])
+        
+        self._haystack = "\n".join(names)
+        self._starts: List[int] = []
+        offset = 0
+        for name in names:
+            self._starts.append(offset)
+            offset += len(name) + 1
+        
+        # Aho-Corasick trie: goto transitions, and per state the patterns
+        # ending there (including those reached through failure links)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._output: List[List[str]] = [[]]
+        for name in self._columns:
+            state = 0
+            for char in name:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(name)
+        
+        fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                fail[next_state] = target if target != next_state else 0
+                self._output[next_state].extend(self._output[fail[next_state]])
+        self._fail = fail
+    
+    def common_tokens(self, vendor_tokens: FrozenSet[str]) -> np.ndarray:
+        """Number of distinct tokens each supplier shares with the vendor."""
+        common = np.zeros(len(self._starts))
+        for token in vendor_tokens:
+            columns = self._postings.get(token)
+            if columns is not None:
+                common[columns] += 1.0
+        return common
+    
+    def overrides(self, vendor: str) -> Dict[int, float]:
+        """Exact (1.0) and containment (0.9) scores for one normalized vendor."""
+        found: Dict[int, float] = {}
+        
+        # Suppliers containing the vendor
+        if vendor:
+            position = self._haystack.find(vendor)
+            while position != -1:
+                found[bisect_right(self._starts, position) - 1] = 0.9
+                position = self._haystack.find(vendor, position + 1)
+        else:
+            found = dict.fromkeys(range(len(self._starts)), 0.9)
+        
+        # Suppliers contained in the vendor
+        for column in self._empty:
+            found[column] = 0.9
+        state = 0
+        for char in vendor:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for name in self._output[state]:
+                for column in self._columns[name]:
+                    found[column] = 0.9
+        
+        # Exact match takes precedence
+        for column in self._columns.get(vendor, ()) if vendor else self._empty:
+            found[column] = 1.0
+        return found
+
+
+@lru_cache(maxsize=32)
+def _supplier_index(supplier_names: Tuple[str, ...]) -> _SupplierIndex:
+    """Containment index for a supplier list, reused while the list is unchanged."""
+    return _SupplierIndex(supplier_names)
+
+
+def _supplier_score_matrix(
+    vendor_names: List[str],
+    supplier_names: Sequence[str],
+    best_only: bool = False,
+) -> np.ndarray:
+    """Score every vendor against every supplier, as _fuzzy_match_score would.
+    
+    The sequence ratios come from a single rapidfuzz cdist call and the token
+    overlap from the supplier index's token postings, so the combined scores
+    are computed without a Python call per pair. Exact and containment matches
+    override the combined score exactly like the pairwise scorer.
+    
+    With best_only, the cheap parts (overrides and token overlap) are scored
+    first and give a floor under every row's best score. cdist then gets a
+    score_cutoff below which a pair cannot reach that floor, so rapidfuzz
+    skips the full computation for hopeless pairs. Those pairs are
+    under-scored, but each row's maximum and its position are unchanged.
+    
+    Args:
+        vendor_names: Vendor names to match (rows)
+        supplier_names: Non-empty supplier names (columns)
+        best_only: Only each row's best score needs to be exact
         
-        score = _fuzzy_match_score(vendor_name, supplier_name)
+    Returns:
+        Array of shape (len(vendor_names), len(supplier_names)) with scores
+        between 0.0 and 1.0
+    """
+    norm_vendors = [_normalize_for_matching(name) for name in vendor_names]
+    vendor_tokens = [_token_set(name) for name in norm_vendors]
+    index = _supplier_index(tuple(supplier_names))
+    norm_suppliers = index.names
+    
+    # Token-based matching: shared unique tokens over the larger token count
+    common_tokens = np.array([index.common_tokens(tokens) for tokens in vendor_tokens])
+    vendor_counts = np.array([len(tokens) for tokens in vendor_tokens], dtype=np.float64)
+    supplier_counts = index.token_counts
+    token_ratio: np.ndarray = np.divide(
+        common_tokens,
+        np.maximum.outer(vendor_counts, supplier_counts),
+        out=np.zeros_like(common_tokens),
+        where=np.outer(vendor_counts > 0, supplier_counts > 0),
+    )
+    
+    # Exact match and one-contains-the-other take precedence
+    overrides = np.zeros_like(token_ratio)
+    for row, norm_vendor in enumerate(norm_vendors):
+        for column, score in index.overrides(norm_vendor).items():
+            overrides[row, column] = score
+    
+    score_cutoff = 0.0
+    if best_only:
+        # A pair needs 0.6 * seq + 0.4 * token > floor and token <= 1, so any
+        # sequence ratio under (floor - 0.4) / 0.6 cannot win its row. cdist
+        # turns the cutoff into an edit distance with some rounding, so keep
+        # a full point of margin to never prune a tie or a near-tie.
+        floor = float(np.maximum(overrides, token_ratio * 0.4).max(axis=1).min())
+        score_cutoff = max(0.0, (floor - 0.4) / 0.6 * 100.0 - 1.0)
+    
+    # Sequence matching
+    seq_ratio: np.ndarray = process.cdist(
+        norm_vendors,
+        norm_suppliers,
+        scorer=fuzz.ratio,
+        score_cutoff=score_cutoff,
+        dtype=np.float64,
+        workers=_cdist_workers(len(norm_vendors), len(norm_suppliers)),
+    ) / 100.0
+    
+    # Combine scores with weights
+    scores = (seq_ratio * 0.6) + (token_ratio * 0.4)
+    return np.where(overrides > 0.0, overrides, scores)
+
+
+def identify_suppliers_batch(
+    vendor_names: List[str],
+    suppliers: List[Dict[str, Any]],
+    threshold: float = 0.6,
+) -> List[Dict[str, Any]]:
+    """Match several vendor names to existing suppliers in one pass.
+    
+    Same scoring and result shape as identify_supplier, but the whole
+    vendor x supplier score matrix is built at once, which is much cheaper
+    when a document (or a backlog of documents) yields many vendor names.
+    
+    Args:
+        vendor_names: Vendor names extracted from documents
+        suppliers: List of supplier dictionaries with keys: key, name
+        threshold: Minimum score threshold for a match (default: 0.6)
         
-        if score > best_score:
-            best_score = score
-            best_match = supplier
+    Returns:
+        One result dictionary per vendor name, in input order, each with
+        key, name, score and matched
+    """
+    no_match = {"key": "", "name": "", "score": 0.0, "matched": False}
     
-    # Check if best match meets threshold
-    if best_match is not None and best_score >= threshold:
-        result = {
-            "key": best_match.get("key", ""),
-            "name": best_match.get("name", ""),
-            "score": round(best_score, 3),
-            "matched": True,
-        }
-        logger.info(
-            f"Identified supplier '{result['name']}' "
-            f"with score {result['score']:.3f}"
-        )
-    else:
-        result = {
-            "key": "",
-            "name": "",
-            "score": round(best_score, 3) if best_score > 0 else 0.0,
-            "matched": False,
-        }
-        logger.info(
-            f"No supplier match found above threshold {threshold} "
-            f"(best score: {best_score:.3f})"
-        )
+    if not suppliers:
+        logger.warning("No suppliers provided for identification")
+        return [dict(no_match) for _ in vendor_names]
+    
+    candidates, supplier_names = _named_records(suppliers)
+    rows = [
+        index for index, name in enumerate(vendor_names)
+        if name and name.strip()
+    ]
+    if len(rows) < len(vendor_names):
+        logger.warning("Empty vendor name provided for identification")
     
-    return result
+    results = [dict(no_match) for _ in vendor_names]
+    if not candidates or not rows:
+        return results
+    
+    scores = _supplier_score_matrix(
+        [vendor_names[index] for index in rows],
+        supplier_names,
+        best_only=True,
+    )
+    best_columns = scores.argmax(axis=1)
+    
+    for row, index in enumerate(rows):
+        # Decide on the reported (rounded) score so callers comparing it
+        # against the threshold see the same outcome
+        raw_score = float(scores[row, best_columns[row]])
+        best_score = round(raw_score, 3)
+        best_match = candidates[best_columns[row]]
+        
+        # Check if best match meets threshold (a zero score never matches)
+        if raw_score > 0.0 and best_score >= threshold:
+            results[index] = {
+                "key": best_match.get("key", ""),
+                "name": best_match.get("name", ""),
+                "score": best_score,
+                "matched": True,
+            }
+            logger.info(
+                f"Identified supplier '{results[index]['name']}' "
+                f"with score {best_score:.3f}"
+            )
+        else:
+            results[index]["score"] = best_score
+            logger.info(
+                f"No supplier match found above threshold {threshold} "
+                f"(best score: {best_score:.3f})"
+            )
+    
+    return results
 
 
 # =============================================================================
@@ -1215,8 +2007,7 @@ async def create_expense_claim(
     logger.info(f"Creating expense claim for company {company_id}, {len(lines)} lines")
     
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         
         # Build the expense claim line items
         claim_lines = []
@@ -1316,8 +2107,7 @@ async def create_purchase_invoice(
     logger.info(f"Creating purchase invoice for company {company_id}, supplier {supplier_key}")
     
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         
         # Build the purchase invoice line items
         invoice_lines = []
@@ -1411,8 +2201,7 @@ async def amend_entry(
     logger.info(f"Amending {entry_type} {entry_key} for company {company_id}")
     
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         
         # Map entry type to Manager.io endpoint type
         if entry_type == "expense_claim":
@@ -1465,6 +2254,20 @@ async def amend_entry(
         }
 
 
+_MONEY = Decimal("0.01")
+
+
+def _convert_amount(amount: float, exchange_rate: float) -> float:
+    """Convert ``amount`` at ``exchange_rate``, rounded half-up to cents.
+    
+    Both values go through ``str`` into Decimal so the product is exact;
+    ``round(amount * rate, 2)`` on floats can land a cent low on halves
+    (e.g. 1.005 * 1 -> 1.0).
+    """
+    converted = Decimal(str(amount)) * Decimal(str(exchange_rate))
+    return float(converted.quantize(_MONEY, rounding=ROUND_HALF_UP))
+
+
 @tool
 def handle_forex(
     amount: float,
@@ -1514,7 +2317,7 @@ def handle_forex(
     
     # If exchange rate provided, use it
     if exchange_rate is not None and exchange_rate > 0:
-        converted_amount = round(amount * exchange_rate, 2)
+        converted_amount = _convert_amount(amount, exchange_rate)
         return {
             "original_amount": amount,
             "original_currency": from_currency,
@@ -1576,8 +2379,7 @@ async def create_payment(
     logger.info(f"Creating payment for company {company_id}, {len(lines)} lines")
     
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         
         payment_lines = [
             PaymentLine(
@@ -1642,8 +2444,7 @@ async def create_receipt(
     logger.info(f"Creating receipt for company {company_id}, {len(lines)} lines")
     
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         
         receipt_lines = [
             ReceiptLine(
@@ -1708,8 +2509,7 @@ async def create_sales_invoice(
     logger.info(f"Creating sales invoice for company {company_id}, customer {customer_key}")
     
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         
         invoice_lines = [
             SalesInvoiceLine(
@@ -1772,8 +2572,7 @@ async def create_journal_entry(
     logger.info(f"Creating journal entry for company {company_id}, {len(lines)} lines")
     
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         
         entry_lines = [
             JournalEntryLine(
@@ -1836,8 +2635,7 @@ async def create_transfer(
     logger.info(f"Creating transfer for company {company_id}, amount {amount}")
     
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         
         transfer_data = InterAccountTransferData(
             date=date,
@@ -1895,8 +2693,7 @@ async def delete_entry(
         return {"success": False, "message": f"Unknown entry type: {entry_type}"}
     
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         result = await client.delete_entry(api_entry_type, entry_key)
         return {"success": result.success, "message": result.message}
     except CompanyNotFoundError:
@@ -1931,8 +2728,7 @@ async def get_balance_sheet(
     logger.info(f"Fetching balance sheet for company {company_id}")
     
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         data = await client.get_balance_sheet(as_of_date)
         return {"success": True, "report_type": "balance_sheet", "as_of_date": as_of_date, "data": data}
     except CompanyNotFoundError:
@@ -1964,8 +2760,7 @@ async def get_profit_and_loss(
     logger.info(f"Fetching P&L for company {company_id}")
     
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         data = await client.get_profit_and_loss(from_date, to_date)
         return {"success": True, "report_type": "profit_and_loss", "from_date": from_date, "to_date": to_date, "data": data}
     except CompanyNotFoundError:
@@ -1995,8 +2790,7 @@ async def get_trial_balance(
     logger.info(f"Fetching trial balance for company {company_id}")
     
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         data = await client.get_trial_balance(as_of_date)
         return {"success": True, "report_type": "trial_balance", "as_of_date": as_of_date, "data": data}
     except CompanyNotFoundError:
@@ -2012,8 +2806,7 @@ async def get_aged_receivables(company_id: str, user_id: str) -> Dict[str, Any]:
     """Fetch aged receivables report from Manager.io. Shows outstanding customer invoices by age."""
     logger.info(f"Fetching aged receivables for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         data = await client.get_aged_receivables()
         return {"success": True, "report_type": "aged_receivables", "data": data}
     except (CompanyNotFoundError, ManagerIOError, Exception) as e:
@@ -2025,14 +2818,90 @@ async def get_aged_payables(company_id: str, user_id: str) -> Dict[str, Any]:
     """Fetch aged payables report from Manager.io. Shows outstanding supplier invoices by age."""
     logger.info(f"Fetching aged payables for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         data = await client.get_aged_payables()
         return {"success": True, "report_type": "aged_payables", "data": data}
     except (CompanyNotFoundError, ManagerIOError, Exception) as e:
         return {"success": False, "report_type": "aged_payables", "message": str(e)}
 
 
+def _report_result(report_type: str, outcome: Any, **fields: Any) -> Dict[str, Any]:
+    """Shape one report fetch (data or raised exception) like the report tools."""
+    if isinstance(outcome, CompanyNotFoundError):
+        return {"success": False, "report_type": report_type, "message": f"Company not found: {outcome}"}
+    if isinstance(outcome, ManagerIOError):
+        return {"success": False, "report_type": report_type, "message": f"Manager.io API error: {outcome}"}
+    if isinstance(outcome, BaseException):
+        return {"success": False, "report_type": report_type, "message": f"Unexpected error: {outcome}"}
+    return {"success": True, "report_type": report_type, **fields, "data": outcome}
+
+
+@tool
+async def get_financial_snapshot(
+    company_id: str,
+    user_id: str,
+    as_of_date: Optional[str] = None,
+    from_date: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Fetch the main financial reports from Manager.io in one call.
+    
+    Prefer this over calling the individual report tools when a financial
+    summary is needed. The balance sheet, profit and loss, trial balance and
+    aged receivables/payables are fetched concurrently; a failing report is
+    returned with success False without failing the others.
+    
+    Args:
+        company_id: The company configuration ID
+        user_id: The user ID for access control
+        as_of_date: Optional date in YYYY-MM-DD format (defaults to today)
+        from_date: Optional profit and loss start date in YYYY-MM-DD format
+        
+    Returns:
+        Dictionary of reports keyed by report type, each shaped like the
+        matching report tool's result
+    """
+    logger.info(f"Fetching financial snapshot for company {company_id}")
+    
+    try:
+        client = await get_tool_client(company_id, user_id)
+    except CompanyNotFoundError:
+        return {"success": False, "report_type": "financial_snapshot", "message": f"Company not found: {company_id}"}
+    except Exception as e:
+        return {"success": False, "report_type": "financial_snapshot", "message": f"Unexpected error: {e}"}
+    
+    outcomes = await asyncio.gather(
+        client.get_balance_sheet(as_of_date),
+        client.get_profit_and_loss(from_date, as_of_date),
+        client.get_trial_balance(as_of_date),
+        client.get_aged_receivables(),
+        client.get_aged_payables(),
+        return_exceptions=True,
+    )
+    (
+        balance_sheet, profit_and_loss, trial_balance,
+        aged_receivables, aged_payables,
+    ) = outcomes
+    reports = {
+        "balance_sheet": _report_result(
+            "balance_sheet", balance_sheet, as_of_date=as_of_date,
+        ),
+        "profit_and_loss": _report_result(
+            "profit_and_loss", profit_and_loss, from_date=from_date, to_date=as_of_date,
+        ),
+        "trial_balance": _report_result(
+            "trial_balance", trial_balance, as_of_date=as_of_date,
+        ),
+        "aged_receivables": _report_result("aged_receivables", aged_receivables),
+        "aged_payables": _report_result("aged_payables", aged_payables),
+    }
+    return {
+        "success": all(report["success"] for report in reports.values()),
+        "report_type": "financial_snapshot",
+        "as_of_date": as_of_date,
+        "reports": reports,
+    }
+
+
 # =============================================================================
 # Bank Account & Reference Data Tools
 # =============================================================================
@@ -2043,8 +2912,7 @@ async def get_bank_accounts(company_id: str, user_id: str) -> List[Dict[str, Any
     """Fetch bank and cash accounts from Manager.io with their current balances."""
     logger.info(f"Fetching bank accounts for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         accounts = await client.get_bank_accounts()
         return [{"key": a.get("Key", a.get("key", "")), 
                  "name": a.get("Name", a.get("name", "")), 
@@ -2061,8 +2929,7 @@ async def get_employees(company_id: str, user_id: str) -> List[Dict[str, Any]]:
     """Fetch employees from Manager.io. Useful for expense claims where you need to specify who paid."""
     logger.info(f"Fetching employees for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         employees = await client.get_employees()
         return [{"key": e.get("Key", e.get("key", "")), "name": e.get("Name", e.get("name", ""))} for e in employees]
     except (CompanyNotFoundError, ManagerIOError) as e:
@@ -2091,8 +2958,7 @@ async def get_credit_notes(
     """
     logger.info(f"Fetching credit notes for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         response = await client.get_credit_notes(skip=0, take=limit)
         return [
             {
@@ -2133,8 +2999,7 @@ async def get_inventory_items(company_id: str, user_id: str) -> List[Dict[str, A
     """
     logger.info(f"Fetching inventory items for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         items = await client.get_inventory_items()
         return [
             {
@@ -2173,8 +3038,7 @@ async def get_inventory_kits(company_id: str, user_id: str) -> List[Dict[str, An
     """
     logger.info(f"Fetching inventory kits for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         kits = await client.get_inventory_kits()
         return [
             {
@@ -2199,8 +3063,7 @@ async def get_debit_notes(company_id: str, user_id: str, limit: int = 50) -> Lis
     """
     logger.info(f"Fetching debit notes for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         response = await client.get_debit_notes(skip=0, take=limit)
         return [
             {
@@ -2227,8 +3090,7 @@ async def get_sales_invoices(company_id: str, user_id: str, limit: int = 50) ->
     """
     logger.info(f"Fetching sales invoices for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         response = await client.get_sales_invoices(skip=0, take=limit)
         return [
             {
@@ -2257,8 +3119,7 @@ async def get_purchase_invoices(company_id: str, user_id: str, limit: int = 50)
     """
     logger.info(f"Fetching purchase invoices for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         response = await client.get_purchase_invoices(skip=0, take=limit)
         return [
             {
@@ -2284,8 +3145,7 @@ async def get_sales_orders(company_id: str, user_id: str, limit: int = 50) -> Li
     """Fetch sales orders from Manager.io."""
     logger.info(f"Fetching sales orders for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         response = await client.get_sales_orders(skip=0, take=limit)
         return [
             {
@@ -2310,8 +3170,7 @@ async def get_purchase_orders(company_id: str, user_id: str, limit: int = 50) ->
     """Fetch purchase orders from Manager.io."""
     logger.info(f"Fetching purchase orders for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         response = await client.get_purchase_orders(skip=0, take=limit)
         return [
             {
@@ -2336,8 +3195,7 @@ async def get_goods_receipts(company_id: str, user_id: str, limit: int = 50) ->
     """Fetch goods receipts from Manager.io. Records inventory received from suppliers."""
     logger.info(f"Fetching goods receipts for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         response = await client.get_goods_receipts(skip=0, take=limit)
         return [
             {
@@ -2360,8 +3218,7 @@ async def get_delivery_notes(company_id: str, user_id: str, limit: int = 50) ->
     """Fetch delivery notes from Manager.io. Records inventory shipped to customers."""
     logger.info(f"Fetching delivery notes for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         response = await client.get_delivery_notes(skip=0, take=limit)
         return [
             {
@@ -2384,8 +3241,7 @@ async def get_tax_codes(company_id: str, user_id: str) -> List[Dict[str, Any]]:
     """Fetch tax codes from Manager.io. Used for applying correct tax rates to transactions."""
     logger.info(f"Fetching tax codes for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         codes = await client.get_tax_codes()
         return [{"key": c.get("Key", c.get("key", "")), "name": c.get("Name", c.get("name", ""))} for c in codes]
     except (CompanyNotFoundError, ManagerIOError) as e:
@@ -2398,8 +3254,7 @@ async def get_fixed_assets(company_id: str, user_id: str) -> List[Dict[str, Any]
     """Fetch fixed assets from Manager.io. Tracks property, equipment, vehicles, etc."""
     logger.info(f"Fetching fixed assets for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         assets = await client.get_fixed_assets()
         return [
             {
@@ -2424,8 +3279,7 @@ async def get_projects(company_id: str, user_id: str) -> List[Dict[str, Any]]:
     """Fetch projects from Manager.io. Tracks income and expenses by project."""
     logger.info(f"Fetching projects for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         projects = await client.get_projects()
         return [
             {
@@ -2469,8 +3323,7 @@ async def create_credit_note(
     """
     logger.info(f"Creating credit note for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         
         payload = {
             "Date": date,
@@ -2521,8 +3374,7 @@ async def create_debit_note(
     """
     logger.info(f"Creating debit note for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         
         payload = {
             "Date": date,
@@ -2580,8 +3432,7 @@ async def create_goods_receipt(
     """
     logger.info(f"Creating goods receipt for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         
         payload = {
             "Date": date,
@@ -2631,8 +3482,7 @@ async def create_inventory_write_off(
     """
     logger.info(f"Creating inventory write-off for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         
         payload = {
             "Date": date,
@@ -2681,8 +3531,7 @@ async def create_inventory_transfer(
     """
     logger.info(f"Creating inventory transfer for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         
         payload = {
             "Date": date,
@@ -2717,8 +3566,7 @@ async def get_investments(company_id: str, user_id: str) -> List[Dict[str, Any]]
     """
     logger.info(f"Fetching investments for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         investments = await client.get_investments()
         return [
             {
@@ -2743,8 +3591,7 @@ async def get_investment_transactions(company_id: str, user_id: str, limit: int
     """
     logger.info(f"Fetching investment transactions for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         response = await client.get_investment_transactions(skip=0, take=limit)
         return [
             {
@@ -2771,8 +3618,7 @@ async def get_investment_market_prices(company_id: str, user_id: str) -> List[Di
     """
     logger.info(f"Fetching investment market prices for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         prices = await client.get_investment_market_prices()
         return [
             {
@@ -2806,8 +3652,7 @@ async def create_investment(
     """
     logger.info(f"Creating investment for company {company_id}")
     try:
-        context = get_tool_context()
-        client = await context.get_manager_io_client(company_id, user_id)
+        client = await get_tool_client(company_id, user_id)
         
         payload = {"Name": name}
         if code:
@@ -2883,6 +3728,7 @@ SUBMISSION_TOOLS = [
 
 # List of all report tools
 REPORT_TOOLS = [
+    get_financial_snapshot,
     get_balance_sheet,
     get_profit_and_loss,
     get_trial_balance,
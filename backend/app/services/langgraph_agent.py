@@ -17,6 +17,7 @@ from datetime import datetime, timezone
 from enum import Enum
 from typing import Annotated, Any, Dict, List, Literal, Optional, Sequence, TypedDict, Union
 
+import orjson
 from langchain_core.messages import (
     AIMessage,
     BaseMessage,
@@ -31,6 +32,7 @@ from langgraph.graph import END, StateGraph
 from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode
 from pydantic import BaseModel, Field
+from rapidfuzz import fuzz
 
 from app.core.config import settings
 from app.services.ocr import OCRService
@@ -43,6 +45,18 @@ logger = logging.getLogger(__name__)
 # =============================================================================
 
 
+def _dump_json(value: Any, indent: bool = True) -> str:
+    """Serialize a tool result for the model with orjson.
+    
+    Non-ASCII text is kept as-is rather than escaped, and values orjson
+    cannot encode natively fall back to ``str``.
+    """
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(value, default=str, option=option).decode()
+
+
 def strip_thinking_tags(text: str) -> str:
     """Remove thinking content from LLM responses.
     
@@ -172,11 +186,11 @@ def create_data_tools(
     async def get_chart_of_accounts() -> str:
         """Get chart of accounts with key, name, code."""
         if accounts:
-            return json.dumps(accounts[:100], indent=2)
+            return _dump_json(accounts[:100])
         if manager_client:
             try:
                 accts = await manager_client.get_chart_of_accounts()
-                return json.dumps([{"key": a.key, "name": a.name, "code": a.code} for a in accts][:100], indent=2)
+                return _dump_json([{"key": a.key, "name": a.name, "code": a.code} for a in accts][:100])
             except Exception as e:
                 return f"Error: {e}"
         return "No data available"
@@ -185,11 +199,11 @@ def create_data_tools(
     async def get_suppliers() -> str:
         """Get suppliers list with key and name."""
         if suppliers:
-            return json.dumps(suppliers[:100], indent=2)
+            return _dump_json(suppliers[:100])
         if manager_client:
             try:
                 sups = await manager_client.get_suppliers()
-                return json.dumps([{"key": s.key, "name": s.name} for s in sups][:100], indent=2)
+                return _dump_json([{"key": s.key, "name": s.name} for s in sups][:100])
             except Exception as e:
                 return f"Error: {e}"
         return "No data available"
@@ -200,7 +214,7 @@ def create_data_tools(
         if manager_client:
             try:
                 custs = await manager_client.get_customers()
-                return json.dumps([{"key": c.key, "name": c.name} for c in custs][:100], indent=2)
+                return _dump_json([{"key": c.key, "name": c.name} for c in custs][:100])
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -211,7 +225,7 @@ def create_data_tools(
         if manager_client:
             try:
                 banks = await manager_client.get_bank_accounts()
-                return json.dumps(banks[:50], indent=2)
+                return _dump_json(banks[:50])
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -222,7 +236,7 @@ def create_data_tools(
         if manager_client:
             try:
                 emps = await manager_client.get_employees()
-                return json.dumps([{"key": e.get("Key"), "name": e.get("Name")} for e in emps][:50], indent=2)
+                return _dump_json([{"key": e.get("Key"), "name": e.get("Name")} for e in emps][:50])
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -233,7 +247,7 @@ def create_data_tools(
         if manager_client:
             try:
                 codes = await manager_client.get_tax_codes()
-                return json.dumps(codes[:30], indent=2)
+                return _dump_json(codes[:30])
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -244,7 +258,7 @@ def create_data_tools(
         if manager_client:
             try:
                 projects = await manager_client.get_projects()
-                return json.dumps(projects[:50], indent=2)
+                return _dump_json(projects[:50])
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -255,7 +269,7 @@ def create_data_tools(
         if manager_client:
             try:
                 assets = await manager_client.get_fixed_assets()
-                return json.dumps(assets[:50], indent=2)
+                return _dump_json(assets[:50])
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -331,7 +345,7 @@ def create_data_tools(
             "last_month": last_month_date.strftime("%Y-%m"),
         }
         
-        return json.dumps(context, indent=2)
+        return _dump_json(context)
     
     return [get_chart_of_accounts, get_suppliers, get_customers, get_bank_accounts, 
             get_employees, get_tax_codes, get_projects, get_fixed_assets, get_current_context]
@@ -348,7 +362,7 @@ def create_report_tools(manager_client=None) -> List[BaseTool]:
         if manager_client:
             try:
                 report = await manager_client.get_balance_sheet(as_of_date)
-                return json.dumps(report, indent=2) if report else "No data"
+                return _dump_json(report) if report else "No data"
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -360,7 +374,7 @@ def create_report_tools(manager_client=None) -> List[BaseTool]:
         if manager_client:
             try:
                 report = await manager_client.get_profit_and_loss(from_date, to_date)
-                return json.dumps(report, indent=2) if report else "No data"
+                return _dump_json(report) if report else "No data"
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -372,7 +386,7 @@ def create_report_tools(manager_client=None) -> List[BaseTool]:
         if manager_client:
             try:
                 report = await manager_client.get_trial_balance(as_of_date)
-                return json.dumps(report, indent=2) if report else "No data"
+                return _dump_json(report) if report else "No data"
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -384,7 +398,7 @@ def create_report_tools(manager_client=None) -> List[BaseTool]:
         if manager_client:
             try:
                 report = await manager_client.get_general_ledger_summary(from_date, to_date)
-                return json.dumps(report, indent=2) if report else "No data"
+                return _dump_json(report) if report else "No data"
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -396,7 +410,7 @@ def create_report_tools(manager_client=None) -> List[BaseTool]:
         if manager_client:
             try:
                 report = await manager_client.get_cash_flow_statement(from_date, to_date)
-                return json.dumps(report, indent=2) if report else "No data"
+                return _dump_json(report) if report else "No data"
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -407,7 +421,7 @@ def create_report_tools(manager_client=None) -> List[BaseTool]:
         if manager_client:
             try:
                 report = await manager_client.get_aged_receivables()
-                return json.dumps(report, indent=2) if report else "No data"
+                return _dump_json(report) if report else "No data"
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -418,7 +432,7 @@ def create_report_tools(manager_client=None) -> List[BaseTool]:
         if manager_client:
             try:
                 report = await manager_client.get_aged_payables()
-                return json.dumps(report, indent=2) if report else "No data"
+                return _dump_json(report) if report else "No data"
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -429,7 +443,7 @@ def create_report_tools(manager_client=None) -> List[BaseTool]:
         if manager_client:
             try:
                 report = await manager_client.get_trial_balance()
-                return json.dumps(report, indent=2) if report else "No data"
+                return _dump_json(report) if report else "No data"
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -502,7 +516,7 @@ def create_transaction_tools(manager_client=None) -> List[BaseTool]:
                 except: pass
                 # Sort by date descending
                 txns.sort(key=lambda x: x.get("date", ""), reverse=True)
-                return json.dumps(txns[:limit], indent=2)
+                return _dump_json(txns[:limit])
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -519,7 +533,7 @@ def create_transaction_tools(manager_client=None) -> List[BaseTool]:
             try:
                 payments = await manager_client.get_payments(skip=0, take=limit)
                 formatted = [format_payment(p) for p in payments.items[:limit]]
-                return json.dumps(formatted, indent=2)
+                return _dump_json(formatted)
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -536,7 +550,7 @@ def create_transaction_tools(manager_client=None) -> List[BaseTool]:
             try:
                 receipts = await manager_client.get_receipts(skip=0, take=limit)
                 formatted = [format_receipt(r) for r in receipts.items[:limit]]
-                return json.dumps(formatted, indent=2)
+                return _dump_json(formatted)
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -564,7 +578,7 @@ def create_transaction_tools(manager_client=None) -> List[BaseTool]:
                         "description": c.get("description") or c.get("Description"),
                         "amount": format_amount(c.get("amount") or c.get("Amount")),
                     })
-                return json.dumps(formatted, indent=2)
+                return _dump_json(formatted)
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -593,7 +607,7 @@ def create_transaction_tools(manager_client=None) -> List[BaseTool]:
                         "balance_due": format_amount(inv.get("balanceDue") or inv.get("BalanceDue")),
                         "status": inv.get("status") or inv.get("Status"),
                     })
-                return json.dumps(formatted, indent=2)
+                return _dump_json(formatted)
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -622,7 +636,7 @@ def create_transaction_tools(manager_client=None) -> List[BaseTool]:
                         "balance_due": format_amount(inv.get("balanceDue") or inv.get("BalanceDue")),
                         "status": inv.get("status") or inv.get("Status"),
                     })
-                return json.dumps(formatted, indent=2)
+                return _dump_json(formatted)
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -633,7 +647,7 @@ def create_transaction_tools(manager_client=None) -> List[BaseTool]:
         if manager_client:
             try:
                 notes = await manager_client.get_credit_notes(skip=0, take=limit)
-                return json.dumps(notes.items[:limit], indent=2)
+                return _dump_json(notes.items[:limit])
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -644,7 +658,7 @@ def create_transaction_tools(manager_client=None) -> List[BaseTool]:
         if manager_client:
             try:
                 notes = await manager_client.get_debit_notes(skip=0, take=limit)
-                return json.dumps(notes.items[:limit], indent=2)
+                return _dump_json(notes.items[:limit])
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -655,7 +669,7 @@ def create_transaction_tools(manager_client=None) -> List[BaseTool]:
         if manager_client:
             try:
                 orders = await manager_client.get_sales_orders(skip=0, take=limit)
-                return json.dumps(orders.items[:limit], indent=2)
+                return _dump_json(orders.items[:limit])
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -666,7 +680,7 @@ def create_transaction_tools(manager_client=None) -> List[BaseTool]:
         if manager_client:
             try:
                 orders = await manager_client.get_purchase_orders(skip=0, take=limit)
-                return json.dumps(orders.items[:limit], indent=2)
+                return _dump_json(orders.items[:limit])
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -686,7 +700,7 @@ def create_inventory_tools(manager_client=None) -> List[BaseTool]:
         if manager_client:
             try:
                 items = await manager_client.get_inventory_items()
-                return json.dumps(items[:50], indent=2)
+                return _dump_json(items[:50])
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -697,7 +711,7 @@ def create_inventory_tools(manager_client=None) -> List[BaseTool]:
         if manager_client:
             try:
                 kits = await manager_client.get_inventory_kits()
-                return json.dumps(kits[:50], indent=2)
+                return _dump_json(kits[:50])
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -708,7 +722,7 @@ def create_inventory_tools(manager_client=None) -> List[BaseTool]:
         if manager_client:
             try:
                 receipts = await manager_client.get_goods_receipts(skip=0, take=limit)
-                return json.dumps(receipts.items[:limit], indent=2)
+                return _dump_json(receipts.items[:limit])
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -719,7 +733,7 @@ def create_inventory_tools(manager_client=None) -> List[BaseTool]:
         if manager_client:
             try:
                 notes = await manager_client.get_delivery_notes(skip=0, take=limit)
-                return json.dumps(notes.items[:limit], indent=2)
+                return _dump_json(notes.items[:limit])
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -742,7 +756,7 @@ def create_inventory_tools(manager_client=None) -> List[BaseTool]:
                 "Lines": [{"Item": i["item_key"], "Qty": i["qty"]} for i in item_list]
             }
             result = await manager_client.create_goods_receipt(data)
-            return f"Created goods receipt: {json.dumps(result)}"
+            return f"Created goods receipt: {_dump_json(result, indent=False)}"
         except Exception as e:
             return f"Error: {e}"
     
@@ -764,7 +778,7 @@ def create_inventory_tools(manager_client=None) -> List[BaseTool]:
                 "Lines": [{"Item": i["item_key"], "Qty": i["qty"]} for i in item_list]
             }
             result = await manager_client.create_inventory_write_off(data)
-            return f"Created write-off: {json.dumps(result)}"
+            return f"Created write-off: {_dump_json(result, indent=False)}"
         except Exception as e:
             return f"Error: {e}"
     
@@ -788,7 +802,7 @@ def create_inventory_tools(manager_client=None) -> List[BaseTool]:
                 "Lines": [{"Item": i["item_key"], "Qty": i["qty"]} for i in item_list]
             }
             result = await manager_client.create_inventory_transfer(data)
-            return f"Created transfer: {json.dumps(result)}"
+            return f"Created transfer: {_dump_json(result, indent=False)}"
         except Exception as e:
             return f"Error: {e}"
     
@@ -807,7 +821,7 @@ def create_investment_tools(manager_client=None) -> List[BaseTool]:
         if manager_client:
             try:
                 investments = await manager_client.get_investments()
-                return json.dumps(investments[:50], indent=2)
+                return _dump_json(investments[:50])
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -818,7 +832,7 @@ def create_investment_tools(manager_client=None) -> List[BaseTool]:
         if manager_client:
             try:
                 txns = await manager_client.get_investment_transactions(skip=0, take=limit)
-                return json.dumps(txns.items[:limit], indent=2)
+                return _dump_json(txns.items[:limit])
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -829,7 +843,7 @@ def create_investment_tools(manager_client=None) -> List[BaseTool]:
         if manager_client:
             try:
                 prices = await manager_client.get_investment_market_prices()
-                return json.dumps(prices[:50], indent=2)
+                return _dump_json(prices[:50])
             except Exception as e:
                 return f"Error: {e}"
         return "Client not configured"
@@ -848,7 +862,7 @@ def create_investment_tools(manager_client=None) -> List[BaseTool]:
             if code:
                 data["Code"] = code
             result = await manager_client.create_investment(data)
-            return f"Created investment account: {json.dumps({'success': result.success, 'key': result.key, 'message': result.message})}"
+            return f"Created investment account: {_dump_json({'success': result.success, 'key': result.key, 'message': result.message}, indent=False)}"
         except Exception as e:
             return f"Error: {e}"
     
@@ -863,14 +877,14 @@ def create_investment_tools(manager_client=None) -> List[BaseTool]:
         Args: amount, from_currency (e.g., USD), to_currency (e.g., EUR), exchange_rate (optional, will use 1.0 if not provided)"""
         rate = exchange_rate or 1.0
         converted = amount * rate
-        return json.dumps({
+        return _dump_json({
             "original_amount": amount,
             "from_currency": from_currency,
             "to_currency": to_currency,
             "exchange_rate": rate,
             "converted_amount": round(converted, 2),
             "note": "Exchange rate should be verified with current market rates" if not exchange_rate else None
-        }, indent=2)
+        })
     
     return [get_investments, get_investment_transactions, get_investment_market_prices,
             create_investment_account, handle_forex]
@@ -975,7 +989,7 @@ def create_generic_api_tool(manager_client=None) -> BaseTool:
                 params=params_dict,
                 data=data_dict,
             )
-            return json.dumps(result, indent=2, default=str)
+            return _dump_json(result)
         except json.JSONDecodeError as e:
             return f"Error parsing JSON: {e}. Make sure params and data are valid JSON strings like '{{}}' not {{}}"
         except Exception as e:
@@ -991,7 +1005,6 @@ def create_document_tools(
 ) -> List[BaseTool]:
     """Tools for document processing and matching."""
     from langchain_core.tools import tool
-    from difflib import SequenceMatcher
     
     tools = []
     
@@ -1009,12 +1022,12 @@ def create_document_tools(
             if name_lower in sname or sname in name_lower:
                 matches.append({"key": s.get("key"), "name": s.get("name"), "score": 0.9})
             else:
-                score = SequenceMatcher(None, name_lower, sname).ratio()
+                score = fuzz.ratio(name_lower, sname) / 100.0
                 if score > 0.4:
                     matches.append({"key": s.get("key"), "name": s.get("name"), "score": round(score, 2)})
         
         matches.sort(key=lambda x: x["score"], reverse=True)
-        return json.dumps(matches[:5], indent=2)
+        return _dump_json(matches[:5])
     
     @tool
     def search_account(description: str) -> str:
@@ -1031,14 +1044,14 @@ def create_document_tools(
             name_lower = a.get("name", "").lower()
             kw_matches = sum(1 for k in keywords if k in name_lower)
             score = kw_matches / len(keywords) if keywords else 0
-            seq_score = SequenceMatcher(None, desc_lower, name_lower).ratio()
+            seq_score = fuzz.ratio(desc_lower, name_lower) / 100.0
             final = max(score, seq_score)
             
             if final > 0.3:
                 matches.append({"key": a.get("key"), "name": a.get("name"), "code": a.get("code"), "score": round(final, 2)})
         
         matches.sort(key=lambda x: x["score"], reverse=True)
-        return json.dumps(matches[:5], indent=2)
+        return _dump_json(matches[:5])
     
     @tool
     def classify_document(ocr_text: str) -> str:
@@ -1092,7 +1105,7 @@ def create_document_tools(
         if lines:
             result["vendor"] = lines[0][:50]
         
-        return json.dumps(result, indent=2)
+        return _dump_json(result)
     
     @tool
     def match_vendor_to_supplier(vendor_name: str) -> str:
@@ -1100,7 +1113,7 @@ def create_document_tools(
         Args: vendor_name - vendor name from document
         Returns: best matching supplier or suggestion to create new"""
         if not suppliers or not vendor_name:
-            return json.dumps({"matched": False, "suggestion": "No suppliers available"})
+            return _dump_json({"matched": False, "suggestion": "No suppliers available"}, indent=False)
         
         vendor_lower = vendor_name.lower()
         best_match = None
@@ -1109,19 +1122,19 @@ def create_document_tools(
         for s in suppliers:
             sname = s.get("name", "").lower()
             if vendor_lower in sname or sname in vendor_lower:
-                return json.dumps({"matched": True, "supplier": s, "confidence": 0.95})
+                return _dump_json({"matched": True, "supplier": s, "confidence": 0.95}, indent=False)
             
-            score = SequenceMatcher(None, vendor_lower, sname).ratio()
+            score = fuzz.ratio(vendor_lower, sname) / 100.0
             if score > best_score:
                 best_score = score
                 best_match = s
         
         if best_score > 0.6:
-            return json.dumps({"matched": True, "supplier": best_match, "confidence": round(best_score, 2)})
+            return _dump_json({"matched": True, "supplier": best_match, "confidence": round(best_score, 2)}, indent=False)
         elif best_score > 0.4:
-            return json.dumps({"matched": False, "possible_match": best_match, "confidence": round(best_score, 2), 
-                             "suggestion": f"Low confidence match. Confirm if '{best_match.get('name')}' is correct."})
-        return json.dumps({"matched": False, "suggestion": f"No match found for '{vendor_name}'. May need to create new supplier."})
+            return _dump_json({"matched": False, "possible_match": best_match, "confidence": round(best_score, 2), 
+                             "suggestion": f"Low confidence match. Confirm if '{best_match.get('name')}' is correct."}, indent=False)
+        return _dump_json({"matched": False, "suggestion": f"No match found for '{vendor_name}'. May need to create new supplier."}, indent=False)
     
     tools = [search_supplier, search_account, classify_document, extract_document_fields, match_vendor_to_supplier]
     return tools
@@ -1295,7 +1308,7 @@ def create_entry_tools(manager_client=None) -> List[BaseTool]:
                 "instruction": "Select the appropriate employee/director. Return the 'key' UUID.",
                 "employees": all_employees
             }
-            return json.dumps(result, indent=2)
+            return _dump_json(result)
         except Exception as e:
             return f"Error: {e}"
     
@@ -1348,7 +1361,7 @@ def create_entry_tools(manager_client=None) -> List[BaseTool]:
                 "equity_accounts": equity_accounts,
                 "other_accounts": other_accounts,
             }
-            return json.dumps(result, indent=2)
+            return _dump_json(result)
         except Exception as e:
             return f"Error: {e}"
     
@@ -1996,7 +2009,7 @@ def create_entry_tools(manager_client=None) -> List[BaseTool]:
             result = await manager_client.update_entry(api_entry_type, entry_key, update_data)
             # Serialize the UpdateResponse object
             result_dict = {"success": result.success, "message": result.message}
-            return f"Updated entry: {json.dumps(result_dict)}"
+            return f"Updated entry: {_dump_json(result_dict, indent=False)}"
         except json.JSONDecodeError as e:
             return f"Error parsing updates JSON: {e}"
         except Exception as e:
@@ -2055,7 +2068,7 @@ def create_entry_tools(manager_client=None) -> List[BaseTool]:
                 "failed": len(failures),
                 "failures": failures[:10] if failures else [],  # Limit failure details
             }
-            return f"Bulk update complete: {json.dumps(summary)}"
+            return f"Bulk update complete: {_dump_json(summary, indent=False)}"
         except json.JSONDecodeError as e:
             return f"Error parsing updates JSON: {e}"
         except Exception as e:
@@ -2134,7 +2147,7 @@ def create_entry_tools(manager_client=None) -> List[BaseTool]:
                 result["vendor"] = clean[:100]
                 break
         
-        return json.dumps(result, indent=2, ensure_ascii=False)
+        return _dump_json(result)
     
     @tool
     async def get_bank_accounts() -> str:
@@ -2177,7 +2190,7 @@ def create_entry_tools(manager_client=None) -> List[BaseTool]:
                 "instruction": "Select the appropriate bank/cash account. Return the 'key' UUID.",
                 "bank_accounts": all_banks
             }
-            return json.dumps(result, indent=2)
+            return _dump_json(result)
         except Exception as e:
             return f"Error: {e}"
     
@@ -2205,12 +2218,12 @@ def create_entry_tools(manager_client=None) -> List[BaseTool]:
             
             result = await manager_client._post("/supplier-form", data)
             supplier_key = result.get("Key") or result.get("key") if isinstance(result, dict) else None
-            return json.dumps({
+            return _dump_json({
                 "success": True,
                 "supplier_key": supplier_key,
                 "name": name,
                 "message": f"Created supplier '{name}' with key {supplier_key}"
-            }, indent=2)
+            })
         except Exception as e:
             return f"Error creating supplier: {e}"
     
@@ -2238,12 +2251,12 @@ def create_entry_tools(manager_client=None) -> List[BaseTool]:
             
             result = await manager_client._post("/customer-form", data)
             customer_key = result.get("Key") or result.get("key") if isinstance(result, dict) else None
-            return json.dumps({
+            return _dump_json({
                 "success": True,
                 "customer_key": customer_key,
                 "name": name,
                 "message": f"Created customer '{name}' with key {customer_key}"
-            }, indent=2)
+            })
         except Exception as e:
             return f"Error creating customer: {e}"
     
@@ -3054,7 +3067,7 @@ DO NOT just say you did it - ACTUALLY CALL THE TOOL NOW.""")
                                 else:
                                     tool_result_content = tool.invoke(tool_args)
                                 if not isinstance(tool_result_content, str):
-                                    tool_result_content = json.dumps(tool_result_content)
+                                    tool_result_content = _dump_json(tool_result_content, indent=False)
                             except Exception as e:
                                 tool_result_content = f"Error executing tool: {e}"
                             break
@@ -3340,7 +3353,6 @@ class BookkeeperAgent:
         
         # Quick supplier match
         if suppliers:
-            from difflib import SequenceMatcher
             for s in suppliers:
                 sname = s.get("name", "").lower()
                 if sname and sname in text_lower:
@@ -3380,7 +3392,7 @@ class BookkeeperAgent:
             for i, img in enumerate(images):
                 doc = ProcessedDocument(filename=f"document_{i+1}", status="processing")
                 try:
-                    is_pdf = img[:4] == b'%PDF'
+                    is_pdf = img.startswith(b'%PDF')
                     result = await (self.ocr_service.extract_from_pdf(img) if is_pdf 
                                    else self.ocr_service.extract_text(img))
                     
@@ -3507,7 +3519,7 @@ class BookkeeperAgent:
                 logger.info(f"[stream_process] Processing image {i+1}/{len(images)}, size={len(img)} bytes")
                 doc = ProcessedDocument(filename=f"document_{i+1}", status="processing")
                 try:
-                    is_pdf = img[:4] == b'%PDF'
+                    is_pdf = img.startswith(b'%PDF')
                     logger.info(f"[stream_process] Image {i+1} is_pdf={is_pdf}")
                     result = await (self.ocr_service.extract_from_pdf(img) if is_pdf 
                                    else self.ocr_service.extract_text(img))
@@ -16,7 +16,7 @@ import base64
 import logging
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, AsyncGenerator, Dict, List, Optional, Union
 
 import httpx
 import litellm
@@ -359,6 +359,90 @@ class LLMService:
             raise last_error
         raise LLMError("All models failed")
     
+    async def chat_stream(
+        self,
+        messages: List[Message],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+    ) -> AsyncGenerator[str, None]:
+        """Stream a chat response from the LLM as text chunks.
+        
+        Fallback models are tried, as in ``chat``, only while the request is
+        being opened; once chunks are flowing, errors are raised. Closing the
+        iterator early (e.g. with ``contextlib.aclosing``) closes the provider
+        stream.
+        
+        Args:
+            messages: List of chat messages
+            model: Model name (optional, uses default if not specified)
+            temperature: Sampling temperature (0.0 to 1.0)
+            max_tokens: Maximum tokens in response (optional)
+            
+        Yields:
+            Response text chunks in order
+            
+        Raises:
+            LLMConnectionError: If connection to provider fails
+            LLMModelNotFoundError: If model is not available
+            LLMProviderError: If provider returns an error
+            LLMTimeoutError: If request times out
+        """
+        resolved_model = self._resolve_model(model)
+        
+        litellm_messages = [
+            {"role": msg.role, "content": msg.content}
+            for msg in messages
+        ]
+        
+        models_to_try = [resolved_model] + self.config.fallback_models
+        last_error: Optional[Exception] = None
+        
+        for attempt_model in models_to_try:
+            kwargs: Dict[str, Any] = {
+                "model": attempt_model,
+                "messages": litellm_messages,
+                "temperature": temperature,
+                "timeout": self.config.timeout,
+                "stream": True,
+            }
+            if max_tokens:
+                kwargs["max_tokens"] = max_tokens
+            api_base = self._get_api_base(attempt_model)
+            if api_base:
+                kwargs["api_base"] = api_base
+            
+            try:
+                stream = await litellm.acompletion(**kwargs)
+            except Exception as e:
+                error = self._translate_error(e)
+                if isinstance(error, (LLMConnectionError, LLMModelNotFoundError)):
+                    logger.warning(
+                        f"Model {attempt_model} unavailable, trying fallback: {error}"
+                    )
+                    last_error = error
+                    continue
+                raise error
+            
+            try:
+                async for chunk in stream:
+                    if chunk.choices:
+                        delta = chunk.choices[0].delta.content
+                        if delta:
+                            yield delta
+            except Exception as e:
+                raise self._translate_error(e)
+            finally:
+                aclose = getattr(stream, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+            return
+        
+        # All models failed
+        if last_error:
+            raise last_error
+        raise LLMError("All models failed")
+    
     async def chat_with_vision(
         self,
         messages: List[Message],
@@ -486,24 +570,37 @@ class LLMService:
             
             return ""
             
-        except litellm.exceptions.AuthenticationError as e:
-            raise LLMProviderError(f"Authentication failed: {e}")
-        except litellm.exceptions.NotFoundError as e:
-            raise LLMModelNotFoundError(f"Model not found: {e}")
-        except litellm.exceptions.RateLimitError as e:
-            raise LLMProviderError(f"Rate limited: {e}")
-        except litellm.exceptions.APIConnectionError as e:
-            raise LLMConnectionError(f"Connection failed: {e}")
-        except litellm.exceptions.Timeout as e:
-            raise LLMTimeoutError(f"Request timed out: {e}")
-        except litellm.exceptions.APIError as e:
-            raise LLMProviderError(f"API error: {e}")
-        except asyncio.TimeoutError:
-            raise LLMTimeoutError(f"Request timed out after {self.config.timeout}s")
         except Exception as e:
-            # Log unexpected errors
-            logger.error(f"Unexpected LLM error: {e}")
-            raise LLMError(f"LLM request failed: {e}")
+            raise self._translate_error(e)
+    
+    def _translate_error(self, error: Exception) -> LLMError:
+        """Map a LiteLLM (or asyncio) exception to the matching LLMError.
+        
+        Args:
+            error: Exception raised while talking to the provider
+            
+        Returns:
+            LLMError subclass describing the failure
+        """
+        if isinstance(error, LLMError):
+            return error
+        if isinstance(error, litellm.exceptions.AuthenticationError):
+            return LLMProviderError(f"Authentication failed: {error}")
+        if isinstance(error, litellm.exceptions.NotFoundError):
+            return LLMModelNotFoundError(f"Model not found: {error}")
+        if isinstance(error, litellm.exceptions.RateLimitError):
+            return LLMProviderError(f"Rate limited: {error}")
+        if isinstance(error, litellm.exceptions.APIConnectionError):
+            return LLMConnectionError(f"Connection failed: {error}")
+        if isinstance(error, litellm.exceptions.Timeout):
+            return LLMTimeoutError(f"Request timed out: {error}")
+        if isinstance(error, litellm.exceptions.APIError):
+            return LLMProviderError(f"API error: {error}")
+        if isinstance(error, asyncio.TimeoutError):
+            return LLMTimeoutError(f"Request timed out after {self.config.timeout}s")
+        # Log unexpected errors
+        logger.error(f"Unexpected LLM error: {error}")
+        return LLMError(f"LLM request failed: {error}")
     
     # =========================================================================
     # Model Discovery
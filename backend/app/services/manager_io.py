@@ -12,10 +12,25 @@ import asyncio
 import hashlib
 import json
 import logging
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Generic, List, Optional, TypeVar
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
 import httpx
+import ijson
+import orjson
 from pydantic import BaseModel
 from redis.asyncio import Redis
 
@@ -203,6 +218,112 @@ class DeleteResponse(BaseModel):
     message: Optional[str] = None
 
 
+# =============================================================================
+# Report Rows
+# =============================================================================
+
+
+def _first_value(item: Dict[str, Any], *keys: str) -> Any:
+    """Return the first truthy value among ``keys`` in ``item``."""
+    for key in keys:
+        value = item.get(key)
+        if value:
+            return value
+    return None
+
+
+@dataclass(slots=True)
+class ReportRow:
+    """Account row from a Manager.io report with canonical, coerced fields.
+    
+    Manager.io report payloads mix ``Name``/``name``, ``Amount``/``Balance``
+    etc. depending on the report and version. Rows are normalized once at the
+    client boundary so callers read plain attributes.
+    """
+    key: str
+    name: str
+    code: Optional[str]
+    debit: float
+    credit: float
+    balance: float
+    amount: float
+    group: Optional[str] = None
+
+
+@dataclass(slots=True)
+class ReportGroup:
+    """Group of account rows from a Manager.io report (e.g. "Expenses")."""
+    name: str
+    total: float
+    accounts: List[ReportRow] = field(default_factory=list)
+
+
+def canon_report_row(item: Dict[str, Any], group: Optional[str] = None) -> ReportRow:
+    """Normalize a raw report account entry into a ReportRow.
+    
+    Args:
+        item: Raw account entry from a report
+        group: Name of the enclosing report group, if any
+        
+    Returns:
+        ReportRow with floats coerced and key/name variants resolved
+    """
+    debit = float(_first_value(item, "Debit", "debit") or 0)
+    credit = float(_first_value(item, "Credit", "credit") or 0)
+    raw_balance = _first_value(item, "Balance", "balance")
+    
+    if "Balance" in item or "balance" in item:
+        balance = float(raw_balance or 0)
+    else:
+        balance = debit - credit
+    
+    return ReportRow(
+        key=_first_value(
+            item, "Key", "key", "Account", "account", "AccountKey", "account_key"
+        ) or "",
+        name=_first_value(item, "Name", "name") or "",
+        code=_first_value(item, "Code", "code"),
+        debit=debit,
+        credit=credit,
+        balance=balance,
+        amount=float(_first_value(item, "Amount", "amount") or raw_balance or 0),
+        group=group,
+    )
+
+
+def canon_report_group(group: Dict[str, Any]) -> ReportGroup:
+    """Normalize a raw report group and its accounts into a ReportGroup.
+    
+    Args:
+        group: Raw group entry with ``Name`` and nested ``Accounts``
+        
+    Returns:
+        ReportGroup with canonical account rows
+    """
+    name = _first_value(group, "Name", "name") or ""
+    accounts = group.get("Accounts", group.get("accounts")) or []
+    return ReportGroup(
+        name=name,
+        total=float(_first_value(group, "Total", "total") or 0),
+        accounts=[canon_report_row(acc, name) for acc in accounts],
+    )
+
+
+def canon_report_groups(report: Any) -> List[ReportGroup]:
+    """Normalize the ``Groups`` section of a report payload.
+    
+    Args:
+        report: Report payload as returned by the dict API
+        
+    Returns:
+        List of ReportGroup, empty if the report has no groups
+    """
+    if not isinstance(report, dict):
+        return []
+    groups = report.get("Groups", report.get("groups")) or []
+    return [canon_report_group(g) for g in groups]
+
+
 # =============================================================================
 # Exceptions
 # =============================================================================
@@ -294,6 +415,15 @@ class ManagerIOClient:
     INITIAL_RETRY_DELAY = 1.0  # seconds
     MAX_RETRY_DELAY = 30.0  # seconds
     REQUEST_TIMEOUT = 30.0  # seconds
+    # Connection pool; HTTP/2 multiplexes concurrent requests over one
+    # connection when the server negotiates it (HTTPS only), and idle
+    # connections stay warm across the tool calls of a conversation
+    HTTP2 = True
+    CONNECTION_LIMITS = httpx.Limits(
+        max_connections=20,
+        max_keepalive_connections=10,
+        keepalive_expiry=300.0,
+    )
     
     def __init__(
         self,
@@ -330,6 +460,8 @@ class ManagerIOClient:
         if self._client is None or self._client.is_closed:
             self._client = httpx.AsyncClient(
                 timeout=httpx.Timeout(self.REQUEST_TIMEOUT),
+                http2=self.HTTP2,
+                limits=self.CONNECTION_LIMITS,
                 verify=False,  # Allow self-signed certificates
                 headers={
                     "X-API-KEY": self.api_key,
@@ -393,7 +525,7 @@ class ManagerIOClient:
         try:
             cached = await self.cache.get(cache_key)
             if cached:
-                return json.loads(cached)
+                return orjson.loads(cached)
         except Exception as e:
             logger.warning(f"Cache get failed for {cache_key}: {e}")
         
@@ -420,7 +552,7 @@ class ManagerIOClient:
             await self.cache.setex(
                 cache_key,
                 ttl,
-                json.dumps(data),
+                orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS),
             )
         except Exception as e:
             logger.warning(f"Cache set failed for {cache_key}: {e}")
@@ -705,36 +837,181 @@ class ManagerIOClient:
     # Pagination Helper
     # =========================================================================
     
+    def _paginated_cache_key(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        stop_before_date: Optional[str],
+    ) -> str:
+        """Cache key for the complete result of a paginated crawl."""
+        cache_params = dict(params or {})
+        if stop_before_date:
+            cache_params["_stop_before_date"] = stop_before_date
+        return self._get_cache_key(f"{endpoint}:all", cache_params or None)
+    
     async def fetch_all_paginated(
         self,
         endpoint: str,
         use_cache: bool = True,
         cache_ttl: Optional[int] = None,
+        params: Optional[Dict[str, Any]] = None,
+        stop_before_date: Optional[str] = None,
+        date_field: str = "Date",
     ) -> List[dict]:
         """Fetch all records from a paginated endpoint.
         
         Automatically handles pagination by making multiple requests
         until all records are retrieved.
         
+        Server-side filters (e.g. ``fromDate``/``toDate``) can be passed via
+        ``params`` so rows that would be discarded never cross the wire. When
+        ``stop_before_date`` is set and a page comes back newest-first,
+        pagination stops once that page reaches records older than the date.
+        Pages in any other order are fetched as usual, so callers should still
+        filter the result client-side.
+        
         Args:
             endpoint: API endpoint path
             use_cache: Whether to cache the complete result
             cache_ttl: Optional cache TTL override
+            params: Optional extra query parameters sent with every page
+            stop_before_date: Optional YYYY-MM-DD date to stop paginating at
+            date_field: Record field holding the date for ``stop_before_date``
             
         Returns:
             List of all records from the endpoint (normalized with consistent field names)
         """
         # Check cache for complete result
         if use_cache:
-            cache_key = self._get_cache_key(f"{endpoint}:all")
+            cache_key = self._paginated_cache_key(endpoint, params, stop_before_date)
             cached = await self._get_from_cache(cache_key)
             if cached is not None:
                 logger.debug(f"Cache hit for paginated {endpoint}")
                 return cached
         
-        all_records: List[dict] = []
+        all_records = [
+            record
+            async for record in self.iter_paginated(
+                endpoint,
+                use_cache=False,
+                params=params,
+                stop_before_date=stop_before_date,
+                date_field=date_field,
+            )
+        ]
+        
+        # Cache complete result
+        if use_cache:
+            await self._set_cache(cache_key, all_records, ttl=cache_ttl)
+        
+        return all_records
+    
+    async def iter_paginated(
+        self,
+        endpoint: str,
+        use_cache: bool = True,
+        params: Optional[Dict[str, Any]] = None,
+        stop_before_date: Optional[str] = None,
+        date_field: str = "Date",
+        concurrency: int = 1,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the records of a paginated endpoint page by page.
+        
+        The streaming counterpart of ``fetch_all_paginated``: only a few
+        pages are held at a time, so callers that fold records into a summary
+        never materialize the whole crawl. A complete result already cached
+        by ``fetch_all_paginated`` is replayed, but streamed crawls are not
+        cached themselves.
+        
+        With ``concurrency`` above 1 and a first page reporting the total
+        record count, up to that many of the remaining pages are requested
+        at once; records are still yielded in page order. Crawls using
+        ``stop_before_date`` are always sequential.
+        
+        Args:
+            endpoint: API endpoint path
+            use_cache: Whether to replay a cached complete result
+            params: Optional extra query parameters sent with every page
+            stop_before_date: Optional YYYY-MM-DD date to stop paginating at
+            date_field: Record field holding the date for ``stop_before_date``
+            concurrency: Maximum page requests in flight once the total is known
+            
+        Yields:
+            Records normalized with consistent field names
+        """
+        if use_cache:
+            cached = await self._get_from_cache(
+                self._paginated_cache_key(endpoint, params, stop_before_date)
+            )
+            if cached is not None:
+                logger.debug(f"Cache hit for paginated {endpoint}")
+                for record in cached:
+                    yield record
+                return
+        
         skip = 0
         
+        while True:
+            records, total = await self._fetch_page(endpoint, params, skip)
+            for record in records:
+                yield record
+            
+            # Stop early once a newest-first page has passed the requested date
+            if stop_before_date and self._page_passed_date(
+                records, stop_before_date, date_field
+            ):
+                return
+            
+            # Check if there are more records
+            if total is not None:
+                if skip + len(records) >= total:
+                    return
+            elif len(records) < self.page_size:
+                return
+            
+            skip += self.page_size
+            
+            if total is not None and concurrency > 1 and not stop_before_date:
+                break
+        
+        # The remaining pages are known; keep up to ``concurrency`` in flight
+        pending: Deque[
+            asyncio.Task[Tuple[List[Dict[str, Any]], Optional[int]]]
+        ] = deque()
+        next_skips = iter(range(skip, total, self.page_size))
+        try:
+            for page_skip in islice(next_skips, concurrency):
+                pending.append(asyncio.ensure_future(
+                    self._fetch_page(endpoint, params, page_skip)
+                ))
+            while pending:
+                records, _ = await pending.popleft()
+                for page_skip in islice(next_skips, 1):
+                    pending.append(asyncio.ensure_future(
+                        self._fetch_page(endpoint, params, page_skip)
+                    ))
+                for record in records:
+                    yield record
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def _fetch_page(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        skip: int,
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Fetch and normalize one page of a paginated endpoint.
+        
+        Args:
+            endpoint: API endpoint path
+            params: Optional extra query parameters
+            skip: Number of records to skip
+            
+        Returns:
+            Tuple of (normalized records, total record count if reported)
+        """
         # Map endpoint to expected response key
         endpoint_key_map = {
             "/receipts": "receipts",
@@ -759,54 +1036,63 @@ class ManagerIOClient:
         }
         
         # Get the expected key for this endpoint
-        endpoint_clean = endpoint.rstrip("/")
-        expected_key = endpoint_key_map.get(endpoint_clean)
+        expected_key = endpoint_key_map.get(endpoint.rstrip("/"))
         
-        while True:
-            params = {"skip": skip, "take": self.page_size}
-            
-            # Don't cache individual pages
-            response = await self._request_with_retry("GET", endpoint, params=params)
-            data = response.json()
-            
-            # Handle different response formats
-            records = []
-            total = None
-            
-            if isinstance(data, list):
-                # Simple list response
-                records = data
-            elif isinstance(data, dict):
-                # Try endpoint-specific key first, then generic keys
-                if expected_key and expected_key in data:
-                    records = data[expected_key]
-                else:
-                    records = data.get("items", data.get("data", []))
-                
-                total = data.get("totalRecords", data.get("total", data.get("count")))
-            
-            # Normalize records to have consistent field names
-            normalized_records = []
-            for record in records:
-                normalized = self._normalize_record(record)
-                normalized_records.append(normalized)
-            
-            all_records.extend(normalized_records)
-            
-            # Check if there are more records
-            if total is not None:
-                if skip + len(records) >= total:
-                    break
-            elif len(records) < self.page_size:
-                break
+        page_params = {**(params or {}), "skip": skip, "take": self.page_size}
+        
+        # Don't cache individual pages
+        response = await self._request_with_retry("GET", endpoint, params=page_params)
+        data = response.json()
+        
+        # Handle different response formats
+        records = []
+        total = None
+        
+        if isinstance(data, list):
+            # Simple list response
+            records = data
+        elif isinstance(data, dict):
+            # Try endpoint-specific key first, then generic keys
+            if expected_key and expected_key in data:
+                records = data[expected_key]
+            else:
+                records = data.get("items", data.get("data", []))
             
-            skip += self.page_size
+            total = data.get("totalRecords", data.get("total", data.get("count")))
         
-        # Cache complete result
-        if use_cache:
-            await self._set_cache(cache_key, all_records, ttl=cache_ttl)
+        # Normalize records to have consistent field names
+        return [self._normalize_record(record) for record in records], total
+    
+    @staticmethod
+    def _page_passed_date(
+        records: List[Dict[str, Any]], stop_date: str, date_field: str,
+    ) -> bool:
+        """Check whether a newest-first page ends before ``stop_date``.
         
-        return all_records
+        Only pages whose dates never increase, and whose first date is
+        strictly later than their last, are treated as descending, so
+        unordered or ascending pages never stop pagination early.
+        
+        Args:
+            records: Normalized records from one page
+            stop_date: Date in YYYY-MM-DD format
+            date_field: Record field holding the date
+            
+        Returns:
+            True if later pages can only contain older records
+        """
+        dates = [
+            str(r.get(date_field) or r.get(date_field.lower()) or "")[:10]
+            for r in records
+        ]
+        dates = [d for d in dates if d]
+        if len(dates) < 2:
+            return False
+        return (
+            dates[0] > dates[-1]
+            and dates[-1] < stop_date
+            and all(a >= b for a, b in zip(dates, dates[1:]))
+        )
     
     def _normalize_record(self, record: dict) -> dict:
         """Normalize a record to have consistent field names.
@@ -1029,6 +1315,8 @@ class ManagerIOClient:
         endpoint: str,
         skip: int = 0,
         take: int = DEFAULT_PAGE_SIZE,
+        order_by: Optional[str] = None,
+        desc: bool = False,
     ) -> PaginatedResponse:
         """Helper method to fetch paginated data from an endpoint.
         
@@ -1036,6 +1324,8 @@ class ManagerIOClient:
             endpoint: API endpoint path
             skip: Number of records to skip
             take: Number of records to return (maps to pageSize in API)
+            order_by: Optional field to ask the server to order by (e.g. "Date")
+            desc: Whether to ask for descending order
             
         Returns:
             PaginatedResponse with records
@@ -1044,7 +1334,12 @@ class ManagerIOClient:
             ManagerIOError: If the request fails
         """
         # Manager.io API uses 'pageSize' not 'take'
-        params = {"skip": skip, "pageSize": take}
+        params: Dict[str, Any] = {"skip": skip, "pageSize": take}
+        if order_by:
+            # The server may ignore these, so callers should not rely on them
+            params["orderBy"] = order_by
+            if desc:
+                params["desc"] = "true"
         
         # Map endpoint to expected response key
         endpoint_key_map = {
@@ -1111,12 +1406,16 @@ class ManagerIOClient:
         self,
         skip: int = 0,
         take: int = DEFAULT_PAGE_SIZE,
+        order_by: Optional[str] = None,
+        desc: bool = False,
     ) -> PaginatedResponse:
         """Fetch payments from Manager.io.
         
         Args:
             skip: Number of records to skip
             take: Number of records to return
+            order_by: Optional field to ask the server to order by
+            desc: Whether to ask for descending order
             
         Returns:
             PaginatedResponse with payment records
@@ -1124,18 +1423,24 @@ class ManagerIOClient:
         Raises:
             ManagerIOError: If the request fails
         """
-        return await self._get_paginated("/payments", skip=skip, take=take)
+        return await self._get_paginated(
+            "/payments", skip=skip, take=take, order_by=order_by, desc=desc
+        )
     
     async def get_receipts(
         self,
         skip: int = 0,
         take: int = DEFAULT_PAGE_SIZE,
+        order_by: Optional[str] = None,
+        desc: bool = False,
     ) -> PaginatedResponse:
         """Fetch receipts from Manager.io.
         
         Args:
             skip: Number of records to skip
             take: Number of records to return
+            order_by: Optional field to ask the server to order by
+            desc: Whether to ask for descending order
             
         Returns:
             PaginatedResponse with receipt records
@@ -1143,7 +1448,9 @@ class ManagerIOClient:
         Raises:
             ManagerIOError: If the request fails
         """
-        return await self._get_paginated("/receipts", skip=skip, take=take)
+        return await self._get_paginated(
+            "/receipts", skip=skip, take=take, order_by=order_by, desc=desc
+        )
     
     async def get_expense_claims(
         self,
@@ -1168,12 +1475,16 @@ class ManagerIOClient:
         self,
         skip: int = 0,
         take: int = DEFAULT_PAGE_SIZE,
+        order_by: Optional[str] = None,
+        desc: bool = False,
     ) -> PaginatedResponse:
         """Fetch inter-account transfers from Manager.io.
         
         Args:
             skip: Number of records to skip
             take: Number of records to return
+            order_by: Optional field to ask the server to order by
+            desc: Whether to ask for descending order
             
         Returns:
             PaginatedResponse with transfer records
@@ -1181,7 +1492,9 @@ class ManagerIOClient:
         Raises:
             ManagerIOError: If the request fails
         """
-        return await self._get_paginated("/inter-account-transfers", skip=skip, take=take)
+        return await self._get_paginated(
+            "/inter-account-transfers", skip=skip, take=take, order_by=order_by, desc=desc
+        )
     
     async def get_journal_entries(
         self,
@@ -2370,6 +2683,74 @@ class ManagerIOClient:
         
         return result
     
+    async def stream_trial_balance(
+        self,
+        as_of_date: Optional[str] = None,
+    ) -> AsyncIterator[ReportGroup]:
+        """Stream trial balance groups from Manager.io.
+        
+        Uses the same form/view flow as ``get_trial_balance`` but feeds the
+        view body into an incremental ``ijson`` parser, yielding each entry of
+        the top-level ``Groups`` array as soon as it has been downloaded. Peak
+        memory is bounded by the largest group rather than the whole report.
+        
+        Unlike ``get_trial_balance`` there is no derived fallback; callers
+        should switch to the dict API when nothing is yielded.
+        
+        Args:
+            as_of_date: Optional date in YYYY-MM-DD format
+            
+        Yields:
+            Trial balance groups normalized to ReportGroup
+            
+        Raises:
+            ManagerIOConnectionError: If the connection fails mid-stream
+            ManagerIOError: If the report request fails or the body is not valid JSON
+        """
+        form_data = {}
+        if as_of_date:
+            form_data["Date"] = as_of_date
+        
+        client = await self._get_client()
+        
+        try:
+            form_response = await client.post(
+                f"{self.base_url}/trial-balance-form",
+                json=form_data,
+            )
+            self._handle_response_error(form_response)
+            form_result = form_response.json()
+            
+            report_key = form_result.get("Key") or form_result.get("key")
+            if not report_key:
+                raise ManagerIOError("No report key returned for trial balance")
+            
+            async with client.stream(
+                "GET",
+                f"{self.base_url}/trial-balance-view/{report_key}",
+            ) as response:
+                if not response.is_success:
+                    await response.aread()
+                    self._handle_response_error(response)
+                
+                groups = ijson.sendable_list()
+                parser = ijson.items_coro(groups, "Groups.item", use_float=True)
+                
+                async for chunk in response.aiter_bytes():
+                    parser.send(chunk)
+                    for group in groups:
+                        yield canon_report_group(group)
+                    del groups[:]
+                
+                parser.close()
+                for group in groups:
+                    yield canon_report_group(group)
+                    
+        except ijson.JSONError as e:
+            raise ManagerIOError(f"Invalid trial balance response: {e}") from e
+        except httpx.RequestError as e:
+            raise ManagerIOConnectionError(f"Connection error: {e}") from e
+    
     async def get_general_ledger_summary(
         self,
         from_date: Optional[str] = None,
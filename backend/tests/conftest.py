@@ -87,10 +87,7 @@ def cleanup_global_engine():
     yield
     # Clean up after all tests
     import asyncio
-    from app.core.database import engine as global_engine
-    
-    async def dispose():
-        await global_engine.dispose()
+    from app.core.database import close_db as dispose
     
     # Run cleanup in the event loop
     try:
@@ -3,6 +3,7 @@
 Tests the following correctness properties:
 - Property 20: Document Type Classification
 - Property 23: Conversation History Persistence
+- Caching of classification/extraction results by OCR text
 
 Uses Hypothesis for property-based testing.
 """
@@ -227,6 +228,40 @@ class TestDocumentTypeClassificationProperty:
         assert result.document_type == "unknown"
         assert result.confidence == 0.0
     
+    def test_property_20_overlapping_patterns_all_counted(self, agent_service):
+        """Patterns sharing a prefix are each counted, regardless of case.
+        
+        **Validates: Requirements 4.1**
+        """
+        result = agent_service.classify_document("INVOICE NUMBER: 12345")
+        
+        assert result.document_type == "invoice"
+        assert result.matched_patterns == [r"invoice", r"invoice\s*number"]
+        assert result.confidence == pytest.approx(2 / len(DOCUMENT_TYPE_PATTERNS["invoice"]))
+    
+    def test_property_20_hyperscan_matches_re_fallback(self, monkeypatch):
+        """The Hyperscan scan and the re fallback find the same patterns.
+        
+        **Validates: Requirements 4.1**
+        """
+        pytest.importorskip("hyperscan")
+        from app.services import agent as agent_module
+        
+        texts = [
+            "INVOICE NUMBER: 12345, Bill To: ACME, Amount\u00a0Due: $5",
+            "Cash Sale\nSubtotal: 4.00\nTotal: 4.50\nChange due 0.50",
+            "Subtotal: 4.00\n\nTotal on the next line",
+            "Bank Statement - Opening Balance 10 - Closing Balance 12",
+            "Employee Expenses / Reimbursement claim form",
+            "nothing to see here",
+            "",
+        ]
+        with_hyperscan = [agent_module._match_document_patterns(t) for t in texts]
+        monkeypatch.setattr(agent_module, "_HS_DATABASE", None)
+        with_re = [agent_module._match_document_patterns(t) for t in texts]
+        
+        assert with_hyperscan == with_re
+    
     @given(text=st.text(min_size=10, max_size=500))
     @settings(max_examples=100, suppress_health_check=[HealthCheck.function_scoped_fixture])
     def test_property_20_matched_patterns_are_valid(
@@ -396,7 +431,7 @@ class TestConversationHistoryPersistenceProperty:
         # Mock the database query
         mock_result = MagicMock()
         mock_scalars = MagicMock()
-        mock_scalars.all.return_value = list(reversed(mock_messages))  # DB returns desc order
+        mock_scalars.all.return_value = list(mock_messages)  # DB re-sorts oldest first
         mock_result.scalars.return_value = mock_scalars
         mock_db.execute.return_value = mock_result
         
@@ -921,3 +956,714 @@ class TestBatchProcessingPartialFailureProperty:
         
         # Should not call Manager.io API
         mock_manager_client.create_expense_claim.assert_not_called()
+    
+    async def test_individual_submissions_overlap_in_order(
+        self,
+        agent_service,
+        mock_manager_client,
+    ):
+        """Individual submissions run concurrently up to the limit, results in order."""
+        import asyncio
+        
+        from app.services.agent import SUBMIT_CONCURRENCY
+        from app.services.manager_io import CreateResponse
+        
+        in_flight = 0
+        peak = 0
+        
+        async def create_expense_claim(expense_data):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            # Later documents finish first
+            await asyncio.sleep(0.001 * (20 - int(expense_data.payee)))
+            in_flight -= 1
+            return CreateResponse(success=True, key=f"key-{expense_data.payee}")
+        
+        mock_manager_client.create_expense_claim = create_expense_claim
+        documents = []
+        for i in range(12):
+            doc = MagicMock()
+            doc.id = f"doc-{i}"
+            doc.document_type = "receipt"
+            doc.filename = None
+            doc.extracted_data = {"vendor_name": str(i), "total_amount": 1}
+            documents.append(doc)
+        
+        results = await agent_service._submit_individual(documents, mock_manager_client, "user-1")
+        
+        assert [r["key"] for r in results] == [f"key-{i}" for i in range(12)]
+        assert [d.status for d in documents] == ["submitted"] * 12
+        assert 1 < peak <= SUBMIT_CONCURRENCY
+
+
+# =============================================================================
+# Document Result Caching
+# =============================================================================
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the Redis calls the agent makes."""
+    
+    def __init__(self):
+        self.store = {}
+    
+    async def get(self, key):
+        return self.store.get(key)
+    
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+
+class TestDocumentResultCache:
+    """Tests for caching classification/extraction by OCR text digest."""
+    
+    @pytest.fixture
+    def agent_service(self, mock_tool_context):
+        """Create an AgentService backed by an in-memory Redis."""
+        mock_llm = MagicMock()
+        mock_llm.config.default_model = "llama3"
+        
+        with patch("app.services.agent.ToolContext", return_value=mock_tool_context):
+            with patch("app.services.agent.set_tool_context"):
+                with patch("app.services.agent.get_all_tools", return_value=[]):
+                    service = AgentService(
+                        db=AsyncMock(spec=AsyncSession),
+                        llm_service=mock_llm,
+                        ocr_service=MagicMock(),
+                        redis=FakeRedis(),
+                    )
+        return service
+    
+    async def test_classification_reused_for_same_text(self, agent_service):
+        """A repeated text is classified from the cache."""
+        first = await agent_service._classify_cached("Invoice Number 1", "h1")
+        
+        with patch.object(agent_service, "classify_document") as classify:
+            second = await agent_service._classify_cached("Invoice Number 1", "h1")
+        
+        classify.assert_not_called()
+        assert second == first
+        assert second.document_type == "invoice"
+    
+    async def test_extraction_skips_llm_on_hit(self, agent_service):
+        """A repeated text reuses the extracted data without calling the LLM."""
+        data = {"vendor_name": "ACME", "total_amount": 12.5}
+        extract = AsyncMock(return_value=data)
+        
+        with patch.object(agent_service, "_extract_structured_data", extract):
+            first = await agent_service._extract_cached("t", "h1", "receipt", "c", "u")
+            second = await agent_service._extract_cached("t", "h1", "receipt", "c", "u")
+        
+        assert first == second == data
+        extract.assert_awaited_once()
+    
+    async def test_failed_extraction_not_cached(self, agent_service):
+        """Extraction errors are retried on the next upload."""
+        extract = AsyncMock(return_value={"error": "timeout"})
+        
+        with patch.object(agent_service, "_extract_structured_data", extract):
+            await agent_service._extract_cached("t", "h1", "receipt", "c", "u")
+            await agent_service._extract_cached("t", "h1", "receipt", "c", "u")
+        
+        assert extract.await_count == 2
+        assert agent_service.redis.store == {}
+    
+    async def test_long_text_classified_off_event_loop(self, agent_service):
+        """Long OCR text is classified in a worker thread."""
+        import threading
+        
+        from app.services.agent import CLASSIFY_THREAD_MIN_CHARS
+        
+        threads = []
+        classify = agent_service.classify_document
+        
+        def record_thread(text):
+            threads.append(threading.current_thread())
+            return classify(text)
+        
+        long_text = "Invoice Number 7 " * (CLASSIFY_THREAD_MIN_CHARS // 10)
+        with patch.object(agent_service, "classify_document", side_effect=record_thread):
+            await agent_service._classify_cached("Invoice Number 7", "short")
+            result = await agent_service._classify_cached(long_text, "long")
+        
+        assert threads[0] is threading.current_thread()
+        assert threads[1] is not threading.current_thread()
+        assert result.document_type == "invoice"
+
+
+# =============================================================================
+# Concurrent Attachment Processing
+# =============================================================================
+
+
+class TestConcurrentAttachmentProcessing:
+    """Tests for analyzing several attachments at once."""
+    
+    @pytest.fixture
+    def agent_service(self, mock_tool_context):
+        """Create an AgentService whose OCR records how many calls overlap."""
+        import asyncio
+        
+        from app.services.ocr import OCRResult
+        
+        ocr = MagicMock()
+        ocr.in_flight = 0
+        ocr.peak = 0
+        
+        async def extract_text(image_data):
+            ocr.in_flight += 1
+            ocr.peak = max(ocr.peak, ocr.in_flight)
+            await asyncio.sleep(0.01)
+            ocr.in_flight -= 1
+            if image_data == b"bad":
+                return OCRResult(text="", error="unreadable")
+            return OCRResult(text=f"Receipt {image_data.decode()}")
+        
+        ocr.extract_text = extract_text
+        mock_llm = MagicMock()
+        mock_llm.config.default_model = "llama3"
+        
+        with patch("app.services.agent.ToolContext", return_value=mock_tool_context):
+            with patch("app.services.agent.set_tool_context"):
+                with patch("app.services.agent.get_all_tools", return_value=[]):
+                    service = AgentService(
+                        db=AsyncMock(spec=AsyncSession),
+                        llm_service=mock_llm,
+                        ocr_service=ocr,
+                    )
+        # No earlier uploads with the same content
+        no_rows = MagicMock()
+        no_rows.scalars.return_value = []
+        service.db.execute.return_value = no_rows
+        service._extract_structured_data = AsyncMock(return_value={"total_amount": 1})
+        return service
+    
+    async def test_attachments_run_concurrently_in_order(self, agent_service):
+        """Attachments overlap up to the concurrency limit and keep input order."""
+        from app.services.agent import DOCUMENT_CONCURRENCY
+        
+        attachments = [str(i).encode() for i in range(6)] + [b"bad"]
+        docs = await agent_service._process_documents(
+            user_id="user-1",
+            company_id="company-1",
+            attachments=attachments,
+        )
+        
+        assert [d.filename for d in docs] == [f"attachment_{i+1}" for i in range(7)]
+        assert [d.status for d in docs] == ["processed"] * 6 + ["error"]
+        assert docs[-1].error_message == "unreadable"
+        assert docs[0].extracted_text == "Receipt 0"
+        assert 1 < agent_service.ocr_service.peak <= DOCUMENT_CONCURRENCY
+        # Ids are assigned up front; the caller flushes the whole turn
+        assert all(d.id for d in docs)
+        agent_service.db.add_all.assert_called_once_with(docs)
+        agent_service.db.flush.assert_not_awaited()
+    
+    async def test_pdf_attachments_use_pdf_ocr(self, agent_service):
+        """Attachments are routed to OCR by their magic bytes."""
+        from app.services.agent import _detect_file_kind
+        from app.services.ocr import OCRResult
+        
+        agent_service.ocr_service.extract_from_pdf = AsyncMock(
+            return_value=OCRResult(text="Invoice from PDF")
+        )
+        
+        docs = await agent_service._process_documents(
+            user_id="user-1",
+            company_id="company-1",
+            attachments=[b"%PDF-1.7 ...", b"\x89PNG\r\n"],
+        )
+        
+        assert docs[0].extracted_text == "Invoice from PDF"
+        agent_service.ocr_service.extract_from_pdf.assert_awaited_once_with(b"%PDF-1.7 ...")
+        assert [_detect_file_kind(d) for d in (b"%PDF", b"\xff\xd8\xff\xe0", b"\x89PNG", b"GIF8")] == [
+            "pdf", "jpeg", "png", "unknown",
+        ]
+    
+    async def test_identical_attachments_analyzed_once(self, agent_service):
+        """Repeated files in one message share a single OCR/extraction run."""
+        agent_service.ocr_service.extract_text = AsyncMock(
+            side_effect=agent_service.ocr_service.extract_text
+        )
+        
+        docs = await agent_service._process_documents(
+            user_id="user-1",
+            company_id="company-1",
+            attachments=[b"1", b"2", b"1"],
+        )
+        
+        assert agent_service.ocr_service.extract_text.await_count == 2
+        assert docs[2].status == "processed"
+        assert docs[2].extracted_text == docs[0].extracted_text == "Receipt 1"
+        assert docs[2].extracted_data == docs[0].extracted_data
+        assert docs[2].extracted_data is not docs[0].extracted_data
+        assert docs[0].content_hash == docs[2].content_hash != docs[1].content_hash
+
+
+# =============================================================================
+# History Compression
+# =============================================================================
+
+
+class TestHistoryCompression:
+    """Tests for fitting conversation history into the token budget."""
+    
+    @pytest.fixture
+    def agent_service(self, mock_tool_context):
+        """Create an AgentService with a summarizing LLM and in-memory Redis."""
+        mock_llm = MagicMock()
+        mock_llm.chat = AsyncMock(return_value="User uploaded two receipts.")
+        
+        with patch("app.services.agent.ToolContext", return_value=mock_tool_context):
+            with patch("app.services.agent.set_tool_context"):
+                with patch("app.services.agent.get_all_tools", return_value=[]):
+                    service = AgentService(
+                        db=AsyncMock(spec=AsyncSession),
+                        llm_service=mock_llm,
+                        ocr_service=MagicMock(),
+                        redis=FakeRedis(),
+                    )
+        return service
+    
+    @staticmethod
+    def _messages(count: int, size: int):
+        from app.services.llm import Message
+        
+        return [Message(role="system", content="prompt")] + [
+            Message(role="user" if i % 2 else "assistant", content=f"{i}:" + "x" * size)
+            for i in range(count)
+        ]
+    
+    async def test_under_budget_unchanged(self, agent_service):
+        """History within the budget is sent as-is without an LLM call."""
+        messages = self._messages(20, 10)
+        
+        assert await agent_service._maybe_compress_history(messages) is messages
+        agent_service.llm_service.chat.assert_not_called()
+    
+    async def test_over_budget_summarizes_middle(self, agent_service):
+        """The middle of a long history becomes one cached summary message."""
+        from app.services.agent import HISTORY_KEEP_LAST
+        
+        messages = self._messages(20, 400)
+        
+        compressed = await agent_service._maybe_compress_history(messages, budget=500)
+        again = await agent_service._maybe_compress_history(messages, budget=500)
+        
+        assert compressed[0] is messages[0]
+        assert compressed[1].role == "system"
+        assert "User uploaded two receipts." in compressed[1].content
+        assert compressed[2:] == messages[-HISTORY_KEEP_LAST:]
+        assert again == compressed
+        agent_service.llm_service.chat.assert_awaited_once()
+    
+    async def test_summary_failure_drops_middle(self, agent_service):
+        """If summarization fails the older span is dropped, not sent whole."""
+        from app.services.agent import HISTORY_KEEP_LAST
+        
+        agent_service.llm_service.chat.side_effect = RuntimeError("offline")
+        messages = self._messages(20, 400)
+        
+        compressed = await agent_service._maybe_compress_history(messages, budget=500)
+        
+        assert compressed == [messages[0]] + messages[-HISTORY_KEEP_LAST:]
+    
+    def test_old_document_context_shortened(self):
+        """Only the latest document messages keep their full extracted data."""
+        from app.services.agent import (
+            _compress_old_doc_messages,
+            _format_document_context,
+        )
+        from app.services.llm import Message
+        
+        def doc_message(n):
+            return Message(role="system", content=_format_document_context([{
+                "id": f"doc-{n}",
+                "type": "receipt",
+                "filename": f"attachment_{n}",
+                "data": {"vendor_name": f"Vendor {n}", "total_amount": n, "line_items": []},
+            }]))
+        
+        messages = [Message(role="system", content="prompt")] + [doc_message(n) for n in range(4)]
+        
+        compressed = _compress_old_doc_messages(messages, keep_last=2)
+        
+        assert compressed[0] is messages[0]
+        assert compressed[1].content.endswith("[doc doc-0] receipt vendor=Vendor 0 total=0")
+        assert "line_items" not in compressed[2].content
+        assert compressed[3:] == messages[3:]
+        assert "line_items" in messages[1].content
+
+
+# =============================================================================
+# Turn Persistence
+# =============================================================================
+
+
+class TestTurnPersistence:
+    """Tests for writing a whole chat turn with one flush."""
+    
+    async def test_process_message_flushes_once(self, mock_tool_context):
+        """User message and reply are flushed together."""
+        mock_db = AsyncMock(spec=AsyncSession)
+        history_result = MagicMock()
+        history_result.scalars.return_value.all.return_value = []
+        mock_db.execute.return_value = history_result
+        mock_llm = MagicMock()
+        mock_llm.chat = AsyncMock(return_value="Noted.")
+        
+        with patch("app.services.agent.ToolContext", return_value=mock_tool_context):
+            with patch("app.services.agent.set_tool_context"):
+                with patch("app.services.agent.get_all_tools", return_value=[]):
+                    service = AgentService(db=mock_db, llm_service=mock_llm, ocr_service=MagicMock())
+        
+        conversation = MagicMock(id="conv-1")
+        with patch.object(service, "get_or_create_conversation", AsyncMock(return_value=conversation)):
+            response = await service.process_message(
+                user_id="user-1",
+                company_id="company-1",
+                message="Hello",
+            )
+        
+        assert response.message == "Noted."
+        mock_db.flush.assert_awaited_once()
+        roles = [call.args[0].role for call in mock_db.add.call_args_list]
+        assert roles == ["user", "assistant"]
+        sent = mock_llm.chat.await_args.args[0]
+        assert [m.role for m in sent] == ["system", "user"]
+    
+    async def test_document_context_is_sent_but_not_saved(self, mock_tool_context):
+        """Document context goes to the LLM for this turn only."""
+        mock_db = AsyncMock(spec=AsyncSession)
+        mock_llm = MagicMock()
+        mock_llm.chat = AsyncMock(return_value="Got it.")
+        
+        with patch("app.services.agent.ToolContext", return_value=mock_tool_context):
+            with patch("app.services.agent.set_tool_context"):
+                with patch("app.services.agent.get_all_tools", return_value=[]):
+                    service = AgentService(db=mock_db, llm_service=mock_llm, ocr_service=MagicMock())
+        
+        doc = MagicMock(
+            id="doc-1", document_type="receipt", filename="r.jpg", status="processed",
+            extracted_data={"vendor_name": "ACME", "total_amount": 12.5},
+        )
+        conversation = MagicMock(id="conv-1")
+        with patch.object(service, "get_or_create_conversation", AsyncMock(return_value=conversation)):
+            with patch.object(service, "_process_documents", AsyncMock(return_value=[doc])):
+                await service.process_message(
+                    user_id="user-1",
+                    company_id="company-1",
+                    message="Here's a receipt",
+                    attachments=[b"image"],
+                )
+        
+        roles = [call.args[0].role for call in mock_db.add.call_args_list]
+        assert roles == ["user", "assistant"]
+        sent = mock_llm.chat.await_args.args[0]
+        assert [m.role for m in sent] == ["system", "user", "system"]
+        assert "(id doc-1)" in sent[-1].content
+    
+    @pytest.mark.parametrize("reply,expected", [
+        ("Shall I SUBMIT these receipts?", True),
+        ("Please Confirm the amounts.", True),
+        ("I can Post To Manager.io once you agree.", True),
+        ("The total is 42.00.", False),
+    ])
+    async def test_confirmation_phrases_ignore_case(self, mock_tool_context, reply, expected):
+        """Replies mentioning a submission ask for confirmation, in any case."""
+        mock_db = AsyncMock(spec=AsyncSession)
+        mock_llm = MagicMock()
+        mock_llm.chat = AsyncMock(return_value=reply)
+        
+        with patch("app.services.agent.ToolContext", return_value=mock_tool_context):
+            with patch("app.services.agent.set_tool_context"):
+                with patch("app.services.agent.get_all_tools", return_value=[]):
+                    service = AgentService(db=mock_db, llm_service=mock_llm, ocr_service=MagicMock())
+        
+        conversation = MagicMock(id="conv-1")
+        with patch.object(service, "get_or_create_conversation", AsyncMock(return_value=conversation)):
+            response = await service.process_message(
+                user_id="user-1",
+                company_id="company-1",
+                message="Hello",
+            )
+        
+        assert response.requires_confirmation is expected
+
+
+# =============================================================================
+# Conversation History Query
+# =============================================================================
+
+
+class TestConversationHistoryQuery:
+    """Runs get_conversation_history against the test database."""
+    
+    @pytest.fixture
+    async def db(self):
+        """Provide a session on freshly created tables."""
+        from app.core.database import Base, get_engine, get_session_factory, init_db
+        
+        await init_db()
+        async with get_session_factory()() as session:
+            yield session
+        async with get_engine().begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+    
+    async def test_latest_messages_oldest_first(self, db, mock_tool_context):
+        """The newest `limit` messages come back in chronological order."""
+        from datetime import timedelta
+        
+        from app.models import ChatMessage, Conversation, User
+        
+        user = User(email="history@example.com", name="H", password_hash="x")
+        db.add(user)
+        await db.flush()
+        conversation = Conversation(user_id=user.id, title="t")
+        db.add(conversation)
+        await db.flush()
+        
+        base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        # Inserted out of order; the last two share a timestamp
+        for i in [3, 0, 4, 1, 2]:
+            db.add(ChatMessage(
+                id=f"00000000-0000-7000-8000-00000000000{i}",
+                conversation_id=conversation.id,
+                role="user",
+                content=f"Message {i}",
+                created_at=base_time + timedelta(minutes=min(i, 3)),
+            ))
+            await db.flush()
+        
+        with patch("app.services.agent.ToolContext", return_value=mock_tool_context):
+            with patch("app.services.agent.set_tool_context"):
+                with patch("app.services.agent.get_all_tools", return_value=[]):
+                    service = AgentService(db=db, llm_service=MagicMock(), ocr_service=MagicMock())
+        
+        messages = await service.get_conversation_history(conversation.id, limit=3)
+        
+        assert [m.content for m in messages] == ["Message 2", "Message 3", "Message 4"]
+    
+    async def test_messages_flushed_together_keep_save_order(self, db, mock_tool_context):
+        """Messages saved in one flush share created_at and reload in save order."""
+        from app.models import Conversation, User
+        
+        user = User(email="turns@example.com", name="T", password_hash="x")
+        db.add(user)
+        await db.flush()
+        conversation = Conversation(user_id=user.id, title="t")
+        db.add(conversation)
+        await db.flush()
+        
+        with patch("app.services.agent.ToolContext", return_value=mock_tool_context):
+            with patch("app.services.agent.set_tool_context"):
+                with patch("app.services.agent.get_all_tools", return_value=[]):
+                    service = AgentService(db=db, llm_service=MagicMock(), ocr_service=MagicMock())
+        
+        contents = [f"Message {i}" for i in range(30)]
+        for i, content in enumerate(contents):
+            await service.save_message(
+                conversation_id=conversation.id,
+                role=("user", "system", "assistant")[i % 3],
+                content=content,
+            )
+        await db.flush()
+        
+        messages = await service.get_conversation_history(conversation.id)
+        
+        assert [m.content for m in messages] == contents
+    
+    async def test_conversation_and_history_in_one_query(self, db, mock_tool_context):
+        """The combined accessor checks ownership and returns the latest messages."""
+        from app.models import ChatMessage, Conversation, User
+        
+        owner = User(email="owner@example.com", name="O", password_hash="x")
+        other = User(email="other@example.com", name="X", password_hash="x")
+        db.add_all([owner, other])
+        await db.flush()
+        conversation = Conversation(user_id=owner.id, title="t")
+        empty = Conversation(user_id=owner.id, title="empty")
+        db.add_all([conversation, empty])
+        await db.flush()
+        base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        for i in range(4):
+            db.add(ChatMessage(
+                id=f"00000000-0000-7000-8000-00000000000{i}",
+                conversation_id=conversation.id,
+                role="user",
+                content=f"Message {i}",
+                created_at=base_time,
+            ))
+        await db.flush()
+        
+        with patch("app.services.agent.ToolContext", return_value=mock_tool_context):
+            with patch("app.services.agent.set_tool_context"):
+                with patch("app.services.agent.get_all_tools", return_value=[]):
+                    service = AgentService(db=db, llm_service=MagicMock(), ocr_service=MagicMock())
+        
+        found, messages = await service.get_conversation_with_history(
+            owner.id, conversation.id, limit=2
+        )
+        assert found.id == conversation.id
+        assert [m.content for m in messages] == ["Message 2", "Message 3"]
+        
+        found, messages = await service.get_conversation_with_history(owner.id, empty.id)
+        assert found.id == empty.id
+        assert messages == []
+        
+        assert await service.get_conversation_with_history(other.id, conversation.id) == (None, [])
+
+
+class TestDocumentIdFilter:
+    """Tests for the dialect-specific document ID filter."""
+    
+    def _service(self, dialect_name, mock_tool_context):
+        db = MagicMock()
+        db.get_bind.return_value.dialect.name = dialect_name
+        with patch("app.services.agent.ToolContext", return_value=mock_tool_context):
+            with patch("app.services.agent.set_tool_context"):
+                with patch("app.services.agent.get_all_tools", return_value=[]):
+                    return AgentService(db=db, llm_service=MagicMock(), ocr_service=MagicMock())
+    
+    def test_postgresql_binds_single_array(self, mock_tool_context):
+        """PostgreSQL gets one array parameter whatever the number of IDs."""
+        from sqlalchemy.dialects import postgresql
+        
+        service = self._service("postgresql", mock_tool_context)
+        ids = [f"00000000-0000-7000-8000-00000000000{i}" for i in range(3)]
+        
+        compiled = service._document_id_filter(ids).compile(dialect=postgresql.dialect())
+        
+        assert "= ANY (%(document_ids)s::UUID[])" in str(compiled)
+        assert compiled.params == {"document_ids": ids}
+    
+    def test_other_dialects_use_in(self, mock_tool_context):
+        """Dialects without array binds fall back to IN."""
+        from sqlalchemy.dialects import sqlite
+        
+        service = self._service("sqlite", mock_tool_context)
+        
+        compiled = service._document_id_filter(["a", "b"]).compile(dialect=sqlite.dialect())
+        
+        assert " IN (" in str(compiled)
+
+
+class TestStructuredDataParsing:
+    """Tests for pulling the JSON object out of an extraction response."""
+    
+    @pytest.fixture
+    def agent_service(self, mock_tool_context):
+        """Create an AgentService with a mocked LLM."""
+        with patch("app.services.agent.ToolContext", return_value=mock_tool_context):
+            with patch("app.services.agent.set_tool_context"):
+                with patch("app.services.agent.get_all_tools", return_value=[]):
+                    return AgentService(
+                        db=AsyncMock(spec=AsyncSession),
+                        llm_service=MagicMock(),
+                        ocr_service=MagicMock(),
+                    )
+    
+    @staticmethod
+    def _stream(*chunks):
+        """Build a chat_stream replacement yielding the given chunks."""
+        consumed = []
+        
+        async def chat_stream(messages):
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+        
+        return chat_stream, consumed
+    
+    async def test_object_split_across_chunks(self, agent_service):
+        """Prose before the object and braces inside strings are handled."""
+        agent_service.llm_service.chat_stream, _ = self._stream(
+            'Here you go: {"vendor_name": "A {b',
+            '} \\"c\\"", "items": [{"x": 1}]',
+            "}\n```",
+        )
+        
+        result = await agent_service._extract_structured_data("text", "receipt", "c", "u")
+        
+        assert result == {"vendor_name": 'A {b} "c"', "items": [{"x": 1}]}
+    
+    async def test_stops_reading_once_object_closes(self, agent_service):
+        """Chunks after the object are never pulled from the stream."""
+        agent_service.llm_service.chat_stream, consumed = self._stream(
+            '{"total_amount": 3}', " trailing", " text",
+        )
+        
+        result = await agent_service._extract_structured_data("text", "receipt", "c", "u")
+        
+        assert result == {"total_amount": 3}
+        assert consumed == ['{"total_amount": 3}']
+    
+    async def test_extract_returns_raw_response_without_object(self, agent_service):
+        """Responses with no complete object are kept as raw text."""
+        agent_service.llm_service.chat_stream, _ = self._stream('{"total_amount": 1')
+        
+        result = await agent_service._extract_structured_data("text", "receipt", "c", "u")
+        
+        assert result == {"raw_response": '{"total_amount": 1'}
+    
+    async def test_extract_parses_fenced_object(self, agent_service):
+        """An object inside a code fence is parsed."""
+        agent_service.llm_service.chat_stream, _ = self._stream(
+            '```json\n{"total_amount": 12.5, "vendor_name": "Shop"}\n```'
+        )
+        
+        result = await agent_service._extract_structured_data("text", "receipt", "c", "u")
+        
+        assert result == {"total_amount": 12.5, "vendor_name": "Shop"}
+
+
+# =============================================================================
+# Duplicate Uploads
+# =============================================================================
+
+
+class TestDuplicateUploads:
+    """Re-uploading a file reuses the earlier results from the database."""
+    
+    @pytest.fixture
+    async def db(self):
+        """Provide a session on freshly created tables."""
+        from app.core.database import Base, get_engine, get_session_factory, init_db
+        
+        await init_db()
+        async with get_session_factory()() as session:
+            yield session
+        async with get_engine().begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+    
+    async def test_reupload_skips_ocr(self, db, mock_tool_context):
+        """A file already processed for the user is copied, not re-analyzed."""
+        from app.models import User
+        from app.services.ocr import OCRResult
+        
+        owner = User(email="dup@example.com", name="D", password_hash="x")
+        other = User(email="dup2@example.com", name="E", password_hash="x")
+        db.add_all([owner, other])
+        await db.flush()
+        
+        ocr = MagicMock()
+        ocr.extract_text = AsyncMock(return_value=OCRResult(text="Receipt Total 5.00"))
+        with patch("app.services.agent.ToolContext", return_value=mock_tool_context):
+            with patch("app.services.agent.set_tool_context"):
+                with patch("app.services.agent.get_all_tools", return_value=[]):
+                    service = AgentService(db=db, llm_service=MagicMock(), ocr_service=ocr)
+        service._extract_structured_data = AsyncMock(return_value={"total_amount": 5.0})
+        
+        first = await service.process_document(owner.id, None, b"receipt-bytes", "a.jpg")
+        again = await service.process_document(owner.id, None, b"receipt-bytes", "b.jpg")
+        [elsewhere] = await service._process_documents(other.id, None, [b"receipt-bytes"])
+        await db.flush()
+        
+        assert first.id != again.id
+        assert again.status == "processed"
+        assert again.extracted_data == {"total_amount": 5.0}
+        assert again.document_type == first.document_type
+        # Another user's upload of the same bytes is analyzed separately
+        assert elsewhere.status == "processed"
+        assert ocr.extract_text.await_count == 2
@@ -3,6 +3,8 @@
 Tests the LangChain agent tools that wrap ManagerIOClient methods.
 """
 
+import asyncio
+
 import pytest
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -32,6 +34,26 @@ from app.services.manager_io import (
 )
 
 
+async def _load_uncached(key, ttl, loader):
+    """Stand-in for ToolContext._cached_json that always calls the loader."""
+    return await loader()
+
+
+def _paginated(data):
+    """Stand-in for ManagerIOClient.iter_paginated over ``data[endpoint]``.
+    
+    An exception in place of the records is raised when iteration starts.
+    """
+    async def iter_paginated(endpoint, **kwargs):
+        records = data[endpoint]
+        if isinstance(records, Exception):
+            raise records
+        for record in records:
+            yield record
+    
+    return MagicMock(side_effect=iter_paginated)
+
+
 # =============================================================================
 # Test Data Models
 # =============================================================================
@@ -73,6 +95,23 @@ class TestTransactionModel:
         assert tx.account is None
         assert tx.reference is None
 
+    def test_transaction_is_lightweight_and_immutable(self):
+        """Test that Transaction is a frozen, slotted dataclass."""
+        import dataclasses
+
+        tx = Transaction(
+            key="tx-123",
+            date="2024-01-15",
+            description="Test payment",
+            amount=100.50,
+            transaction_type="payment",
+        )
+
+        assert not hasattr(tx, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            tx.amount = 1.0
+        assert dataclasses.asdict(tx)["transaction_type"] == "payment"
+
 
 class TestAccountBalanceModel:
     """Tests for the AccountBalance data model."""
@@ -298,18 +337,216 @@ class TestToolContext:
                 
                 # Cache should be cleared
                 assert len(context._clients) == 0
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_client_until_ttl(
+        self, mock_db, mock_redis, mock_encryption,
+    ):
+        """Concurrent first calls build one client; expiry rebuilds it."""
+        import asyncio
+        
+        from app.services import agent_tools
+        
+        context = ToolContext(
+            db=mock_db,
+            redis=mock_redis,
+            encryption_service=mock_encryption,
+        )
+        mock_company = MagicMock()
+        mock_company.base_url = "https://manager.example.com/api2"
+        
+        async def slow_get_by_id(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return mock_company
+        
+        with patch.object(
+            context._company_service, "get_by_id", side_effect=slow_get_by_id,
+        ) as mock_get:
+            with patch.object(
+                context._company_service, "decrypt_api_key", return_value="key",
+            ):
+                clients = await asyncio.gather(*(
+                    context.get_manager_io_client("company-123", "user-456")
+                    for _ in range(5)
+                ))
+                assert all(client is clients[0] for client in clients)
+                assert mock_get.call_count == 1
+                
+                with patch.object(agent_tools, "CLIENT_CACHE_TTL", -1):
+                    context._clients.clear()
+                    expired = await context.get_manager_io_client("company-123", "user-456")
+                fresh = await context.get_manager_io_client("company-123", "user-456")
+                
+                assert fresh is not expired
+                assert context._retired_clients == [expired]
+
+        await context.close()
+
+    @pytest.mark.asyncio
+    async def test_client_shared_across_users_with_access_check(
+        self, mock_db, mock_redis, mock_encryption,
+    ):
+        """Users of one company share a client but are each access-checked."""
+        context = ToolContext(
+            db=mock_db,
+            redis=mock_redis,
+            encryption_service=mock_encryption,
+        )
+        mock_company = MagicMock()
+        mock_company.base_url = "https://manager.example.com/api2"
+
+        with patch.object(
+            context._company_service,
+            "get_by_id",
+            new_callable=AsyncMock,
+            return_value=mock_company,
+        ) as mock_get:
+            with patch.object(
+                context._company_service, "decrypt_api_key", return_value="key",
+            ) as mock_decrypt:
+                first = await context.get_manager_io_client("company-123", "user-1")
+                second = await context.get_manager_io_client("company-123", "user-2")
+                again = await context.get_manager_io_client("company-123", "user-2")
+
+                assert first is second is again
+                assert mock_get.call_count == 2
+                assert mock_decrypt.call_count == 1
+
+                mock_get.side_effect = CompanyNotFoundError("company-123")
+                with pytest.raises(CompanyNotFoundError):
+                    await context.get_manager_io_client("company-123", "intruder")
+
+        await context.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_users_of_one_company_build_one_client(
+        self, mock_db, mock_redis, mock_encryption,
+    ):
+        """Concurrent callers across users decrypt the API key only once."""
+        import asyncio
+
+        context = ToolContext(
+            db=mock_db,
+            redis=mock_redis,
+            encryption_service=mock_encryption,
+        )
+        mock_company = MagicMock()
+        mock_company.base_url = "https://manager.example.com/api2"
+
+        async def slow_get_by_id(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return mock_company
+
+        with patch.object(
+            context._company_service, "get_by_id", side_effect=slow_get_by_id,
+        ) as mock_get:
+            with patch.object(
+                context._company_service, "decrypt_api_key", return_value="key",
+            ) as mock_decrypt:
+                clients = await asyncio.gather(*(
+                    context.get_manager_io_client("company-123", user_id)
+                    for user_id in ("user-1", "user-2") * 3
+                ))
+
+        assert all(client is clients[0] for client in clients)
+        assert mock_decrypt.call_count == 1
+        assert mock_get.call_count == 2
+        assert len(context._clients) == 1
+
+        await context.close()
+
+    @pytest.mark.asyncio
+    async def test_least_recently_used_client_is_retired(
+        self, mock_db, mock_redis, mock_encryption,
+    ):
+        """Beyond MAX_CACHED_CLIENTS the least recently used client is retired."""
+        from app.services import agent_tools
+
+        context = ToolContext(
+            db=mock_db,
+            redis=mock_redis,
+            encryption_service=mock_encryption,
+        )
+        mock_company = MagicMock()
+        mock_company.base_url = "https://manager.example.com/api2"
+
+        with patch.object(agent_tools, "MAX_CACHED_CLIENTS", 2):
+            with patch.object(
+                context._company_service,
+                "get_by_id",
+                new_callable=AsyncMock,
+                return_value=mock_company,
+            ):
+                with patch.object(
+                    context._company_service, "decrypt_api_key", return_value="key",
+                ):
+                    a = await context.get_manager_io_client("company-a", "user-1")
+                    b = await context.get_manager_io_client("company-b", "user-1")
+                    await context.get_manager_io_client("company-a", "user-1")
+                    await context.get_manager_io_client("company-c", "user-1")
+
+        assert list(context._clients) == ["company-a", "company-c"]
+        assert context._clients["company-a"][1] is a
+        assert context._retired_clients == [b]
+
+        await context.close()
+
+    @pytest.mark.asyncio
+    async def test_cached_json_loads_once_then_reads_redis(
+        self, mock_db, mock_encryption,
+    ):
+        """A miss stores the loaded value with a TTL; a hit skips the loader."""
+        store = {}
+        redis = AsyncMock()
+        redis.get.side_effect = lambda key: store.get(key)
+
+        async def fake_set(key, value, ex=None):
+            store[key] = value
+
+        redis.set.side_effect = fake_set
+        context = ToolContext(
+            db=mock_db,
+            redis=redis,
+            encryption_service=mock_encryption,
+        )
+        loader = AsyncMock(return_value=[{"key": "acc-1", "name": "Office"}])
+
+        first = await context._cached_json("agent_tools:coa:c1", 60, loader)
+        second = await context._cached_json("agent_tools:coa:c1", 60, loader)
+
+        assert first == second == [{"key": "acc-1", "name": "Office"}]
+        assert loader.await_count == 1
+        assert redis.set.call_args.kwargs == {"ex": 60}
+
+    @pytest.mark.asyncio
+    async def test_cached_json_falls_back_on_redis_errors(
+        self, mock_db, mock_encryption,
+    ):
+        """Redis failures are treated as misses."""
+        redis = AsyncMock()
+        redis.get.side_effect = ConnectionError("down")
+        redis.set.side_effect = ConnectionError("down")
+        context = ToolContext(
+            db=mock_db,
+            redis=redis,
+            encryption_service=mock_encryption,
+        )
+        loader = AsyncMock(return_value={"value": 1})
+
+        assert await context._cached_json("k", 60, loader) == {"value": 1}
+        assert loader.await_count == 1
 
 
 # =============================================================================
-# Test Global Context Functions
+# Test Context Functions
 # =============================================================================
 
 
 class TestGlobalContextFunctions:
-    """Tests for global context management functions."""
+    """Tests for tool context management functions."""
     
     def test_set_and_get_tool_context(self):
-        """Test setting and getting the global tool context."""
+        """Test setting and getting the tool context."""
         mock_db = AsyncMock()
         mock_encryption = MagicMock()
         context = ToolContext(db=mock_db, encryption_service=mock_encryption)
@@ -321,12 +558,56 @@ class TestGlobalContextFunctions:
     
     def test_get_tool_context_raises_when_not_set(self):
         """Test that get_tool_context raises when context not set."""
-        # Reset global context
+        # Reset the current context
         import app.services.agent_tools as agent_tools
-        agent_tools._tool_context = None
+        agent_tools._current_tool_context.set(None)
         
         with pytest.raises(RuntimeError, match="Tool context not set"):
             get_tool_context()
+    
+    def test_get_tool_context_has_no_global_fallback(self):
+        """Test that a context set elsewhere is not visible without its own."""
+        import contextvars
+        
+        set_tool_context(ToolContext(db=AsyncMock(), encryption_service=MagicMock()))
+        
+        with pytest.raises(RuntimeError, match="Tool context not set"):
+            contextvars.Context().run(get_tool_context)
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_tasks_keep_their_own_context(self):
+        """Test that each task sees the context it set, not a later one."""
+        first = ToolContext(db=AsyncMock(), encryption_service=MagicMock())
+        second = ToolContext(db=AsyncMock(), encryption_service=MagicMock())
+        first_set = asyncio.Event()
+        second_set = asyncio.Event()
+        
+        async def run(context, own_event, other_event):
+            set_tool_context(context)
+            own_event.set()
+            await other_event.wait()
+            return get_tool_context()
+        
+        seen = await asyncio.gather(
+            asyncio.create_task(run(first, first_set, second_set)),
+            asyncio.create_task(run(second, second_set, first_set)),
+        )
+        
+        assert seen == [first, second]
+    
+    @pytest.mark.asyncio
+    async def test_get_tool_client_uses_current_context(self):
+        """Test that get_tool_client resolves the client via the context."""
+        from app.services.agent_tools import get_tool_client
+        
+        context = MagicMock(spec=ToolContext)
+        client = MagicMock()
+        context.get_manager_io_client = AsyncMock(return_value=client)
+        
+        with patch("app.services.agent_tools.get_tool_context", return_value=context):
+            assert await get_tool_client("company-123", "user-456") is client
+        
+        context.get_manager_io_client.assert_awaited_once_with("company-123", "user-456")
 
 
 # =============================================================================
@@ -342,6 +623,7 @@ class TestGetChartOfAccountsTool:
         """Create a mock tool context."""
         context = MagicMock(spec=ToolContext)
         context.get_manager_io_client = AsyncMock()
+        context._cached_json = AsyncMock(side_effect=_load_uncached)
         return context
     
     @pytest.fixture
@@ -405,6 +687,7 @@ class TestGetSuppliersTool:
         """Create a mock tool context."""
         context = MagicMock(spec=ToolContext)
         context.get_manager_io_client = AsyncMock()
+        context._cached_json = AsyncMock(side_effect=_load_uncached)
         return context
     
     @pytest.fixture
@@ -441,6 +724,7 @@ class TestGetCustomersTool:
         """Create a mock tool context."""
         context = MagicMock(spec=ToolContext)
         context.get_manager_io_client = AsyncMock()
+        context._cached_json = AsyncMock(side_effect=_load_uncached)
         return context
     
     @pytest.fixture
@@ -477,6 +761,7 @@ class TestGetRecentTransactionsTool:
         """Create a mock tool context."""
         context = MagicMock(spec=ToolContext)
         context.get_manager_io_client = AsyncMock()
+        context._cached_json = AsyncMock(side_effect=_load_uncached)
         return context
     
     @pytest.fixture
@@ -557,6 +842,139 @@ class TestGetRecentTransactionsTool:
             # Should still return payments and transfers
             assert len(result) == 2
 
+    @pytest.mark.asyncio
+    async def test_get_recent_transactions_keeps_newest_within_limit(
+        self, mock_context, mock_client,
+    ):
+        """Test that only the newest ``limit`` are kept, ties in source order."""
+        mock_client.get_payments.return_value = PaginatedResponse(
+            items=[
+                {"Key": f"pay-{i}", "Date": f"2024-01-{10 + i:02d}", "Amount": 1}
+                for i in range(10)
+            ],
+            total=10,
+            skip=0,
+            take=10,
+        )
+        mock_client.get_receipts.return_value = PaginatedResponse(
+            items=[{"Key": "rec-tie", "Date": "2024-01-19", "Amount": 1}],
+            total=1,
+            skip=0,
+            take=10,
+        )
+        mock_context.get_manager_io_client.return_value = mock_client
+
+        with patch("app.services.agent_tools.get_tool_context", return_value=mock_context):
+            result = await get_recent_transactions.ainvoke({
+                "company_id": "company-123",
+                "user_id": "user-456",
+                "limit": 3,
+            })
+
+        assert [t["key"] for t in result] == ["pay-9", "rec-tie", "pay-8"]
+        mock_client.get_payments.assert_awaited_once_with(
+            skip=0, take=10, order_by="Date", desc=True,
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_recent_transactions_served_from_cache(
+        self, mock_context, mock_client,
+    ):
+        """Test that a cached snapshot short-circuits the Manager.io fetches."""
+        from app.services.agent_tools import RECENT_TRANSACTIONS_TTL
+
+        cached = [{"key": "pay-9", "date": "2024-02-01", "transaction_type": "payment"}]
+        mock_context._cached_json = AsyncMock(return_value=cached)
+        mock_context.get_manager_io_client.return_value = mock_client
+
+        with patch("app.services.agent_tools.get_tool_context", return_value=mock_context):
+            result = await get_recent_transactions.ainvoke({
+                "company_id": "company-123",
+                "user_id": "user-456",
+                "limit": 20,
+            })
+
+        assert result == cached
+        key, ttl, _ = mock_context._cached_json.call_args.args
+        assert key == "agent_tools:recent_tx:company-123:20"
+        assert ttl == RECENT_TRANSACTIONS_TTL
+        # Access is still checked before the cache is consulted
+        mock_context.get_manager_io_client.assert_awaited_once_with("company-123", "user-456")
+        mock_client.get_payments.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_recent_transactions_reads_either_key_casing(
+        self, mock_context, mock_client,
+    ):
+        """Test that lowercase fields are used only when CapitalCase is absent."""
+        mock_client.get_payments.return_value = PaginatedResponse(
+            items=[{
+                "key": "pay-2", "date": "2024-01-16", "description": "lower",
+                "amount": "12.5", "account": "acc-1", "Reference": None,
+                "reference": "ignored",
+            }],
+            total=1,
+            skip=0,
+            take=10,
+        )
+        mock_context.get_manager_io_client.return_value = mock_client
+
+        with patch("app.services.agent_tools.get_tool_context", return_value=mock_context):
+            result = await get_recent_transactions.ainvoke({
+                "company_id": "company-123",
+                "user_id": "user-456",
+                "limit": 50,
+            })
+
+        assert result[0] == {
+            "key": "pay-2",
+            "date": "2024-01-16",
+            "description": "lower",
+            "amount": 12.5,
+            "account": "acc-1",
+            "transaction_type": "payment",
+            "reference": None,
+        }
+        assert list(result[1]) == [
+            "key", "date", "description", "amount",
+            "account", "transaction_type", "reference",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_get_recent_transactions_fetches_sources_concurrently(
+        self, mock_context, mock_client,
+    ):
+        """Test that payments, receipts and transfers are requested together."""
+        import asyncio
+        
+        started = []
+        release = asyncio.Event()
+        
+        def gate(source, response):
+            async def fetch(**kwargs):
+                started.append(source)
+                if len(started) == 3:
+                    release.set()
+                # Only completes once all three requests are in flight
+                await asyncio.wait_for(release.wait(), timeout=1)
+                return response
+            return fetch
+        
+        for source in ("get_payments", "get_receipts", "get_transfers"):
+            method = getattr(mock_client, source)
+            method.side_effect = gate(source, method.return_value)
+        mock_context.get_manager_io_client.return_value = mock_client
+        
+        with patch("app.services.agent_tools.get_tool_context", return_value=mock_context):
+            result = await get_recent_transactions.ainvoke({
+                "company_id": "company-123",
+                "user_id": "user-456",
+                "limit": 50,
+            })
+        
+        assert len(started) == 3
+        assert [t["key"] for t in result] == ["pay-1", "rec-1", "xfer-1"]
+
 
 class TestGetAccountBalancesTool:
     """Tests for the get_account_balances tool."""
@@ -566,6 +984,7 @@ class TestGetAccountBalancesTool:
         """Create a mock tool context."""
         context = MagicMock(spec=ToolContext)
         context.get_manager_io_client = AsyncMock()
+        context._cached_json = AsyncMock(side_effect=_load_uncached)
         return context
     
     @pytest.fixture
@@ -579,17 +998,19 @@ class TestGetAccountBalancesTool:
             Account(key="acc-2", name="Bank", code="1100"),
         ])
         
-        # Mock paginated fetches
-        client.fetch_all_paginated = AsyncMock(side_effect=[
+        # Mock paginated streams
+        client.iter_paginated = _paginated({
             # Payments (outflows)
-            [{"Account": "acc-1", "Amount": 100.0}],
+            "/payments": [{"Account": "acc-1", "Amount": 100.0}],
             # Receipts (inflows)
-            [{"Account": "acc-1", "Amount": 500.0}],
+            "/receipts": [{"Account": "acc-1", "Amount": 500.0}],
             # Transfers
-            [{"FromAccount": "acc-1", "ToAccount": "acc-2", "Amount": 200.0}],
+            "/inter-account-transfers": [
+                {"FromAccount": "acc-1", "ToAccount": "acc-2", "Amount": 200.0},
+            ],
             # Journal entries
-            [{"Account": "acc-2", "Debit": 50.0, "Credit": 0.0}],
-        ])
+            "/journal-entry-lines": [{"Account": "acc-2", "Debit": 50.0, "Credit": 0.0}],
+        })
         
         return client
     
@@ -617,6 +1038,210 @@ class TestGetAccountBalancesTool:
             
             # acc-2: +200 (transfer in) + 50 (journal debit) = 250
             assert balances_by_key["acc-2"]["balance"] == 250.0
+            
+            assert [b["account_name"] for b in result["balances"]] == ["Bank", "Cash"]
+            assert result["total_assets"] == 450.0
+            assert result["total_liabilities"] == 0.0
+    
+    @pytest.mark.asyncio
+    async def test_get_account_balances_fetches_concurrently(self, mock_context, mock_client):
+        """Test that all crawls run together and a failed one is skipped."""
+        import asyncio
+        
+        in_flight = 0
+        peak = 0
+        data = {
+            "/payments": [{"Account": "acc-1", "Amount": 100.0}],
+            "/receipts": ManagerIOError("receipts unavailable"),
+            "/inter-account-transfers": [],
+            "/journal-entry-lines": [{"Account": "acc-2", "Debit": 50.0, "Credit": 0.0}],
+        }
+        
+        async def iter_paginated(endpoint, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if isinstance(data[endpoint], Exception):
+                raise data[endpoint]
+            for record in data[endpoint]:
+                yield record
+        
+        mock_client.iter_paginated = MagicMock(side_effect=iter_paginated)
+        mock_context.get_manager_io_client.return_value = mock_client
+        
+        with patch("app.services.agent_tools.get_tool_context", return_value=mock_context):
+            result = await get_account_balances.ainvoke({
+                "company_id": "company-123",
+                "user_id": "user-456",
+            })
+        
+        assert peak == 4
+        balances_by_key = {b["account_key"]: b["balance"] for b in result["balances"]}
+        assert balances_by_key == {"acc-1": -100.0, "acc-2": 50.0}
+        assert result["total_assets"] == 50.0
+        assert result["total_liabilities"] == 100.0
+    
+    @pytest.mark.asyncio
+    async def test_stream_balances_folds_each_record(self):
+        """Test each accumulator in cents with either key casing."""
+        from app.services.agent_tools import _BALANCE_SOURCES, _stream_balances
+        
+        client = MagicMock()
+        client.iter_paginated = _paginated({
+            "/payments": [{"Account": "a", "Amount": 10}, {"account": "b", "amount": "2.5"}],
+            "/receipts": [{"Account": "a", "Amount": 30}, {"Account": "", "Amount": 99}],
+            "/inter-account-transfers": [{"FromAccount": "a", "ToAccount": "c", "Amount": 5}],
+            "/journal-entry-lines": [{"Account": "c", "Debit": 1, "Credit": None}],
+        })
+        
+        partials = [
+            await _stream_balances(client, endpoint, add)
+            for endpoint, _, add in _BALANCE_SOURCES
+        ]
+        
+        assert [dict(p) for p in partials] == [
+            {"a": -1000, "b": -250},
+            {"a": 3000},
+            {"a": -500, "c": 500},
+            {"c": 100},
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_get_account_balances_discards_failed_stream(
+        self, mock_context, mock_client,
+    ):
+        """Test that a crawl failing part way contributes nothing."""
+        async def iter_paginated(endpoint, **kwargs):
+            if endpoint == "/receipts":
+                yield {"Account": "acc-1", "Amount": 500.0}
+                raise ManagerIOError("page 2 failed")
+            if endpoint == "/payments":
+                yield {"Account": "acc-1", "Amount": 100.0}
+        
+        mock_client.iter_paginated = MagicMock(side_effect=iter_paginated)
+        mock_context.get_manager_io_client.return_value = mock_client
+        
+        with patch("app.services.agent_tools.get_tool_context", return_value=mock_context):
+            result = await get_account_balances.ainvoke({
+                "company_id": "company-123",
+                "user_id": "user-456",
+            })
+        
+        assert [(b["account_key"], b["balance"]) for b in result["balances"]] == [
+            ("acc-1", -100.0),
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_stream_balances_folds_large_batches_in_threads(self):
+        """Test that full batches go to a worker thread and the rest inline."""
+        import asyncio
+        
+        from app.services import agent_tools
+        
+        client = MagicMock()
+        client.iter_paginated = _paginated({
+            "/receipts": [{"Account": "a", "Amount": 1}] * 5,
+        })
+        
+        with patch.object(agent_tools, "BALANCE_THREAD_BATCH", 2):
+            with patch.object(
+                agent_tools.asyncio, "to_thread", wraps=asyncio.to_thread,
+            ) as mock_to_thread:
+                balances = await agent_tools._stream_balances(
+                    client, "/receipts", agent_tools._add_receipt,
+                )
+        
+        assert dict(balances) == {"a": 500}
+        assert mock_to_thread.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_get_account_balances_reads_cached_account_names(
+        self, mock_context, mock_client,
+    ):
+        """Test that a cached name map is used without loading the chart."""
+        async def cached_json(key, ttl, loader):
+            if key == "agent_tools:coa_map:company-123":
+                return {"acc-1": "Petty Cash"}
+            return await loader()
+
+        mock_context._cached_json = AsyncMock(side_effect=cached_json)
+        mock_context.get_manager_io_client.return_value = mock_client
+
+        with patch("app.services.agent_tools.get_tool_context", return_value=mock_context):
+            result = await get_account_balances.ainvoke({
+                "company_id": "company-123",
+                "user_id": "user-456",
+            })
+
+        names = {b["account_key"]: b["account_name"] for b in result["balances"]}
+        assert names == {"acc-1": "Petty Cash", "acc-2": "acc-2"}
+        mock_client.get_chart_of_accounts.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_account_balances_caches_source_totals(
+        self, mock_context, mock_client,
+    ):
+        """Test that a repeat call reuses each source's totals without crawling."""
+        store = {}
+        ttls = {}
+
+        async def cached_json(key, ttl, loader):
+            if key not in store:
+                store[key] = await loader()
+                ttls[key] = ttl
+            return store[key]
+
+        mock_client.cache_ttl = 300
+        mock_context._cached_json = AsyncMock(side_effect=cached_json)
+        mock_context.get_manager_io_client.return_value = mock_client
+
+        with patch("app.services.agent_tools.get_tool_context", return_value=mock_context):
+            first = await get_account_balances.ainvoke({
+                "company_id": "company-123",
+                "user_id": "user-456",
+            })
+            second = await get_account_balances.ainvoke({
+                "company_id": "company-123",
+                "user_id": "user-456",
+            })
+
+        assert second["balances"] == first["balances"]
+        assert mock_client.iter_paginated.call_count == 4
+        assert store["agent_tools:balances:company-123:/payments"] == {"acc-1": -10000}
+        assert ttls["agent_tools:balances:company-123:/receipts"] == 300
+
+    def test_to_cents_is_exact(self):
+        """Test amount conversion to integer cents."""
+        from app.services.agent_tools import _to_cents
+        
+        assert _to_cents(0.1) + _to_cents(0.2) == _to_cents(0.3) == 30
+        assert _to_cents("1234.565") == 123456
+        assert _to_cents(-19.99) == -1999
+        assert _to_cents(None) == 0
+        assert _to_cents("") == 0
+    
+    @pytest.mark.asyncio
+    async def test_get_account_balances_totals_are_exact(self, mock_context, mock_client):
+        """Test that many small amounts sum without float drift."""
+        mock_client.iter_paginated = _paginated({
+            "/payments": [],
+            "/receipts": [{"Account": "acc-1", "Amount": 0.1}] * 10,
+            "/inter-account-transfers": [],
+            "/journal-entry-lines": [],
+        })
+        mock_context.get_manager_io_client.return_value = mock_client
+        
+        with patch("app.services.agent_tools.get_tool_context", return_value=mock_context):
+            result = await get_account_balances.ainvoke({
+                "company_id": "company-123",
+                "user_id": "user-456",
+            })
+        
+        assert result["balances"][0]["balance"] == 1.0
+        assert result["total_assets"] == 1.0
+        assert result["total_liabilities"] == 0.0
 
 
 # =============================================================================
@@ -839,6 +1464,98 @@ class TestExtractKeywords:
         assert "am" not in keywords
         assert "at" not in keywords
         assert "my" not in keywords
+    
+    def test_extract_keywords_is_memoized(self):
+        """Repeated descriptions reuse the cached, immutable keyword set."""
+        from app.services.agent_tools import _extract_keywords
+        
+        _extract_keywords.cache_clear()
+        
+        first = _extract_keywords("Monthly Internet Bill")
+        second = _extract_keywords("Monthly Internet Bill")
+        
+        assert first == frozenset({"monthly", "internet", "bill"})
+        assert second is first
+        assert _extract_keywords.cache_info().hits == 1
+    
+    def test_extract_keywords_are_interned(self):
+        """Extracted keywords are the same objects as the EXPENSE_KEYWORDS entries."""
+        from app.services.agent_tools import EXPENSE_KEYWORDS, _extract_keywords
+        
+        (internet,) = _extract_keywords("INTER" + "NET!")
+        
+        assert internet is next(k for k in EXPENSE_KEYWORDS["internet"] if k == "internet")
+    
+    def test_extract_keywords_matches_normalized_split(self):
+        """The one-pass regex yields the words of the normalized text, 3+ chars long."""
+        from app.services.agent_tools import _extract_keywords, _normalize_for_matching
+        
+        for text in ("Café-Bar #12, Ltd.", "A/C repair & HVAC", "", "x1 yz2 abc3\tdef"):
+            normalized = _normalize_for_matching(text).split()
+            assert _extract_keywords(text) == frozenset(w for w in normalized if len(w) >= 3)
+
+
+class TestNamedRecords:
+    """Tests for the _named_records helper."""
+    
+    def test_splits_named_records_into_parallel_columns(self):
+        """Unnamed records are dropped and names line up with their records."""
+        from app.services.agent_tools import _named_records
+        
+        records = [{"key": "1", "name": "Rent"}, {"key": "2"}, {"key": "3", "name": ""},
+                   {"key": "4", "name": "Fuel"}]
+        
+        rows, names = _named_records(records)
+        
+        assert names == ("Rent", "Fuel")
+        assert rows == (records[0], records[3])
+        assert _named_records([{"key": "x"}]) == ((), ())
+
+
+class TestKeywordCategoryIndex:
+    """Tests for the inverted EXPENSE_KEYWORDS lookup."""
+    
+    def test_index_matches_category_scan(self):
+        """Every keyword maps to exactly the categories that list it, in order."""
+        from app.services.agent_tools import EXPENSE_KEYWORDS, _KEYWORD_TO_CATEGORIES
+        
+        assert all(isinstance(kws, frozenset) for kws in EXPENSE_KEYWORDS.values())
+        keywords = {kw for kws in EXPENSE_KEYWORDS.values() for kw in kws}
+        assert set(_KEYWORD_TO_CATEGORIES) == keywords
+        for keyword in keywords:
+            expected = tuple(c for c, kws in EXPENSE_KEYWORDS.items() if keyword in kws)
+            assert _KEYWORD_TO_CATEGORIES[keyword] == expected
+    
+    def test_description_profile_is_built_once(self):
+        """A description is normalized and tokenized once for all accounts."""
+        from app.services import agent_tools
+        
+        agent_tools._profile_description.cache_clear()
+        accounts = [{"key": str(i), "name": name} for i, name in
+                    enumerate(["Office Supplies", "Travel", "Bank Fees", "Rent"])]
+        
+        agent_tools.categorize_expense.invoke({
+            "description": "Printer toner for office",
+            "amount": 10.0,
+            "accounts": accounts,
+        })
+        
+        desc = agent_tools._profile_description("Printer toner for office")
+        assert agent_tools._profile_description.cache_info().misses == 1
+        assert desc.keywords == frozenset({"printer", "toner", "for", "office"})
+        assert desc.normalized == "printer toner for office"
+    
+    def test_description_categories_in_category_order(self):
+        """Description hits come back in EXPENSE_KEYWORDS order with their keywords."""
+        from app.services.agent_tools import EXPENSE_KEYWORDS, _description_categories
+        
+        hits = _description_categories(frozenset({"printer", "flight"}))
+        
+        categories = [category for category, _ in hits]
+        order = list(EXPENSE_KEYWORDS)
+        assert categories == sorted(categories, key=order.index)
+        assert ("office", frozenset({"printer"})) in hits
+        assert ("travel", frozenset({"flight"})) in hits
 
 
 class TestFuzzyMatchScore:
@@ -956,6 +1673,50 @@ class TestExtractDocumentDataTool:
             
             assert result["success"] is False
             assert "OCR failed" in result["error"]
+    
+    @pytest.mark.asyncio
+    async def test_extract_document_data_shares_identical_concurrent_requests(
+        self, mock_context, mock_ocr_service
+    ):
+        """Concurrent extractions of the same bytes send one OCR request."""
+        import asyncio
+        from app.services.agent_tools import _OCR_IN_FLIGHT, extract_document_data
+        from app.services.ocr import OCRResult
+        
+        release = asyncio.Event()
+        
+        async def slow_extract(image_data):
+            await release.wait()
+            return OCRResult(text="Receipt", pages=1, page_texts=["Receipt"])
+        
+        mock_ocr_service.extract_text = AsyncMock(side_effect=slow_extract)
+        mock_context.get_ocr_service.return_value = mock_ocr_service
+        
+        with patch("app.services.agent_tools.get_tool_context", return_value=mock_context):
+            calls = [
+                asyncio.create_task(extract_document_data.ainvoke({"image_data": data}))
+                for data in (b"\x89PNG same", b"\x89PNG same", b"\x89PNG other")
+            ]
+            # Let every call reach the OCR step before the first one finishes
+            for _ in range(20):
+                await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(*calls)
+        
+        assert [r["text"] for r in results] == ["Receipt"] * 3
+        assert mock_ocr_service.extract_text.await_count == 2
+        assert not _OCR_IN_FLIGHT
+    
+    def test_is_pdf_sniffs_header(self):
+        """PDFs are recognized with or without a BOM or leading whitespace."""
+        from app.services.agent_tools import _is_pdf
+        
+        assert _is_pdf(b"%PDF-1.7\n")
+        assert _is_pdf(b"\xef\xbb\xbf%PDF-1.4")
+        assert _is_pdf(b"\r\n  %PDF-1.5")
+        assert not _is_pdf(b"\x89PNG\r\n\x1a\n")
+        assert not _is_pdf(b"hello %PDF-1.4")
+        assert not _is_pdf(b"")
 
 
 class TestCategorizeExpenseTool:
@@ -1038,6 +1799,41 @@ class TestCategorizeExpenseTool:
         # Should return first account as fallback
         assert result["key"] == "acc-1"
         assert result["score"] == 0.0
+    
+    def test_categorize_expense_profiles_each_account_once(self, sample_accounts):
+        """Account features are precomputed once and match the pairwise scorer."""
+        from app.services import agent_tools
+        
+        description = "Printer paper and ink cartridges"
+        agent_tools._account_index.cache_clear()
+        with patch.object(
+            agent_tools, "_profile_account", wraps=agent_tools._profile_account
+        ) as profile:
+            result = agent_tools.categorize_expense.invoke({
+                "description": description,
+                "amount": 75.00,
+                "accounts": sample_accounts + [{"key": "acc-6", "name": ""}],
+            })
+        
+        assert profile.call_count == len(sample_accounts)
+        expected_score, _ = agent_tools._calculate_keyword_score(
+            description, "Office Supplies"
+        )
+        assert result["score"] == round(expected_score, 3)
+    
+    def test_account_index_scores_match_per_account_scorer(self, sample_accounts):
+        """Column-wise scores equal the per-account scorer for every account."""
+        from app.services import agent_tools
+        
+        names = tuple(a["name"] for a in sample_accounts) + ("Office Rent", "Bank Fees")
+        index = agent_tools._AccountIndex(names)
+        
+        for description in ("Printer ink and office paper", "Hotel for rent review", "xyz"):
+            scores = index.scores(agent_tools._profile_description(description))
+            
+            for column, name in enumerate(names):
+                expected, _ = agent_tools._calculate_keyword_score(description, name)
+                assert scores[column] == expected
 
 
 class TestIdentifySupplierTool:
@@ -1143,6 +1939,225 @@ class TestIdentifySupplierTool:
         # The important thing is the threshold is respected
         if result["score"] < 0.95:
             assert result["matched"] is False
+    
+    def test_identify_suppliers_batch_matches_pairwise_scoring(self, sample_suppliers):
+        """The batch form agrees with _fuzzy_match_score and keeps input order."""
+        from app.services.agent_tools import _fuzzy_match_score, identify_suppliers_batch
+        
+        vendors = ["Microsoft Corp", "", "Amazon Web Svcs", "Zebra Plumbing"]
+        results = identify_suppliers_batch(vendors, sample_suppliers + [{"key": "x"}])
+        
+        assert len(results) == len(vendors)
+        assert results[0]["key"] == "sup-4"
+        assert results[1] == {"key": "", "name": "", "score": 0.0, "matched": False}
+        assert results[2]["key"] == "sup-3"
+        assert results[3]["matched"] is False
+        for vendor, result in zip(vendors, results):
+            if vendor:
+                expected = max(
+                    _fuzzy_match_score(vendor, s["name"]) for s in sample_suppliers
+                )
+                assert result["score"] == round(expected, 3)
+    
+    def test_supplier_score_matrix_prunes_without_changing_best(self, sample_suppliers):
+        """best_only passes a cutoff to cdist yet keeps each row's best score."""
+        from app.services import agent_tools
+        
+        names = [s["name"] for s in sample_suppliers]
+        vendors = ["Acme Corp", "Office Depot Inc"]
+        full = agent_tools._supplier_score_matrix(vendors, names)
+        
+        with patch.object(
+            agent_tools.process, "cdist", wraps=agent_tools.process.cdist
+        ) as cdist:
+            pruned = agent_tools._supplier_score_matrix(vendors, names, best_only=True)
+        
+        assert cdist.call_args.kwargs["score_cutoff"] > 0
+        assert (pruned.argmax(axis=1) == full.argmax(axis=1)).all()
+        assert (pruned.max(axis=1) == full.max(axis=1)).all()
+        for row, vendor in enumerate(vendors):
+            for column, name in enumerate(names):
+                assert full[row, column] == agent_tools._fuzzy_match_score(vendor, name)
+    
+    def test_cdist_parallel_only_for_large_matrices(self):
+        """Small score matrices stay single-threaded; large ones use every core."""
+        from app.services.agent_tools import FUZZY_PARALLEL_MIN_PAIRS, _cdist_workers
+        
+        assert _cdist_workers(1, 500) == 1
+        assert _cdist_workers(4, FUZZY_PARALLEL_MIN_PAIRS // 4) == -1
+    
+    def test_supplier_score_matrix_keeps_boundary_winner(self):
+        """A pair scoring just above a containment match is not pruned away."""
+        from app.services.agent_tools import _fuzzy_match_score, identify_suppliers_batch
+        
+        suppliers = [{"key": "a", "name": "aba"}, {"key": "b", "name": "ba corp abab"}]
+        result = identify_suppliers_batch(["abab corp ba"], suppliers)[0]
+        
+        # 0.6 * (10/12) + 0.4 beats the 0.9 containment score by a rounding hair
+        assert _fuzzy_match_score("abab corp ba", "ba corp abab") > 0.9
+        assert result["key"] == "b"
+    
+    def test_supplier_index_matches_pairwise_containment(self):
+        """The index finds the same exact and containment pairs as a full sweep."""
+        from app.services.agent_tools import _SupplierIndex
+        
+        names = ("acme corp", "acme", "corp", "", "acme corporation", "acme", "ba")
+        index = _SupplierIndex(names)
+        
+        for vendor in ("acme", "acme corp", "the acme corporation ltd", "abacus", ""):
+            expected = {}
+            for column, name in enumerate(names):
+                if vendor == name:
+                    expected[column] = 1.0
+                elif vendor in name or name in vendor:
+                    expected[column] = 0.9
+            assert index.overrides(vendor) == expected
+    
+    def test_supplier_index_counts_shared_tokens(self):
+        """Token postings count distinct shared tokens per supplier."""
+        from app.services.agent_tools import _SupplierIndex
+        
+        index = _SupplierIndex(("acme corp", "corp corp", "globex"))
+        
+        assert index.common_tokens(frozenset({"acme", "corp"})).tolist() == [2.0, 1.0, 0.0]
+        assert index.token_counts.tolist() == [2.0, 1.0, 1.0]
+    
+    def test_supplier_index_is_reused_for_same_names(self):
+        """The index is built once per distinct supplier name list."""
+        from app.services.agent_tools import _supplier_index, identify_suppliers_batch
+        
+        suppliers = [{"key": "1", "name": "Initech"}, {"key": "2", "name": "Globex"}]
+        _supplier_index.cache_clear()
+        
+        identify_suppliers_batch(["Initech LLC"], suppliers)
+        identify_suppliers_batch(["Globex Inc"], suppliers)
+        
+        assert _supplier_index.cache_info().misses == 1
+        assert _supplier_index.cache_info().hits == 1
+
+
+class TestHandleForexTool:
+    """Tests for the handle_forex tool."""
+    
+    def test_converts_in_exact_cents(self):
+        """Conversion rounds the exact product half-up, not the float product."""
+        from app.services.agent_tools import handle_forex
+        
+        result = handle_forex.invoke({
+            "amount": 1.005,
+            "from_currency": "usd",
+            "to_currency": "EUR",
+            "exchange_rate": 1.0,
+        })
+        
+        assert result["converted_amount"] == 1.01
+        assert result["original_currency"] == "USD"
+        assert result["rate_source"] == "provided"
+    
+    def test_converts_with_rate(self):
+        """A provided rate multiplies the amount."""
+        from app.services.agent_tools import handle_forex
+        
+        result = handle_forex.invoke({
+            "amount": 100.0,
+            "from_currency": "USD",
+            "to_currency": "HKD",
+            "exchange_rate": 7.8125,
+        })
+        
+        assert result["converted_amount"] == 781.25
+        assert result["needs_manual_rate"] is False
+
+
+class TestGetFinancialSnapshotTool:
+    """Tests for the get_financial_snapshot tool."""
+    
+    @pytest.fixture
+    def mock_client(self):
+        """Create a mock ManagerIOClient returning one dict per report."""
+        client = AsyncMock()
+        client.get_balance_sheet = AsyncMock(return_value={"report": "bs"})
+        client.get_profit_and_loss = AsyncMock(return_value={"report": "pl"})
+        client.get_trial_balance = AsyncMock(return_value={"report": "tb"})
+        client.get_aged_receivables = AsyncMock(return_value={"report": "ar"})
+        client.get_aged_payables = AsyncMock(return_value={"report": "ap"})
+        return client
+    
+    @pytest.mark.asyncio
+    async def test_fetches_reports_concurrently(self, mock_client):
+        """All reports are in flight before any of them returns."""
+        from app.services.agent_tools import get_financial_snapshot
+        
+        started = 0
+        all_started = asyncio.Event()
+        
+        async def report(*args):
+            nonlocal started
+            started += 1
+            if started == 5:
+                all_started.set()
+            await asyncio.wait_for(all_started.wait(), timeout=1)
+            return {"args": list(args)}
+        
+        for name in (
+            "get_balance_sheet", "get_profit_and_loss", "get_trial_balance",
+            "get_aged_receivables", "get_aged_payables",
+        ):
+            setattr(mock_client, name, AsyncMock(side_effect=report))
+        
+        with patch("app.services.agent_tools.get_tool_client", AsyncMock(return_value=mock_client)):
+            result = await get_financial_snapshot.ainvoke({
+                "company_id": "company-123",
+                "user_id": "user-456",
+                "as_of_date": "2024-06-30",
+                "from_date": "2024-01-01",
+            })
+        
+        assert result["success"] is True
+        reports = result["reports"]
+        assert reports["balance_sheet"] == {
+            "success": True, "report_type": "balance_sheet",
+            "as_of_date": "2024-06-30", "data": {"args": ["2024-06-30"]},
+        }
+        assert reports["profit_and_loss"]["data"] == {"args": ["2024-01-01", "2024-06-30"]}
+        assert reports["aged_payables"]["data"] == {"args": []}
+    
+    @pytest.mark.asyncio
+    async def test_failed_report_does_not_fail_others(self, mock_client):
+        """A failing report is flagged while the rest are returned."""
+        from app.services.agent_tools import get_financial_snapshot
+        
+        mock_client.get_trial_balance = AsyncMock(side_effect=ManagerIOError("boom"))
+        
+        with patch("app.services.agent_tools.get_tool_client", AsyncMock(return_value=mock_client)):
+            result = await get_financial_snapshot.ainvoke({
+                "company_id": "company-123",
+                "user_id": "user-456",
+            })
+        
+        assert result["success"] is False
+        assert result["reports"]["trial_balance"] == {
+            "success": False, "report_type": "trial_balance",
+            "message": "Manager.io API error: boom",
+        }
+        assert result["reports"]["balance_sheet"]["data"] == {"report": "bs"}
+    
+    @pytest.mark.asyncio
+    async def test_company_not_found(self):
+        """An inaccessible company fails the snapshot without fetching."""
+        from app.services.agent_tools import get_financial_snapshot
+        
+        get_client = AsyncMock(side_effect=CompanyNotFoundError("missing"))
+        with patch("app.services.agent_tools.get_tool_client", get_client):
+            result = await get_financial_snapshot.ainvoke({
+                "company_id": "company-123",
+                "user_id": "user-456",
+            })
+        
+        assert result == {
+            "success": False, "report_type": "financial_snapshot",
+            "message": "Company not found: company-123",
+        }
 
 
 # =============================================================================
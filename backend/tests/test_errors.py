@@ -0,0 +1,216 @@
+"""Unit tests for standardized error responses."""
+
+import orjson
+import pytest
+from fastapi import status
+from pydantic import ValidationError as PydanticValidationError
+
+from app.core.errors import (
+    RETRYABLE_ERRORS,
+    SUGGESTED_ACTIONS,
+    AppException,
+    ErrorCode,
+    ErrorResponse,
+    NotFoundError,
+    RateLimitError,
+    ServiceUnavailableError,
+    ValidationError,
+    create_error_response,
+    get_status_code,
+    get_suggested_action,
+    is_retryable,
+)
+
+
+class TestCreateErrorResponse:
+    """Tests for create_error_response."""
+
+    def test_defaults_from_suggested_action(self):
+        """Test that the suggested action is used as the default message."""
+        response = create_error_response(ErrorCode.AUTH_TOKEN_EXPIRED)
+
+        assert isinstance(response, ErrorResponse)
+        assert response.error == "AUTH_TOKEN_EXPIRED"
+        assert response.error_code == "AUTH_TOKEN_EXPIRED"
+        assert response.message == SUGGESTED_ACTIONS[ErrorCode.AUTH_TOKEN_EXPIRED]
+        assert response.suggested_action == response.message
+        assert response.is_retryable is False
+        assert response.details is None
+        assert response.retry_after is None
+
+    def test_overrides(self):
+        """Test that message, details and retry_after override the template."""
+        response = create_error_response(
+            ErrorCode.MANAGER_IO_RATE_LIMITED,
+            message="Slow down",
+            details={"endpoint": "/payments"},
+            retry_after=30,
+        )
+
+        assert response.message == "Slow down"
+        assert response.details == {"endpoint": "/payments"}
+        assert response.retry_after == 30
+        assert response.is_retryable is True
+
+    def test_overrides_do_not_leak_between_calls(self):
+        """Test that patching one response leaves the template untouched."""
+        create_error_response(ErrorCode.TIMEOUT, message="custom", retry_after=5)
+        response = create_error_response(ErrorCode.TIMEOUT)
+
+        assert response.message == SUGGESTED_ACTIONS[ErrorCode.TIMEOUT]
+        assert response.retry_after is None
+
+    def test_response_is_frozen_and_strict(self):
+        """Test that ErrorResponse rejects mutation and unknown fields."""
+        response = create_error_response(ErrorCode.TIMEOUT)
+
+        with pytest.raises(PydanticValidationError):
+            response.message = "changed"
+        with pytest.raises(PydanticValidationError):
+            ErrorResponse(error="x", error_code="x", message="x", unexpected=1)
+
+    def test_every_code_has_a_response(self):
+        """Test that all error codes produce a serializable response."""
+        for code in ErrorCode:
+            dumped = create_error_response(code).model_dump()
+            assert dumped["error_code"] == code.value
+            assert dumped["message"]
+
+
+class TestErrorLookups:
+    """Tests for code-indexed error lookups."""
+
+    def test_lookups_match_source_tables(self):
+        """Test that the lookup tables agree with the public dict and set."""
+        for code in ErrorCode:
+            assert get_suggested_action(code) == SUGGESTED_ACTIONS.get(code)
+            assert is_retryable(code) == (code in RETRYABLE_ERRORS)
+
+    def test_codes_index_by_definition_order(self):
+        """Test that error codes act as list indices in definition order."""
+        codes = list(ErrorCode)
+
+        assert [code.__index__() for code in codes] == list(range(len(codes)))
+        assert codes[ErrorCode.TIMEOUT] is ErrorCode.TIMEOUT
+        assert str(ErrorCode.TIMEOUT) == "TIMEOUT"
+
+    def test_status_codes_follow_error_code(self):
+        """Test that AppException takes its default status from the code."""
+        assert get_status_code(ErrorCode.AUTH_TOKEN_EXPIRED) == status.HTTP_401_UNAUTHORIZED
+        assert get_status_code(ErrorCode.INVALID_JSON) == status.HTTP_400_BAD_REQUEST
+        assert AppException(ErrorCode.NOT_FOUND).status_code == status.HTTP_404_NOT_FOUND
+        assert (
+            AppException(ErrorCode.NOT_FOUND, status_code=status.HTTP_410_GONE).status_code
+            == status.HTTP_410_GONE
+        )
+
+    def test_subclasses_keep_their_status(self):
+        """Test that each subclass keeps its status whatever the code."""
+        assert NotFoundError().status_code == status.HTTP_404_NOT_FOUND
+        assert (
+            ValidationError(ErrorCode.INVALID_JSON).status_code
+            == status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+        assert (
+            ServiceUnavailableError(ErrorCode.MANAGER_IO_RATE_LIMITED).status_code
+            == status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+        assert RateLimitError().status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    def test_payload_strings_are_shared(self):
+        """Test that payloads reuse the interned code and action strings."""
+        first = create_error_response(ErrorCode.LLM_TIMEOUT)
+        second = create_error_response(ErrorCode.LLM_TIMEOUT)
+
+        assert first.error_code is second.error_code is ErrorCode.LLM_TIMEOUT.value
+        assert first.suggested_action is SUGGESTED_ACTIONS[ErrorCode.LLM_TIMEOUT]
+
+
+class TestAppException:
+    """Tests for AppException and its subclasses."""
+
+    def test_detail_matches_error_response(self):
+        """Test that the HTTP detail carries the standardized payload."""
+        exc = AppException(
+            ErrorCode.VALIDATION_ERROR,
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            details={"field": "date"},
+        )
+
+        assert exc.status_code == 422
+        assert exc.detail["error_code"] == "VALIDATION_ERROR"
+        assert exc.detail["details"] == {"field": "date"}
+        assert exc.error_response.model_dump() == exc.detail
+
+    def test_empty_details_are_kept(self):
+        """Test that an explicit empty details dict is not replaced by None."""
+        exc = AppException(ErrorCode.VALIDATION_ERROR, details={})
+
+        assert exc.detail["details"] == {}
+        assert orjson.loads(exc.body_bytes)["details"] == {}
+
+    def test_rate_limit_error(self):
+        """Test that rate limit errors carry retry_after."""
+        exc = RateLimitError()
+
+        assert exc.status_code == 429
+        assert exc.detail["retry_after"] == 60
+        assert exc.detail["is_retryable"] is False
+
+    def test_error_response_is_lazy_and_cached(self):
+        """Test that error_response is built on first access and reused."""
+        exc = AppException(ErrorCode.NOT_FOUND, status_code=404)
+
+        assert "error_response" not in exc.__dict__
+        assert exc.error_response is exc.error_response
+        assert exc.error_response.error_code == "NOT_FOUND"
+
+    def test_body_bytes_prebuilt_without_overrides(self):
+        """Test that default errors reuse the prebuilt serialized body."""
+        first = AppException(ErrorCode.AUTH_TOKEN_EXPIRED, status_code=401)
+        second = AppException(ErrorCode.AUTH_TOKEN_EXPIRED, status_code=401)
+
+        assert first.body_bytes is second.body_bytes
+        assert orjson.loads(first.body_bytes) == first.detail
+
+    def test_body_bytes_with_overrides(self):
+        """Test that overridden errors serialize their own detail."""
+        exc = AppException(ErrorCode.NOT_FOUND, status_code=404, message="No such invoice")
+
+        assert orjson.loads(exc.body_bytes)["message"] == "No such invoice"
+
+    def test_canned_retry_bodies_are_memoized(self):
+        """Test that repeated canned errors with a retry delay share one body."""
+        first = RateLimitError(retry_after=30)
+        second = RateLimitError(retry_after=30)
+
+        assert first.body_bytes is second.body_bytes
+        assert orjson.loads(first.body_bytes) == first.detail
+        assert RateLimitError(retry_after=5).body_bytes is not first.body_bytes
+
+
+class TestAppExceptionHandler:
+    """Tests for the application-level AppException handler."""
+
+    async def test_handler_writes_payload(self):
+        """Test that the handler returns the payload as the JSON body."""
+        from app.main import app_exception_handler
+
+        exc = RateLimitError(retry_after=15)
+        response = await app_exception_handler(None, exc)
+
+        assert response.status_code == 429
+        assert response.media_type == "application/json"
+        assert orjson.loads(response.body)["retry_after"] == 15
+        assert response.headers["retry-after"] == "15"
+
+    async def test_handler_omits_retry_after_without_delay(self):
+        """Test that errors without a retry delay send no Retry-After header."""
+        from app.main import app_exception_handler
+
+        exc = AppException(ErrorCode.NOT_FOUND, status_code=status.HTTP_404_NOT_FOUND)
+        response = await app_exception_handler(None, exc)
+
+        assert response.status_code == 404
+        assert "retry-after" not in response.headers
+        assert response.body == exc.body_bytes
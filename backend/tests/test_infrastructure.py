@@ -1,20 +1,22 @@
 """Tests for backend infrastructure setup."""
 
+import anyio.to_thread
+import orjson
 import pytest
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
+from app.core.config import get_settings, settings
 from app.core.database import (
     Base,
-    async_session_factory,
-    engine,
     get_db,
+    get_engine,
+    get_session_factory,
     get_db_context,
     init_db,
 )
-from app.main import app
+from app.main import app, lifespan
 from app.models.base import BaseModel, generate_uuid
 
 
@@ -34,6 +36,23 @@ class TestConfig:
             ("sqlite", "postgresql")
         ), f"Unexpected database URL format: {settings.database_url}"
 
+    def test_get_settings_is_cached(self):
+        """Test that get_settings returns the shared settings instance."""
+        assert get_settings() is get_settings()
+        assert get_settings() is settings
+
+    def test_database_url_masked(self):
+        """Test that credentials are stripped from the logged database URL."""
+        from app.core.config import Settings
+
+        masked = Settings(database_url="postgresql+asyncpg://u:p@db:5432/app")
+
+        assert masked.database_url_masked == "db:5432/app"
+        assert masked.database_url_masked is masked.database_url_masked
+        assert Settings(database_url="sqlite+aiosqlite:///x.db").database_url_masked == (
+            "sqlite+aiosqlite:///x.db"
+        )
+
     def test_jwt_settings(self):
         """Test JWT configuration is present."""
         assert settings.jwt_algorithm == "HS256"
@@ -50,12 +69,18 @@ class TestDatabase:
         await init_db()
         yield
         # Clean up after tests
-        async with engine.begin() as conn:
+        async with get_engine().begin() as conn:
             await conn.run_sync(Base.metadata.drop_all)
 
+    async def test_get_engine_is_cached(self):
+        """Test that repeated calls share one engine and session factory."""
+        assert get_engine() is get_engine()
+        assert get_session_factory() is get_session_factory()
+        assert get_session_factory().kw["bind"] is get_engine()
+
     async def test_database_connection(self):
         """Test that database connection works."""
-        async with async_session_factory() as session:
+        async with get_session_factory()() as session:
             result = await session.execute(text("SELECT 1"))
             assert result.scalar() == 1
 
@@ -74,6 +99,106 @@ class TestDatabase:
             result = await session.execute(text("SELECT 1"))
             assert result.scalar() == 1
 
+    async def test_extra_data_uses_server_default(self):
+        """Test that extra_data is filled by the database, not a Python dict."""
+        from app.models import Conversation, User
+
+        async with get_session_factory()() as session:
+            user = User(email="jsonb@example.com", name="J", password_hash="x")
+            session.add(user)
+            await session.flush()
+            conversation = Conversation(user_id=user.id, title="t")
+            session.add(conversation)
+            await session.flush()
+            await session.refresh(conversation)
+
+            assert conversation.extra_data == {}
+
+    async def test_flush_loads_server_defaults(self):
+        """Test that server defaults come back with the INSERT, without a refresh."""
+        from sqlalchemy import inspect
+
+        from app.models import ChatMessage, Conversation, User
+
+        async with get_session_factory()() as session:
+            user = User(email="eager@example.com", name="E", password_hash="x")
+            session.add(user)
+            await session.flush()
+            conversation = Conversation(user_id=user.id, title="t")
+            session.add(conversation)
+            await session.flush()
+            message = ChatMessage(conversation_id=conversation.id, role="user", content="hi")
+            session.add(message)
+            await session.flush()
+
+            for obj in (conversation, message):
+                assert not {"created_at", "extra_data"} & inspect(obj).unloaded
+            assert message.created_at is not None
+            assert conversation.extra_data == {}
+
+    async def test_legacy_dashed_ids_still_match(self):
+        """Test that rows stored with dashed String(36) ids are found and joined."""
+        from sqlalchemy import select
+
+        from app.models import CompanyConfig, User
+
+        user_id = "0b8f2c9e-4d1a-4f6e-9c3b-2a7d5e8f1b40"
+        company_id = "5e1d7a3c-9b2f-4c8e-a6d4-1f3b9c7e2a58"
+        async with get_session_factory()() as session:
+            # Written the way rows were stored before ids became Uuid columns
+            await session.execute(
+                text(
+                    "INSERT INTO users (id, email, name, password_hash, created_at) "
+                    "VALUES (:id, 'legacy@example.com', 'L', 'x', CURRENT_TIMESTAMP)"
+                ),
+                {"id": user_id},
+            )
+            await session.execute(
+                text(
+                    "INSERT INTO company_configs "
+                    "(id, user_id, name, api_key_encrypted, base_url, created_at) "
+                    "VALUES (:id, :user_id, 'Legacy Co', 'k', 'https://m.example', "
+                    "CURRENT_TIMESTAMP)"
+                ),
+                {"id": company_id, "user_id": user_id},
+            )
+
+            user = await session.scalar(select(User).where(User.id == user_id))
+            company = await session.scalar(
+                select(CompanyConfig)
+                .join(User, CompanyConfig.user_id == User.id)
+                .where(User.id == user_id)
+            )
+
+        assert user is not None and user.id == user_id
+        assert company is not None and company.id == company_id
+
+    async def test_json_columns_use_orjson(self):
+        """Test that JSON columns round-trip through the engine's orjson codec."""
+        from app.core import database
+        from app.models import Conversation, User
+
+        dialect = get_engine().dialect
+        assert dialect._json_serializer is database._json_serializer
+        assert dialect._json_deserializer is orjson.loads
+
+        data = {"line_items": [{"amount": 1.5, "description": "Café"}], 1: "non-str key"}
+        async with get_session_factory()() as session:
+            user = User(email="orjson@example.com", name="O", password_hash="x")
+            session.add(user)
+            await session.flush()
+            conversation = Conversation(user_id=user.id, title="t", extra_data=data)
+            session.add(conversation)
+            await session.flush()
+            stored = await session.scalar(
+                text("SELECT extra_data FROM conversations WHERE title = 't'")
+            )
+
+        assert orjson.loads(stored) == {
+            "line_items": [{"amount": 1.5, "description": "Café"}],
+            "1": "non-str key",
+        }
+
 
 class TestBaseModel:
     """Tests for base model functionality."""
@@ -94,6 +219,89 @@ class TestBaseModel:
         assert len(uuid1) == 36
         assert len(uuid2) == 36
 
+    def test_generate_uuid_is_time_ordered_v7(self):
+        """Test that generated ids are UUIDv7 and sort by creation time."""
+        import time
+        from uuid import UUID
+
+        first = generate_uuid()
+        time.sleep(0.002)
+        second = generate_uuid()
+
+        assert UUID(first).version == 7
+        assert UUID(first).variant == "specified in RFC 4122"
+        assert first < second
+
+    def test_generate_uuid_is_strictly_increasing(self):
+        """Test that ids generated within one millisecond still increase."""
+        ids = [generate_uuid() for _ in range(2000)]
+
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+
+    def test_to_dict_includes_all_columns(self):
+        """Test that to_dict returns every column in table order."""
+        from app.models import User
+
+        user = User(id="u-1", email="a@example.com", name="Alice", password_hash="x")
+        data = user.to_dict()
+
+        assert list(data) == [c.name for c in User.__table__.columns]
+        assert data["email"] == "a@example.com"
+        assert data["id"] == "u-1"
+        # Column getter is cached on the concrete class
+        assert User._column_getter() is User._column_getter()
+
+    def test_repr_shows_identifying_fields(self):
+        """Test that repr only includes id/name/email fields the model has."""
+        from app.models import ChatMessage, User
+
+        user = User(id="u-1", email="a@example.com", name="Alice", password_hash="x")
+        message = ChatMessage(id="m-1", role="user", content="hi")
+
+        assert repr(user) == "<User(id='u-1', name='Alice', email='a@example.com')>"
+        assert repr(message) == "<ChatMessage(id='m-1')>"
+
+    def test_mappers_configured_on_import(self):
+        """Test that importing app.models configures every mapper up front."""
+        from app.models import BaseModel as ModelsBase
+
+        mappers = list(ModelsBase.registry.mappers)
+
+        assert mappers
+        assert all(mapper.configured for mapper in mappers)
+
+    def test_conversation_tables_use_composite_indexes(self):
+        """Test that history/document lookups are backed by composite indexes."""
+        from app.models import ChatMessage, ProcessedDocument
+
+        def index_columns(model):
+            return {
+                index.name: [column.name for column in index.columns]
+                for index in model.__table__.indexes
+            }
+
+        chat_index = next(iter(ChatMessage.__table__.indexes))
+        assert chat_index.name == "ix_chat_messages_conv_created"
+        assert [str(expr) for expr in chat_index.expressions] == [
+            "chat_messages.conversation_id",
+            "chat_messages.created_at DESC",
+            "chat_messages.id DESC",
+        ]
+        doc_indexes = index_columns(ProcessedDocument)
+        assert doc_indexes["ix_processed_documents_user_created"] == ["user_id", "created_at"]
+        assert doc_indexes["ix_processed_documents_conv_status"] == ["conversation_id", "status"]
+        assert "ix_processed_documents_user_id" not in doc_indexes
+        assert doc_indexes["ix_processed_documents_processed"] == ["user_id", "id"]
+        assert doc_indexes["ix_processed_documents_user_hash"] == ["user_id", "content_hash"]
+        processed_index = next(
+            index for index in ProcessedDocument.__table__.indexes
+            if index.name == "ix_processed_documents_processed"
+        )
+        assert str(processed_index.dialect_options["postgresql"]["where"]) == (
+            "status = 'processed'"
+        )
+
 
 class TestAPIEndpoints:
     """Tests for API endpoints."""
@@ -114,6 +322,14 @@ class TestAPIEndpoints:
         assert "docs" in data
         assert "api" in data
 
+    async def test_root_endpoint_uses_orjson(self, client: AsyncClient):
+        """Test that responses are rendered by the orjson response class."""
+        from app.core.responses import ORJSONResponse
+
+        assert app.router.default_response_class is ORJSONResponse
+        response = await client.get("/")
+        assert response.headers["content-type"] == "application/json"
+
     async def test_health_endpoint(self, client: AsyncClient):
         """Test health check endpoint."""
         response = await client.get("/api/health")
@@ -146,6 +362,16 @@ class TestAPIEndpoints:
         assert data["info"]["title"] == "Manager.io Bookkeeper API"
 
 
+class TestLifespan:
+    """Tests for application startup configuration."""
+
+    async def test_lifespan_raises_thread_pool_tokens(self):
+        """Test that startup raises the AnyIO worker thread limit."""
+        async with lifespan(app):
+            limiter = anyio.to_thread.current_default_thread_limiter()
+            assert limiter.total_tokens == settings.thread_pool_tokens
+
+
 class TestCORS:
     """Tests for CORS configuration."""
 
@@ -168,3 +394,88 @@ class TestCORS:
         # CORS preflight should succeed
         assert response.status_code == 200
         assert "access-control-allow-origin" in response.headers
+
+    async def test_preflight_fast_path_matches_cors_middleware(self):
+        """Test that cached preflights carry the same headers CORSMiddleware sends."""
+        from fastapi import FastAPI
+        from fastapi.middleware.cors import CORSMiddleware
+
+        from app.core.middleware import PreflightCacheMiddleware
+
+        origins = ["http://localhost:3000"]
+        cors_kwargs = dict(
+            allow_origins=origins,
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+        plain = FastAPI()
+        plain.add_middleware(CORSMiddleware, **cors_kwargs)
+        fast = FastAPI()
+        fast.add_middleware(CORSMiddleware, **cors_kwargs)
+        fast.add_middleware(PreflightCacheMiddleware, **cors_kwargs)
+
+        headers = {
+            "Origin": "http://localhost:3000",
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "authorization,content-type",
+        }
+        responses = []
+        for target in (plain, fast):
+            transport = ASGITransport(app=target)
+            async with AsyncClient(transport=transport, base_url="http://test") as c:
+                responses.append(await c.options("/anything", headers=headers))
+
+        expected, actual = responses
+        assert actual.status_code == expected.status_code == 200
+        assert actual.text == expected.text
+        assert dict(actual.headers) == dict(expected.headers)
+
+    async def test_preflight_from_unknown_origin_falls_through(self, client: AsyncClient):
+        """Test that non-allowlisted origins are still rejected by CORSMiddleware."""
+        response = await client.options(
+            "/api/health",
+            headers={
+                "Origin": "http://evil.example",
+                "Access-Control-Request-Method": "GET",
+            },
+        )
+
+        assert response.status_code == 400
+        assert "access-control-allow-origin" not in response.headers
+
+
+class TestServicesPackage:
+    """Tests for the lazily re-exporting services package."""
+
+    def test_importing_agent_tools_skips_llm_and_ocr(self):
+        """Importing one service module does not import the others."""
+        import subprocess
+        import sys
+
+        code = (
+            "import sys, app.services.agent_tools; "
+            "print('litellm' in sys.modules, 'app.services.ocr' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        )
+
+        assert result.stdout.split() == ["False", "False"]
+
+    def test_reexports_resolve_on_access(self):
+        """Every name in __all__ resolves to the defining module's object."""
+        import app.services as services
+        from app.services.ocr import OCRService
+
+        assert services.OCRService is OCRService
+        assert all(getattr(services, name) is not None for name in services.__all__)
+        with pytest.raises(AttributeError):
+            services.NotAService
+
+    def test_all_matches_lazy_exports(self):
+        """__all__ lists exactly the names the lazy loader can resolve."""
+        import app.services as services
+
+        assert len(services.__all__) == len(set(services.__all__))
+        assert set(services.__all__) == set(services._EXPORT_MODULES)
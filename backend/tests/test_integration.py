@@ -11,17 +11,17 @@ Validates: Requirements All (Final Integration)
 import pytest
 from httpx import ASGITransport, AsyncClient
 
-from app.core.database import Base, engine
+from app.core.database import Base, get_engine
 from app.main import app
 
 
 @pytest.fixture(autouse=True)
 async def setup_database():
     """Set up and tear down test database for each test."""
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
 
 
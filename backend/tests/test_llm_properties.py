@@ -525,3 +525,67 @@ class TestModelFallbackProperty:
                 await llm.close()
         
         asyncio.run(run_test())
+
+
+class TestChatStream:
+    """Tests for streaming chat responses."""
+    
+    @staticmethod
+    def _chunk(text):
+        chunk = MagicMock()
+        chunk.choices = [MagicMock()]
+        chunk.choices[0].delta.content = text
+        return chunk
+    
+    async def test_yields_chunks_and_falls_back_before_first_chunk(self):
+        """Fallbacks apply while opening the stream; content chunks are yielded."""
+        import litellm
+        
+        config = LLMConfig(
+            default_provider="ollama",
+            default_model="primary-model",
+            fallback_models=["ollama/fallback-model"],
+        )
+        llm = LLMService(config)
+        models_tried = []
+        
+        class FakeStream:
+            def __init__(self, chunks):
+                self._chunks = iter(chunks)
+                self.closed = False
+            
+            def __aiter__(self):
+                return self
+            
+            async def __anext__(self):
+                try:
+                    return next(self._chunks)
+                except StopIteration:
+                    raise StopAsyncIteration
+            
+            async def aclose(self):
+                self.closed = True
+        
+        stream = FakeStream([self._chunk("Hel"), self._chunk(None), self._chunk("lo")])
+        
+        async def acompletion(**kwargs):
+            models_tried.append(kwargs["model"])
+            assert kwargs["stream"] is True
+            if kwargs["model"] == "ollama/primary-model":
+                raise litellm.exceptions.APIConnectionError(
+                    message="down", llm_provider="ollama", model="primary-model",
+                )
+            return stream
+        
+        try:
+            with patch("app.services.llm.litellm.acompletion", side_effect=acompletion):
+                chunks = [
+                    chunk async for chunk in
+                    llm.chat_stream([Message(role="user", content="Hi")])
+                ]
+        finally:
+            await llm.close()
+        
+        assert models_tried == ["ollama/primary-model", "ollama/fallback-model"]
+        assert chunks == ["Hel", "lo"]
+        assert stream.closed
@@ -0,0 +1,59 @@
+"""Tests for logging configuration helpers."""
+
+import logging
+
+from app.core import logging as app_logging
+from app.core.logging import LoggerAdapter, get_logger, setup_logging
+
+
+class TestSetupLogging:
+    """Tests for setup_logging."""
+
+    def test_setup_is_idempotent(self, monkeypatch):
+        """Test that repeated setup calls keep a single root handler."""
+        monkeypatch.setattr(app_logging, "_LOG_CONFIGURED", False)
+
+        setup_logging()
+        handlers = list(logging.getLogger().handlers)
+        setup_logging()
+
+        assert logging.getLogger().handlers == handlers
+        assert app_logging._LOG_CONFIGURED is True
+        assert logging.getLogger("httpx").level == logging.WARNING
+
+
+class TestGetLogger:
+    """Tests for get_logger."""
+
+    def test_returns_cached_app_logger(self):
+        """Test that loggers are namespaced under app and reused."""
+        logger = get_logger("services.example")
+
+        assert logger.name == "app.services.example"
+        assert get_logger("services.example") is logger
+        assert logger is logging.getLogger("app.services.example")
+
+
+class TestLoggerAdapter:
+    """Tests for the context-adding LoggerAdapter."""
+
+    def test_appends_context(self):
+        """Test that extra context is appended to the message."""
+        adapter = LoggerAdapter(logging.getLogger("app.test"), {"user_id": "123", "doc": 7})
+
+        msg, _ = adapter.process("User action", {})
+
+        assert msg == "User action - user_id=123 - doc=7"
+
+    def test_no_context(self):
+        """Test that messages pass through unchanged without context."""
+        adapter = LoggerAdapter(logging.getLogger("app.test"), {})
+
+        assert adapter.process("Plain", {})[0] == "Plain"
+
+    def test_reassigning_extra_rebuilds_suffix(self):
+        """Test that assigning a new extra dict updates the suffix."""
+        adapter = LoggerAdapter(logging.getLogger("app.test"), {"a": 1})
+        adapter.extra = {"b": 2}
+
+        assert adapter.process("m", {})[0] == "m - b=2"
@@ -10,9 +10,11 @@ Tests cover:
 
 import asyncio
 import json
+from datetime import date, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
+import orjson
 import pytest
 
 from app.services.manager_io import (
@@ -24,6 +26,8 @@ from app.services.manager_io import (
     ManagerIORateLimitError,
     ManagerIOServerError,
     ManagerIOValidationError,
+    canon_report_groups,
+    canon_report_row,
 )
 
 
@@ -136,6 +140,20 @@ class TestAuthenticationHeader:
             assert http_client.headers["Accept"] == "application/json"
             
             await client_no_cache.close()
+    
+    @pytest.mark.asyncio
+    async def test_http_client_uses_http2_and_connection_limits(self, client_no_cache):
+        """Test that the pooled HTTP client enables HTTP/2 and keep-alive limits."""
+        with patch.object(httpx, "AsyncClient", wraps=httpx.AsyncClient) as mock_cls:
+            await client_no_cache._get_client()
+        
+        kwargs = mock_cls.call_args.kwargs
+        assert kwargs["http2"] is True
+        assert kwargs["limits"].max_connections == 20
+        assert kwargs["limits"].max_keepalive_connections == 10
+        assert kwargs["limits"].keepalive_expiry == 300.0
+        
+        await client_no_cache.close()
 
 
 # =============================================================================
@@ -227,7 +245,7 @@ class TestCacheOperations:
         mock_redis.setex.assert_called_once_with(
             "test-key",
             600,
-            json.dumps(data),
+            orjson.dumps(data),
         )
     
     @pytest.mark.asyncio
@@ -240,9 +258,24 @@ class TestCacheOperations:
         mock_redis.setex.assert_called_once_with(
             "test-key",
             300,  # Default TTL
-            json.dumps(data),
+            orjson.dumps(data),
         )
     
+    @pytest.mark.asyncio
+    async def test_cache_round_trip_uses_orjson_bytes(self, client, mock_redis):
+        """Cached values are stored as orjson bytes and read back unchanged."""
+        data = {"Items": [{"Key": "a", "Amount": 1.5}], 2024: "non-string key"}
+        
+        await client._set_cache("test-key", data)
+        stored = mock_redis.setex.call_args.args[2]
+        mock_redis.get.return_value = stored
+        
+        assert isinstance(stored, bytes)
+        assert await client._get_from_cache("test-key") == {
+            "Items": [{"Key": "a", "Amount": 1.5}],
+            "2024": "non-string key",
+        }
+    
     @pytest.mark.asyncio
     async def test_set_cache_no_redis(self, client_no_cache):
         """Test cache set with no Redis does nothing."""
@@ -575,6 +608,125 @@ class TestPagination:
         
         await client.close()
     
+    @pytest.mark.asyncio
+    async def test_fetch_all_passes_filter_params(self, client, mock_redis):
+        """Test that extra params are sent with every page request."""
+        seen_params = []
+        
+        async def mock_request(*args, **kwargs):
+            seen_params.append(kwargs.get("params", {}))
+            response = MagicMock()
+            response.is_success = True
+            response.status_code = 200
+            response.json.return_value = []
+            return response
+        
+        with patch.object(httpx.AsyncClient, "request", side_effect=mock_request):
+            await client.fetch_all_paginated(
+                "/payments",
+                use_cache=False,
+                params={"fromDate": "2024-01-01", "toDate": "2024-01-31"},
+            )
+        
+        assert seen_params[0]["fromDate"] == "2024-01-01"
+        assert seen_params[0]["toDate"] == "2024-01-31"
+        assert seen_params[0]["skip"] == 0
+        
+        await client.close()
+    
+    @pytest.mark.asyncio
+    async def test_fetch_all_stops_before_date_on_descending_pages(self, client, mock_redis):
+        """Test that newest-first pagination stops once past stop_before_date."""
+        page_size = client.page_size
+        # 300 records, one per day going backwards from 2024-12-31
+        all_records = [
+            {"key": f"id-{i}", "Date": (date(2024, 12, 31) - timedelta(days=i)).isoformat()}
+            for i in range(300)
+        ]
+        call_count = 0
+        
+        async def mock_request(*args, **kwargs):
+            nonlocal call_count
+            call_count += 1
+            skip = kwargs.get("params", {}).get("skip", 0)
+            response = MagicMock()
+            response.is_success = True
+            response.status_code = 200
+            response.json.return_value = all_records[skip:skip + page_size]
+            return response
+        
+        with patch.object(httpx.AsyncClient, "request", side_effect=mock_request):
+            result = await client.fetch_all_paginated(
+                "/payments",
+                use_cache=False,
+                stop_before_date="2024-11-01",
+            )
+        
+        # First page spans 2024-12-31..2024-09-23, which already passes the date
+        assert call_count == 1
+        assert len(result) == page_size
+        
+        await client.close()
+    
+    @pytest.mark.asyncio
+    async def test_fetch_all_ignores_stop_date_on_ascending_pages(self, client, mock_redis):
+        """Test that ascending pages are never cut short."""
+        all_records = [{"key": f"id-{i}", "Date": f"2020-01-{(i % 28) + 1:02d}"} for i in range(150)]
+        all_records.sort(key=lambda r: r["Date"])
+        page_size = client.page_size
+        
+        async def mock_request(*args, **kwargs):
+            skip = kwargs.get("params", {}).get("skip", 0)
+            response = MagicMock()
+            response.is_success = True
+            response.status_code = 200
+            response.json.return_value = all_records[skip:skip + page_size]
+            return response
+        
+        with patch.object(httpx.AsyncClient, "request", side_effect=mock_request):
+            result = await client.fetch_all_paginated(
+                "/payments",
+                use_cache=False,
+                stop_before_date="2024-01-01",
+            )
+        
+        assert len(result) == 150
+        
+        await client.close()
+    
+    @pytest.mark.asyncio
+    async def test_fetch_all_ignores_stop_date_on_unsorted_pages(self, client, mock_redis):
+        """Test that a page newest at the top but unsorted inside isn't cut short."""
+        page_size = client.page_size
+        # First row newest, last row oldest, but a newer row in the middle
+        first_page = [
+            {"key": f"id-{i}", "Date": "2024-06-01"} for i in range(page_size)
+        ]
+        first_page[0]["Date"] = "2024-12-31"
+        first_page[page_size // 2]["Date"] = "2024-12-30"
+        first_page[-1]["Date"] = "2024-01-01"
+        all_records = first_page + [{"key": "id-last", "Date": "2024-11-15"}]
+        
+        async def mock_request(*args, **kwargs):
+            skip = kwargs.get("params", {}).get("skip", 0)
+            response = MagicMock()
+            response.is_success = True
+            response.status_code = 200
+            response.json.return_value = all_records[skip:skip + page_size]
+            return response
+        
+        with patch.object(httpx.AsyncClient, "request", side_effect=mock_request):
+            result = await client.fetch_all_paginated(
+                "/payments",
+                use_cache=False,
+                stop_before_date="2024-11-01",
+            )
+        
+        assert len(result) == page_size + 1
+        assert result[-1]["key"] == "id-last"
+        
+        await client.close()
+    
     @pytest.mark.asyncio
     async def test_fetch_all_uses_cache(self, client, mock_redis):
         """Test that paginated results are cached."""
@@ -586,7 +738,87 @@ class TestPagination:
         assert result == records
         # Should have checked cache
         mock_redis.get.assert_called()
-        
+
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_iter_paginated_yields_page_by_page(self, client, mock_redis):
+        """Test that pages are requested only as records are consumed."""
+        all_records = [{"key": f"id-{i}"} for i in range(150)]
+        requested = []
+
+        async def mock_request(*args, **kwargs):
+            skip = kwargs["params"]["skip"]
+            requested.append(skip)
+            response = MagicMock()
+            response.is_success = True
+            response.status_code = 200
+            response.json.return_value = all_records[skip:skip + client.page_size]
+            return response
+
+        with patch.object(httpx.AsyncClient, "request", side_effect=mock_request):
+            stream = client.iter_paginated("/test", use_cache=False)
+            first = await anext(stream)
+            assert first.get("key") == "id-0"
+            assert requested == [0]
+
+            rest = [record async for record in stream]
+
+        assert len(rest) == 149
+        assert requested == [0, 100]
+        # Streamed crawls are not cached
+        mock_redis.setex.assert_not_called()
+
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_iter_paginated_overlaps_known_pages(self, client, mock_redis):
+        """Test that later pages are fetched concurrently but yielded in order."""
+        all_records = [{"key": f"id-{i}"} for i in range(450)]
+        in_flight = 0
+        peak = 0
+
+        async def mock_request(*args, **kwargs):
+            nonlocal in_flight, peak
+            skip = kwargs["params"]["skip"]
+            in_flight += 1
+            peak = max(peak, in_flight)
+            # Later pages answer sooner, so ordering must not follow completion
+            await asyncio.sleep(0.01 * (5 - skip // 100))
+            in_flight -= 1
+            response = MagicMock()
+            response.is_success = True
+            response.status_code = 200
+            response.json.return_value = {
+                "items": all_records[skip:skip + client.page_size],
+                "totalRecords": len(all_records),
+            }
+            return response
+
+        with patch.object(httpx.AsyncClient, "request", side_effect=mock_request):
+            result = [
+                record async for record in client.iter_paginated(
+                    "/test", use_cache=False, concurrency=3,
+                )
+            ]
+
+        assert [r.get("key") for r in result] == [f"id-{i}" for i in range(450)]
+        assert peak == 3
+
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_iter_paginated_replays_cached_result(self, client, mock_redis):
+        """Test that a complete result cached by fetch_all_paginated is reused."""
+        records = [{"key": "id-1"}, {"key": "id-2"}]
+        mock_redis.get.return_value = json.dumps(records)
+
+        with patch.object(httpx.AsyncClient, "request") as mock_request:
+            result = [record async for record in client.iter_paginated("/test")]
+
+        assert result == records
+        mock_request.assert_not_called()
+
         await client.close()
 
 
@@ -852,6 +1084,26 @@ class TestPaginatedEndpoints:
         
         await client.close()
     
+    @pytest.mark.asyncio
+    async def test_get_transfers_requests_server_ordering(self, client, mock_redis):
+        """Test that order_by/desc are sent as orderBy/desc query params."""
+        seen = {}
+        
+        async def mock_request(method, url, params=None, **kwargs):
+            seen.update(params)
+            response = MagicMock()
+            response.is_success = True
+            response.status_code = 200
+            response.json.return_value = []
+            return response
+        
+        with patch.object(httpx.AsyncClient, "request", side_effect=mock_request):
+            await client.get_transfers(skip=0, take=20, order_by="Date", desc=True)
+        
+        assert seen == {"skip": 0, "pageSize": 20, "orderBy": "Date", "desc": "true"}
+        
+        await client.close()
+    
     @pytest.mark.asyncio
     async def test_get_receipts(self, client, mock_redis):
         """Test fetching receipts with pagination."""
@@ -1025,6 +1277,112 @@ class TestGetGeneralLedger:
         await client.close()
 
 
+# =============================================================================
+# Report Row Normalization Tests
+# =============================================================================
+
+
+class TestReportRowNormalization:
+    """Tests for canonical report row/group helpers."""
+    
+    def test_canon_row_mixed_case_keys(self):
+        """Test that capitalized and lowercase variants resolve to one field."""
+        row = canon_report_row({"key": "a1", "Name": "Rent", "debit": "12.5", "Credit": 2})
+        
+        assert row.key == "a1"
+        assert row.name == "Rent"
+        assert row.debit == 12.5
+        assert row.credit == 2.0
+        assert row.balance == 10.5
+    
+    def test_canon_row_prefers_explicit_balance(self):
+        """Test that an explicit balance wins over debit - credit."""
+        row = canon_report_row({"Account": "a2", "Debit": 5, "balance": 7})
+        
+        assert row.key == "a2"
+        assert row.balance == 7.0
+        assert row.amount == 7.0
+    
+    def test_canon_groups(self):
+        """Test that report groups carry their name onto account rows."""
+        groups = canon_report_groups({
+            "groups": [
+                {"name": "Expenses", "Total": "30", "accounts": [{"Name": "Rent", "Amount": -30}]},
+                {"Name": "Income", "Total": 100},
+            ],
+        })
+        
+        assert [g.name for g in groups] == ["Expenses", "Income"]
+        assert groups[0].total == 30.0
+        assert groups[0].accounts[0].amount == -30.0
+        assert groups[0].accounts[0].group == "Expenses"
+        assert groups[1].accounts == []
+    
+    def test_canon_groups_non_dict(self):
+        """Test that non-dict reports produce no groups."""
+        assert canon_report_groups([{"Name": "x"}]) == []
+
+
+# =============================================================================
+# Streaming Report Tests
+# =============================================================================
+
+
+def _mock_transport_client(client: ManagerIOClient, handler) -> None:
+    """Route the client's HTTP traffic through an httpx.MockTransport."""
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+class TestStreamTrialBalance:
+    """Tests for stream_trial_balance method."""
+    
+    @pytest.mark.asyncio
+    async def test_stream_yields_groups(self, client_no_cache):
+        """Test that each trial balance group is yielded with its accounts."""
+        report = {
+            "Groups": [
+                {"Name": "Assets", "Accounts": [{"Key": "a1", "Debit": 100.5}]},
+                {"Name": "Liabilities", "Accounts": [{"Key": "l1", "Credit": 40}]},
+            ],
+        }
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "POST":
+                assert request.url.path.endswith("/trial-balance-form")
+                assert json.loads(request.content) == {"Date": "2024-06-30"}
+                return httpx.Response(200, json={"Key": "tb-1"})
+            assert request.url.path.endswith("/trial-balance-view/tb-1")
+            return httpx.Response(200, content=json.dumps(report).encode())
+        
+        _mock_transport_client(client_no_cache, handler)
+        
+        groups = [g async for g in client_no_cache.stream_trial_balance("2024-06-30")]
+        
+        assert [g.name for g in groups] == ["Assets", "Liabilities"]
+        assert groups[0].accounts[0].key == "a1"
+        assert groups[0].accounts[0].debit == 100.5
+        assert groups[0].accounts[0].group == "Assets"
+        assert groups[1].accounts[0].balance == -40
+        
+        await client_no_cache.close()
+    
+    @pytest.mark.asyncio
+    async def test_stream_view_error_raises(self, client_no_cache):
+        """Test that HTTP errors on the view request are mapped to exceptions."""
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.method == "POST":
+                return httpx.Response(200, json={"Key": "tb-1"})
+            return httpx.Response(500, json={"detail": "boom"})
+        
+        _mock_transport_client(client_no_cache, handler)
+        
+        with pytest.raises(ManagerIOServerError):
+            async for _ in client_no_cache.stream_trial_balance():
+                pass
+        
+        await client_no_cache.close()
+
+
 # =============================================================================
 # Entry Submission Methods Tests (Task 5.4)
 # =============================================================================
@@ -0,0 +1,247 @@
+"""Tests for the Alembic migrations.
+
+Each test builds a SQLite database with the schema earlier versions created
+through init_db(), runs ``alembic upgrade head`` on it and checks the result.
+"""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Schema created by init_db() before the migrations were added
+LEGACY_SCHEMA = """
+CREATE TABLE users (
+    email VARCHAR(255) NOT NULL,
+    password_hash VARCHAR(255) NOT NULL,
+    name VARCHAR(255) NOT NULL,
+    id VARCHAR(36) NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    updated_at DATETIME,
+    PRIMARY KEY (id)
+);
+CREATE UNIQUE INDEX ix_users_email ON users (email);
+CREATE TABLE sessions (
+    user_id VARCHAR(36) NOT NULL,
+    refresh_token_hash VARCHAR(255) NOT NULL,
+    expires_at DATETIME NOT NULL,
+    id VARCHAR(36) NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    updated_at DATETIME,
+    PRIMARY KEY (id),
+    FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+CREATE INDEX ix_sessions_user_id ON sessions (user_id);
+CREATE TABLE company_configs (
+    user_id VARCHAR(36) NOT NULL,
+    name VARCHAR(255) NOT NULL,
+    base_url VARCHAR(500) NOT NULL,
+    api_key_encrypted TEXT NOT NULL,
+    id VARCHAR(36) NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    updated_at DATETIME,
+    PRIMARY KEY (id),
+    FOREIGN KEY(user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+CREATE INDEX ix_company_configs_user_id ON company_configs (user_id);
+CREATE TABLE conversations (
+    user_id VARCHAR(36) NOT NULL,
+    company_id VARCHAR(36),
+    title VARCHAR(255),
+    extra_data JSON,
+    id VARCHAR(36) NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    updated_at DATETIME,
+    PRIMARY KEY (id),
+    FOREIGN KEY(user_id) REFERENCES users (id),
+    FOREIGN KEY(company_id) REFERENCES company_configs (id)
+);
+CREATE INDEX ix_conversations_company_id ON conversations (company_id);
+CREATE INDEX ix_conversations_user_id ON conversations (user_id);
+CREATE TABLE chat_messages (
+    conversation_id VARCHAR(36) NOT NULL,
+    role VARCHAR(20) NOT NULL,
+    content TEXT,
+    tool_calls JSON,
+    tool_call_id VARCHAR(100),
+    extra_data JSON,
+    id VARCHAR(36) NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    updated_at DATETIME,
+    PRIMARY KEY (id),
+    FOREIGN KEY(conversation_id) REFERENCES conversations (id)
+);
+CREATE INDEX ix_chat_messages_conversation_id ON chat_messages (conversation_id);
+CREATE TABLE processed_documents (
+    conversation_id VARCHAR(36),
+    user_id VARCHAR(36) NOT NULL,
+    company_id VARCHAR(36),
+    filename VARCHAR(255),
+    document_type VARCHAR(50),
+    extracted_text TEXT,
+    extracted_data JSON,
+    status VARCHAR(20) NOT NULL,
+    submission_key VARCHAR(100),
+    error_message TEXT,
+    id VARCHAR(36) NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    updated_at DATETIME,
+    PRIMARY KEY (id),
+    FOREIGN KEY(conversation_id) REFERENCES conversations (id),
+    FOREIGN KEY(user_id) REFERENCES users (id),
+    FOREIGN KEY(company_id) REFERENCES company_configs (id)
+);
+CREATE INDEX ix_processed_documents_conversation_id ON processed_documents (conversation_id);
+CREATE INDEX ix_processed_documents_user_id ON processed_documents (user_id);
+CREATE INDEX ix_processed_documents_company_id ON processed_documents (company_id);
+"""
+
+USER_ID = "0b8f2c9e-4d1a-4f6e-9c3b-2a7d5e8f1b40"
+CONVERSATION_ID = "5e1d7a3c-9b2f-4c8e-a6d4-1f3b9c7e2a58"
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    """SQLite file with the legacy schema and one user and conversation."""
+    path = tmp_path / "legacy.db"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(LEGACY_SCHEMA)
+        conn.execute(
+            "INSERT INTO users (id, email, name, password_hash) "
+            "VALUES (?, 'legacy@example.com', 'L', 'x')",
+            (USER_ID,),
+        )
+        conn.execute(
+            "INSERT INTO conversations (id, user_id, title, extra_data) "
+            "VALUES (?, ?, 't', '{\"source\": \"legacy\"}')",
+            (CONVERSATION_ID, USER_ID),
+        )
+    return path
+
+
+def _upgrade(path: Path) -> None:
+    """Run ``alembic upgrade head`` against a SQLite file."""
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("sqlalchemy.url", f"sqlite+aiosqlite:///{path}")
+    command.upgrade(config, "head")
+
+
+def _indexes(path: Path) -> dict:
+    """Index name -> CREATE INDEX statement."""
+    with sqlite3.connect(path) as conn:
+        return dict(conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"
+        ))
+
+
+def test_upgrade_keeps_legacy_ids(legacy_db):
+    """Dashed ids and their foreign keys survive the upgrade unchanged."""
+    _upgrade(legacy_db)
+
+    with sqlite3.connect(legacy_db) as conn:
+        rows = conn.execute(
+            "SELECT u.id, c.id FROM users u JOIN conversations c ON c.user_id = u.id"
+        ).fetchall()
+        version = conn.execute("SELECT version_num FROM alembic_version").fetchone()
+
+    assert rows == [(USER_ID, CONVERSATION_ID)]
+    assert version is not None
+
+
+def test_upgrade_is_noop_on_current_schema(tmp_path):
+    """A database created from the current models upgrades without changes."""
+    import asyncio
+
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    import app.models  # noqa: F401
+    from app.core.database import Base
+
+    path = tmp_path / "fresh.db"
+
+    async def create() -> None:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await engine.dispose()
+
+    asyncio.run(create())
+    before = _indexes(path)
+
+    _upgrade(path)
+
+    assert _indexes(path) == before
+
+
+def test_upgrade_adds_extra_data_default(legacy_db):
+    """New rows get '{}' extra_data from the database; old data is kept."""
+    _upgrade(legacy_db)
+
+    with sqlite3.connect(legacy_db) as conn:
+        conn.execute(
+            "INSERT INTO conversations (id, user_id, title) VALUES (?, ?, 'new')",
+            ("7c2e9a41-3b5d-4f8a-9e6c-0d1b2a3c4e5f", USER_ID),
+        )
+        rows = dict(conn.execute("SELECT title, extra_data FROM conversations"))
+
+    assert rows == {"t": '{"source": "legacy"}', "new": "{}"}
+
+
+def test_upgrade_adds_composite_indexes(legacy_db):
+    """History and document lookups get composite indexes."""
+    _upgrade(legacy_db)
+
+    indexes = _indexes(legacy_db)
+
+    assert "ix_processed_documents_user_created" in indexes
+    assert "ix_processed_documents_conv_status" in indexes
+    assert "ix_chat_messages_conv_created" in indexes
+    assert "ix_chat_messages_conversation_id" not in indexes
+
+
+def test_upgrade_orders_history_index_newest_first(legacy_db):
+    """The history index is rebuilt newest first with id as tie-breaker."""
+    _upgrade(legacy_db)
+
+    sql = _indexes(legacy_db)["ix_chat_messages_conv_created"]
+
+    assert "created_at DESC" in sql
+    assert "id DESC" in sql
+
+
+def test_upgrade_adds_processed_documents_partial_index(legacy_db):
+    """Submission lookups get an index limited to processed documents."""
+    _upgrade(legacy_db)
+
+    sql = _indexes(legacy_db)["ix_processed_documents_processed"]
+
+    assert "WHERE status = 'processed'" in sql
+
+
+def test_upgrade_adds_content_hash(legacy_db):
+    """Processed documents get the content_hash column and its index."""
+    _upgrade(legacy_db)
+
+    with sqlite3.connect(legacy_db) as conn:
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(processed_documents)")}
+
+    assert "content_hash" in columns
+    assert "ix_processed_documents_user_hash" in _indexes(legacy_db)
+
+
+def test_downgrade_and_upgrade_round_trip(legacy_db):
+    """Downgrading to the legacy schema and upgrading again is repeatable."""
+    _upgrade(legacy_db)
+    upgraded = _indexes(legacy_db)
+
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("sqlalchemy.url", f"sqlite+aiosqlite:///{legacy_db}")
+    command.downgrade(config, "base")
+    assert "ix_chat_messages_conversation_id" in _indexes(legacy_db)
+
+    _upgrade(legacy_db)
+    assert _indexes(legacy_db) == upgraded
@@ -34,14 +34,20 @@ case "$1" in
     docker compose logs -f
     ;;
     
+  migrate)
+    echo "🗄️  Applying database migrations..."
+    docker compose exec backend alembic upgrade head
+    ;;
+    
   *)
-    echo "Usage: $0 {up|down|rebuild|logs}"
+    echo "Usage: $0 {up|down|rebuild|logs|migrate}"
     echo ""
     echo "Commands:"
     echo "  up       - Start services"
     echo "  down     - Stop all services"
     echo "  rebuild  - Clean rebuild (stop, remove, build fresh, start)"
     echo "  logs     - Follow logs"
+    echo "  migrate  - Upgrade an existing database to the current schema"
     exit 1
     ;;
 esac